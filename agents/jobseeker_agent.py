@@ -122,22 +122,61 @@
 #         return "You match many top skills. Highlight projects and quantify outcomes."
 
 # agents/jobseeker_agent.py
-from typing import List, Optional, Dict, Any
+import os
+from typing import AsyncIterator, Callable, List, NamedTuple, Optional, Dict, Any, Tuple, Union
 from uuid import uuid4
-from models.a2a import A2AMessage, TaskResult, TaskStatus, Artifact, MessagePart
-from services.skill_extractor import extract_keywords
-from services.jobseeker_service import find_jobs_and_skills
+from models.a2a import A2AMessage, TaskResult, TaskStatus, Artifact, MessagePart, MessageConfiguration, TaskStatusUpdateEvent, TaskArtifactUpdateEvent
+from services.extraction_batcher import keyword_batcher
+from services.job_ranker import job_ranker
+from services.jobseeker_service import JOB_SEARCH_SOURCE, SEARCH_SOURCES, find_jobs_and_skills, stream_jobs
+from services.skill_aggregator import SkillAggregator
+from services.context_store import ContextStore, context_store
+from services.jsearch_client import JSEARCH_MAX_PAGES
 from utils.a2a_response import make_agent_message, make_artifact, make_task_result
+from utils.metrics import timed, timed_async
 from datetime import datetime
 
-# in-memory history store: contextId -> list[A2AMessage]
-_HISTORY_STORE: Dict[str, List[A2AMessage]] = {}
+# history returned with each task; a request can override both via configuration.historyLength / historyTurnOnly.
+# an empty A2A_HISTORY_LENGTH returns everything the context store holds.
+_history_length = os.getenv("A2A_HISTORY_LENGTH", "20").strip()
+A2A_HISTORY_LENGTH: Optional[int] = int(_history_length) if _history_length else None
+A2A_HISTORY_TURN_ONLY = os.getenv("A2A_HISTORY_TURN_ONLY", "0").lower() in ("1", "true", "yes")
+
+# paging and source options accepted in the `data` part: {"perPage": 8, "pages": 1, "source": "hybrid"}
+DEFAULT_PER_PAGE = 8
+MAX_PER_PAGE = 50
+
+def _int_option(data: Dict[str, Any], key: str, default: int, low: int, high: int) -> int:
+    try:
+        value = int(data.get(key, default))
+    except (TypeError, ValueError):
+        return default
+    return max(low, min(value, high))
+
+def _history_options(config: Optional[MessageConfiguration]) -> Tuple[Optional[int], bool]:
+    length, turn_only = A2A_HISTORY_LENGTH, A2A_HISTORY_TURN_ONLY
+    if config is not None:
+        if config.historyLength is not None:
+            length = config.historyLength
+        if config.historyTurnOnly is not None:
+            turn_only = config.historyTurnOnly
+    return length, turn_only
+
+class SearchRequest(NamedTuple):
+    keywords: str
+    location: Optional[str]
+    user_skills: List[str]
+    per_page: int
+    pages: int
+    source: str
 
 class JobSeekerAgent:
-    def __init__(self):
-        pass
+    def __init__(self, history_store: Optional[ContextStore] = None):
+        # bounded, evicting history store (memory or SQLite, see CONTEXT_STORE_BACKEND)
+        self.history_store = history_store or context_store
 
-    async def process_messages(self, messages: List[A2AMessage], context_id: Optional[str] = None, task_id: Optional[str] = None, config: Optional[dict] = None) -> TaskResult:
+    @timed_async("agent")
+    async def process_messages(self, messages: List[A2AMessage], context_id: Optional[str] = None, task_id: Optional[str] = None, config: Optional[MessageConfiguration] = None) -> TaskResult:
         context_id = context_id or str(uuid4())
         task_id = task_id or str(uuid4())
 
@@ -147,9 +186,107 @@ class JobSeekerAgent:
 
         # ensure text parts are dicts (if incoming text is string, caller should have wrapped it)
         # append incoming to history
-        history = _HISTORY_STORE.setdefault(context_id, [])
-        history.append(user_msg)
+        await self.history_store.append(context_id, user_msg)
+        keywords, location, user_skills, per_page, pages, source = await self._parse_request(user_msg)
 
+        # call job service
+        try:
+            res = await find_jobs_and_skills(keywords, location, per_page=per_page, pages=pages, source=source)
+            jobs = res["jobs"]
+            top_skills = res["top_skills"]
+            jobs_metadata = res.get("jobs_metadata")
+        except Exception as e:
+            # build failure A2A error via raising; controller will catch and convert to A2A error reply
+            raise e
+        # best match for the user's skills first, each job with its match_score
+        with timed("rank"):
+            jobs = await job_ranker.rank(jobs, keywords, user_skills)
+
+        # agent message
+        agent_msg = make_agent_message(self._summary(jobs, keywords, location, top_skills), task_id)
+        await self.history_store.append(context_id, agent_msg)
+        history = await self._history_window(context_id, [user_msg, agent_msg], config)
+
+        # artifacts
+        # a stale fallback (JSearch circuit open) or a partial fetch is flagged in the artifact metadata
+        jobs_art = make_artifact("jobs", "data", {"jobs": jobs}, metadata=jobs_metadata)
+        skills_art = make_artifact("skills", "data", {"top_skills": top_skills})
+        rec_text = self._build_recommendations(top_skills, user_skills)
+        rec_art = make_artifact("recommendation", "text", rec_text)
+
+        artifacts = [jobs_art, skills_art, rec_art]
+
+        state = "input-required" if jobs and len(jobs) > 0 else "completed"
+        task_result = make_task_result(task_id, context_id, state, agent_msg, artifacts, history)
+        return task_result
+
+    async def stream_messages(
+        self,
+        messages: List[A2AMessage],
+        context_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        config: Optional[MessageConfiguration] = None,
+        on_complete: Optional[Callable[[TaskResult], Any]] = None,
+    ) -> AsyncIterator[Union[TaskStatusUpdateEvent, TaskArtifactUpdateEvent]]:
+        """
+        message/stream: the same pipeline as process_messages, yielded as A2A events while it runs:
+        a working status with the parsed query, one `jobs` chunk per upstream page, the skills and
+        recommendation artifacts, then a final status. `on_complete` receives the equivalent TaskResult.
+        """
+        context_id = context_id or str(uuid4())
+        task_id = task_id or str(uuid4())
+        user_msg = messages[-1] if messages else None
+        if not user_msg:
+            raise ValueError("No message provided")
+        await self.history_store.append(context_id, user_msg)
+
+        keywords, location, user_skills, per_page, pages, source = await self._parse_request(user_msg)
+        searching = make_agent_message(f"Searching jobs for '{keywords}'" + (f" in {location}." if location else "."), task_id)
+        yield TaskStatusUpdateEvent(taskId=task_id, contextId=context_id, status=TaskStatus(state="working", message=searching))
+        query_art = make_artifact("query", "data", {"keywords": keywords, "location": location, "perPage": per_page, "pages": pages, "source": source})
+        yield TaskArtifactUpdateEvent(taskId=task_id, contextId=context_id, artifact=query_art)
+
+        # jobs arrive page by page under one artifactId; skill counts are merged as they come
+        jobs_id = str(uuid4())
+        jobs: List[Dict[str, Any]] = []
+        jobs_metadata = None
+        aggregator = SkillAggregator()
+        async for page, page_jobs, metadata in stream_jobs(keywords, location, per_page=per_page, pages=pages, source=source):
+            aggregator.add_jobs(page_jobs)
+            if metadata:
+                jobs_metadata = {**(jobs_metadata or {}), **metadata}
+            chunk = make_artifact("jobs", "data", {"jobs": page_jobs, "page": page}, artifact_id=jobs_id, metadata=metadata)
+            yield TaskArtifactUpdateEvent(taskId=task_id, contextId=context_id, artifact=chunk, append=bool(jobs), lastChunk=False)
+            jobs.extend(page_jobs)
+        # pages stream in arrival order; once all are in, the last chunk replaces them (append=False)
+        # with the ranked list, or closes the artifact empty when ranking is unavailable
+        with timed("rank"):
+            ranked = await job_ranker.rank(jobs, keywords, user_skills)
+        if ranked is not jobs:
+            jobs = ranked
+            closing = make_artifact("jobs", "data", {"jobs": jobs}, artifact_id=jobs_id, metadata=jobs_metadata)
+            yield TaskArtifactUpdateEvent(taskId=task_id, contextId=context_id, artifact=closing, append=False, lastChunk=True)
+        else:
+            closing = make_artifact("jobs", "data", {"jobs": []}, artifact_id=jobs_id)
+            yield TaskArtifactUpdateEvent(taskId=task_id, contextId=context_id, artifact=closing, append=bool(jobs), lastChunk=True)
+
+        top_skills = aggregator.top_k(10)
+        skills_art = make_artifact("skills", "data", {"top_skills": top_skills})
+        yield TaskArtifactUpdateEvent(taskId=task_id, contextId=context_id, artifact=skills_art)
+        rec_art = make_artifact("recommendation", "text", self._build_recommendations(top_skills, user_skills))
+        yield TaskArtifactUpdateEvent(taskId=task_id, contextId=context_id, artifact=rec_art)
+
+        agent_msg = make_agent_message(self._summary(jobs, keywords, location, top_skills), task_id)
+        await self.history_store.append(context_id, agent_msg)
+        state = "input-required" if jobs else "completed"
+        final = TaskStatusUpdateEvent(taskId=task_id, contextId=context_id, status=TaskStatus(state=state, message=agent_msg), final=True)
+        if on_complete is not None:
+            history = await self._history_window(context_id, [user_msg, agent_msg], config)
+            jobs_art = make_artifact("jobs", "data", {"jobs": jobs}, artifact_id=jobs_id, metadata=jobs_metadata)
+            on_complete(make_task_result(task_id, context_id, state, agent_msg, [jobs_art, skills_art, rec_art], history))
+        yield final
+
+    async def _parse_request(self, user_msg: A2AMessage) -> SearchRequest:
         # parse structured data if provided
         user_text = ""
         user_data = {}
@@ -160,46 +297,41 @@ class JobSeekerAgent:
             if p.kind == "data" and p.data:
                 user_data = p.data
 
+        per_page, pages, source = DEFAULT_PER_PAGE, 1, JOB_SEARCH_SOURCE
         if user_data:
             keywords = user_data.get("keywords") or user_data.get("query") or user_text
             location = user_data.get("location")
             user_skills = user_data.get("userSkills") or []
+            per_page = _int_option(user_data, "perPage", DEFAULT_PER_PAGE, 1, MAX_PER_PAGE)
+            pages = _int_option(user_data, "pages", 1, 1, JSEARCH_MAX_PAGES)
+            if user_data.get("source") in SEARCH_SOURCES:
+                source = user_data["source"]
         else:
-            parsed = extract_keywords(user_text or "", use_semantic=True)
+            # spaCy/KeyBERT run batched on the extraction pool, never on the event loop
+            with timed("extract_keywords"):
+                parsed = await keyword_batcher.extract(user_text or "", use_semantic=True)
             keywords = " ".join(parsed.get("keywords") or [])
             location = parsed.get("location")
             user_skills = []
 
         if not keywords:
             keywords = user_text or "software engineer"
+        return SearchRequest(keywords, location, user_skills, per_page, pages, source)
 
-        # call job service
-        try:
-            res = await find_jobs_and_skills(keywords, location, per_page=8)
-            jobs = res["jobs"]
-            top_skills = res["top_skills"]
-        except Exception as e:
-            # build failure A2A error via raising; controller will catch and convert to A2A error reply
-            raise e
-
-        # agent message
+    def _summary(self, jobs, keywords, location, top_skills) -> str:
         summary_text = f"Found {len(jobs)} job(s) for '{keywords}'" + (f" in {location}." if location else ".")
         summary_text += f" Top skills: {', '.join(top_skills[:6])}."
-
-        agent_msg = make_agent_message(summary_text, task_id)
-        history.append(agent_msg)
-
-        # artifacts
-        jobs_art = make_artifact("jobs", "data", {"jobs": jobs})
-        skills_art = make_artifact("skills", "data", {"top_skills": top_skills})
-        rec_text = self._build_recommendations(top_skills, user_skills)
-        rec_art = make_artifact("recommendation", "text", rec_text)
-
-        artifacts = [jobs_art, skills_art, rec_art]
-
-        state = "input-required" if jobs and len(jobs) > 0 else "completed"
-        task_result = make_task_result(task_id, context_id, state, agent_msg, artifacts, history)
-        return task_result
+        return summary_text
+
+    async def _history_window(self, context_id: str, turn_messages: List[A2AMessage], config: Optional[MessageConfiguration]) -> List[A2AMessage]:
+        # a bounded window keeps each response O(window) instead of re-sending the whole conversation every turn
+        length, turn_only = _history_options(config)
+        if turn_only:
+            messages = turn_messages
+            if length is not None:
+                messages = messages[-length:] if length else []
+            return list(messages)
+        return await self.history_store.get(context_id, limit=length)
 
     def _build_recommendations(self, top_skills, user_skills):
         if user_skills:
@@ -0,0 +1,72 @@
+# benchmarks/_common.py
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+RESULTS_DIR = os.getenv("BENCH_RESULTS_DIR", os.path.join(ROOT, "benchmarks", "results"))
+
+
+def percentiles(samples_ms: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99 plus mean/min/max of latency samples in milliseconds (nearest-rank)."""
+    if not samples_ms:
+        return {"count": 0}
+    s = sorted(samples_ms)
+
+    def rank(p: float) -> float:
+        return s[min(len(s) - 1, max(0, int(round(p / 100.0 * len(s))) - 1))]
+
+    return {
+        "count": len(s),
+        "mean": round(sum(s) / len(s), 3),
+        "min": round(s[0], 3),
+        "p50": round(rank(50), 3),
+        "p95": round(rank(95), 3),
+        "p99": round(rank(99), 3),
+        "max": round(s[-1], 3),
+    }
+
+
+def timed(fn, *args, repeat: int = 1, **kwargs) -> List[float]:
+    """Call fn `repeat` times and return per-call durations in milliseconds."""
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args, **kwargs)
+        out.append((time.perf_counter() - t0) * 1000.0)
+    return out
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return "unknown"
+
+
+def write_results(name: str, results: Dict[str, Any]) -> str:
+    """Write results as JSON to RESULTS_DIR/<name>-<timestamp>.json so runs can be compared over time."""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    payload = {
+        "benchmark": name,
+        "timestamp": stamp,
+        "git_rev": _git_rev(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    path = os.path.join(RESULTS_DIR, f"{name}-{stamp}.json")
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"results written to {path}")
+    return path
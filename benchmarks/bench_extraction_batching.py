@@ -0,0 +1,77 @@
+# benchmarks/bench_extraction_batching.py
+"""
+Keyword extraction throughput with and without micro-batching.
+
+    python -m benchmarks.bench_extraction_batching --requests 256 --concurrency 32
+
+Needs spaCy (en_core_web_sm) and KeyBERT installed.
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks._common import percentiles, write_results
+from services.extraction_batcher import KeywordBatcher
+from services.extraction_pool import ExtractionService
+
+QUERIES = [
+    "backend python developer remote in Nigeria",
+    "senior data analyst jobs in Lagos with SQL and Tableau",
+    "frontend engineer react typescript Berlin",
+    "machine learning engineer pytorch London",
+    "devops engineer kubernetes terraform AWS remote",
+    "product designer figma user research Toronto",
+    "junior java developer spring boot Nairobi",
+    "data scientist NLP transformers Paris",
+]
+
+
+async def _run(batcher: KeywordBatcher, n: int, concurrency: int, use_semantic: bool):
+    sem = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with sem:
+            t0 = time.perf_counter()
+            await batcher.extract(QUERIES[i % len(QUERIES)], use_semantic=use_semantic)
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    elapsed = time.perf_counter() - t0
+    return {
+        "requests": n,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(n / elapsed, 2),
+        "latency_ms": percentiles(latencies),
+        "batcher": batcher.stats(),
+    }
+
+
+async def main(args):
+    service = ExtractionService(mode=args.executor, workers=args.workers, max_queue=args.requests)
+    service.start()
+    # warm-up: load models before timing anything
+    await KeywordBatcher(service, max_batch_size=1).extract(QUERIES[0], use_semantic=not args.no_semantic)
+
+    results = {"executor": args.executor, "workers": args.workers, "concurrency": args.concurrency}
+    results["unbatched"] = await _run(KeywordBatcher(service, max_batch_size=1), args.requests, args.concurrency, not args.no_semantic)
+    results["batched"] = await _run(
+        KeywordBatcher(service, max_batch_size=args.batch_size, max_wait_ms=args.max_wait_ms),
+        args.requests, args.concurrency, not args.no_semantic,
+    )
+    results["speedup"] = round(results["batched"]["throughput_rps"] / results["unbatched"]["throughput_rps"], 2)
+    await service.shutdown()
+    write_results("extraction_batching", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--no-semantic", action="store_true", help="spaCy only, skip KeyBERT")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,65 @@
+# benchmarks/bench_history_window.py
+"""
+Response size and latency as a conversation grows: full history vs a window vs current turn only.
+
+    python -m benchmarks.bench_history_window --turns 200 --window 20
+
+Uses structured `data` messages and the mock job source (no JSEARCH_API_KEY, no spaCy needed).
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks._common import percentiles, write_results
+from agents.jobseeker_agent import JobSeekerAgent
+from models.a2a import A2AMessage, JSONRPCResponse, MessageConfiguration, MessagePart
+from services.context_store import InMemoryContextStore
+
+QUERIES = ["python developer", "data analyst", "frontend engineer", "devops engineer"]
+
+
+def _message(i: int) -> A2AMessage:
+    return A2AMessage(role="user", parts=[MessagePart(kind="data", data={"keywords": QUERIES[i % len(QUERIES)], "location": "Remote"})])
+
+
+async def _conversation(turns: int, config, checkpoints):
+    # a store large enough to hold the whole conversation, so "full" really is unbounded
+    agent = JobSeekerAgent(history_store=InMemoryContextStore(max_messages=2 * turns + 2))
+    sizes, latencies, at = [], [], {}
+    for i in range(turns):
+        t0 = time.perf_counter()
+        result = await agent.process_messages([_message(i)], context_id="bench", config=config)
+        body = JSONRPCResponse(id=str(i), result=result).model_dump_json()
+        latencies.append((time.perf_counter() - t0) * 1000.0)
+        sizes.append(len(body))
+        if i + 1 in checkpoints:
+            at[i + 1] = {"response_bytes": len(body), "history_messages": len(result.history)}
+    return {
+        "total_response_bytes": sum(sizes),
+        "last_response_bytes": sizes[-1],
+        "latency_ms": percentiles(latencies),
+        "last_10_latency_ms": percentiles(latencies[-10:]),
+        "by_turn": at,
+    }
+
+
+async def main(args):
+    checkpoints = {t for t in (1, 10, 50, 100, 200, 500, 1000) if t <= args.turns} | {args.turns}
+    modes = {
+        # a limit beyond the conversation length returns everything (the pre-window behaviour)
+        "full": MessageConfiguration(historyLength=10 ** 9, historyTurnOnly=False),
+        "window": MessageConfiguration(historyLength=args.window, historyTurnOnly=False),
+        "turn_only": MessageConfiguration(historyTurnOnly=True),
+    }
+    results = {"turns": args.turns, "window": args.window}
+    for name, config in modes.items():
+        results[name] = await _conversation(args.turns, config, checkpoints)
+    results["full_vs_window_bytes"] = round(results["full"]["total_response_bytes"] / results["window"]["total_response_bytes"], 2)
+    write_results("history_window", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--window", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,90 @@
+# benchmarks/bench_job_dedup.py
+"""
+Near-duplicate job filtering: SimHash with banded (LSH) candidate lookup vs comparing every pair of
+fingerprints, plus fingerprinting cost with a cold and a warm fingerprint cache.
+
+    python -m benchmarks.bench_job_dedup --jobs 100 1000 10000
+
+A tenth of the synthetic jobs are re-posts of another job with a few words changed, so both filters
+should report the same number of removals.
+"""
+import argparse
+import random
+import time
+
+from benchmarks._common import percentiles, timed, write_results
+from services.job_dedup import DEDUP_SIMILARITY, NearDuplicateFilter, SimHasher, job_text, max_distance
+
+ROLES = ["backend", "frontend", "data", "devops", "mobile", "security", "platform", "machine learning"]
+SKILLS = ["python", "java", "go", "rust", "typescript", "react", "kubernetes", "docker", "aws", "sql", "spark", "kafka"]
+# a realistic vocabulary size: with only a few dozen words every description has the same term profile
+WORDS = [f"term{i}" for i in range(5000)] + SKILLS
+
+
+def _jobs(rng: random.Random, n: int):
+    jobs = []
+    for i in range(n):
+        if jobs and rng.random() < 0.1:
+            # re-post: same job with a sentence appended
+            src = rng.choice(jobs)
+            jobs.append({**src, "job_id": f"bench-{i}", "job_description": src["job_description"] + " Apply today."})
+            continue
+        jobs.append({
+            "job_id": f"bench-{i}",
+            "job_title": f"{rng.choice(ROLES).title()} Engineer",
+            "employer_name": f"Company {i}",
+            "job_description": " ".join(rng.choice(WORDS) for _ in range(120)),
+        })
+    return jobs
+
+
+def _pairwise(hasher: SimHasher, jobs, distance: int) -> int:
+    kept, removed = [], 0
+    for job in jobs:
+        fp = hasher.fingerprint(job_text(job))
+        if any((fp ^ other).bit_count() <= distance for other in kept):
+            removed += 1
+        else:
+            kept.append(fp)
+    return removed
+
+
+def _lsh(hasher: SimHasher, jobs) -> int:
+    f = NearDuplicateFilter(DEDUP_SIMILARITY, hasher=hasher)
+    f.filter(jobs)
+    return f.removed
+
+
+def main(args):
+    rng = random.Random(11)
+    distance = max_distance(DEDUP_SIMILARITY)
+    results = {"similarity": DEDUP_SIMILARITY, "max_distance": distance, "by_jobs": {}}
+    for n in args.jobs:
+        jobs = _jobs(rng, n)
+        cold = []
+        for _ in range(3):
+            hasher = SimHasher()
+            t0 = time.perf_counter()
+            for job in jobs:
+                hasher.fingerprint(job_text(job))
+            cold.append((time.perf_counter() - t0) * 1000.0)
+        # fingerprints are warm from here on: the filters themselves are timed
+        repeat = max(1, args.repeat * 100 // n)
+        entry = {
+            "fingerprint_cold_ms": percentiles(cold),
+            "lsh_filter_ms": percentiles(timed(_lsh, hasher, jobs, repeat=repeat)),
+            "lsh_removed": _lsh(hasher, jobs),
+        }
+        if n <= args.pairwise_max:
+            entry["pairwise_filter_ms"] = percentiles(timed(_pairwise, hasher, jobs, distance, repeat=repeat))
+            entry["pairwise_removed"] = _pairwise(hasher, jobs, distance)
+        results["by_jobs"][n] = entry
+    write_results("job_dedup", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pairwise-max", type=int, default=10000, help="skip the O(n^2) baseline above this size")
+    main(parser.parse_args())
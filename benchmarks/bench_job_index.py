@@ -0,0 +1,84 @@
+# benchmarks/bench_job_index.py
+"""
+Local FTS5 job index: ingestion throughput and BM25 search latency.
+
+    python -m benchmarks.bench_job_index --jobs 50000 --searches 2000
+
+Synthetic jobs go into a temporary database; ingestion is measured for new jobs and again for the
+same jobs re-seen unchanged (the upsert only bumps last_seen). Searches use random role/skill
+queries, half of them with a location filter.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks._common import percentiles, write_results
+from services.job_index import JobIndex
+
+ROLES = ["backend", "frontend", "data", "devops", "mobile", "security", "platform", "machine learning", "qa", "site reliability"]
+LEVELS = ["junior", "senior", "staff", "lead", "principal"]
+SKILLS = ["python", "java", "go", "rust", "typescript", "react", "kubernetes", "docker", "aws", "gcp", "sql", "spark", "terraform", "kafka"]
+CITIES = [("Lagos", "NG"), ("Nairobi", "KE"), ("Berlin", "DE"), ("London", "GB"), ("Austin", "US"), ("Remote", "Anywhere")]
+
+
+def _job(rng: random.Random, i: int) -> dict:
+    role = rng.choice(ROLES)
+    skills = rng.sample(SKILLS, 4)
+    city, country = rng.choice(CITIES)
+    return {
+        "job_id": f"bench-{i}",
+        "job_title": f"{rng.choice(LEVELS).title()} {role.title()} Engineer",
+        "employer_name": f"Company {i % 997}",
+        "job_city": city,
+        "job_country": country,
+        "job_description": f"We need a {role} engineer with {', '.join(skills)}. " * 3,
+        "job_apply_link": f"https://jobs.example.com/{i}",
+    }
+
+
+def _ingest(index: JobIndex, jobs, batch: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(0, len(jobs), batch):
+        index.upsert(jobs[i:i + batch])
+    return time.perf_counter() - t0
+
+
+def main(args):
+    rng = random.Random(42)
+    jobs = [_job(rng, i) for i in range(args.jobs)]
+    with tempfile.TemporaryDirectory() as tmp:
+        index = JobIndex(path=os.path.join(tmp, "jobs.db"), max_jobs=args.jobs * 2)
+        new_s = _ingest(index, jobs, args.batch)
+        unchanged_s = _ingest(index, jobs, args.batch)
+
+        latencies, hits = [], []
+        for _ in range(args.searches):
+            query = f"{rng.choice(ROLES)} {rng.choice(SKILLS)}"
+            location = rng.choice(CITIES)[0] if rng.random() < 0.5 else None
+            t0 = time.perf_counter()
+            found = index.search(query, location, limit=args.limit)
+            latencies.append((time.perf_counter() - t0) * 1000.0)
+            hits.append(len(found))
+        db_bytes = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+        index.close()
+
+    write_results("job_index", {
+        "jobs": args.jobs,
+        "batch": args.batch,
+        "ingest_new_jobs_per_s": round(args.jobs / new_s),
+        "ingest_unchanged_jobs_per_s": round(args.jobs / unchanged_s),
+        "db_bytes": db_bytes,
+        "search_ms": percentiles(latencies),
+        "mean_hits": round(sum(hits) / len(hits), 1),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=50000)
+    parser.add_argument("--searches", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=500)
+    main(parser.parse_args())
@@ -0,0 +1,112 @@
+# benchmarks/bench_job_ranking.py
+"""
+Semantic job ranking: one normalized matmul vs a per-job Python cosine loop, and end-to-end
+JobRanker.rank latency with cold and warm embedding caches.
+
+    python -m benchmarks.bench_job_ranking --candidates 100 300 1000
+    python -m benchmarks.bench_job_ranking --embedder hash   # no sentence-transformers needed
+
+`--embedder model` uses SENTENCE_MODEL through the registry (as the app does); `--embedder hash` swaps in
+a feature-hashing bag-of-words embedder of the same width, which isolates the scoring and cache path
+from transformer inference.
+"""
+import argparse
+import asyncio
+import hashlib
+import math
+import random
+import time
+
+import numpy as np
+
+from benchmarks._common import percentiles, timed, write_results
+from services.embedding_cache import CachedEncoder, EmbeddingCache
+from services.extraction_pool import ExtractionService
+from services.job_ranker import JobRanker, cosine_scores
+from services.model_registry import registry
+
+ROLES = ["backend", "frontend", "data", "devops", "mobile", "security", "machine learning"]
+SKILLS = ["python", "java", "go", "typescript", "react", "kubernetes", "docker", "aws", "sql", "spark", "terraform"]
+
+
+class HashEmbedder:
+    """Feature-hashing embedder: each word adds +-1 to one of `dim` buckets."""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, texts, show_progress_bar: bool = False) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                h = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "little")
+                out[row, h % self.dim] += 1.0 if h & (1 << 63) else -1.0
+        return out
+
+
+def _jobs(rng: random.Random, n: int, offset: int):
+    return [
+        {
+            "job_id": f"bench-{offset + i}",
+            "job_title": f"{rng.choice(ROLES).title()} Engineer",
+            "job_description": f"Build services with {', '.join(rng.sample(SKILLS, 4))}. " * 6,
+        }
+        for i in range(n)
+    ]
+
+
+def _loop_cosine(query, docs):
+    q_norm = math.sqrt(sum(x * x for x in query)) or 1.0
+    out = []
+    for row in docs:
+        dot = sum(a * b for a, b in zip(row, query))
+        out.append(dot / ((math.sqrt(sum(x * x for x in row)) or 1.0) * q_norm))
+    return out
+
+
+async def _rank_latency(ranker: JobRanker, rng: random.Random, n: int, repeat: int):
+    cold, warm = [], []
+    for r in range(repeat):
+        jobs = _jobs(rng, n, offset=r * n)
+        skills = rng.sample(SKILLS, 3)
+        for bucket in (cold, warm):
+            t0 = time.perf_counter()
+            ranked = await ranker.rank(jobs, "software engineer", skills)
+            bucket.append((time.perf_counter() - t0) * 1000.0)
+            assert "match_score" in ranked[0], ranker.last_error
+    return percentiles(cold), percentiles(warm)
+
+
+async def main(args):
+    rng = random.Random(3)
+    if args.embedder == "hash":
+        model = HashEmbedder()
+        registry.register("embedder", lambda: CachedEncoder(model, "hash-384", cache=EmbeddingCache("hash-384", model.dim)))
+    dim = registry.get("embedder").encode(["warm up"]).shape[1]
+    # inline: measure ranking itself, not pool hand-off
+    ranker = JobRanker(service=ExtractionService(mode="inline"), enabled=True)
+
+    results = {"embedder": args.embedder, "dim": int(dim), "by_candidates": {}}
+    for n in args.candidates:
+        query = np.random.default_rng(n).standard_normal(dim).astype(np.float32)
+        docs = np.random.default_rng(n + 1).standard_normal((n, dim)).astype(np.float32)
+        docs_list, query_list = docs.tolist(), query.tolist()
+        cold, warm = await _rank_latency(ranker, rng, n, args.repeat)
+        results["by_candidates"][n] = {
+            "numpy_cosine_ms": percentiles(timed(cosine_scores, query, docs, repeat=args.repeat * 10)),
+            "python_loop_cosine_ms": percentiles(timed(_loop_cosine, query_list, docs_list, repeat=max(1, args.repeat // 2))),
+            "rank_cold_cache_ms": cold,
+            "rank_warm_cache_ms": warm,
+        }
+    write_results("job_ranking", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--embedder", choices=["model", "hash"], default="model")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,89 @@
+# benchmarks/bench_json_response.py
+"""
+Encoding a task response: model_dump() + FastAPI's encoder vs FastJSONResponse with cached fragments.
+
+    python -m benchmarks.bench_json_response --jobs 8 --history 20 --repeat 500
+"""
+import argparse
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks._common import percentiles, timed, write_results
+from benchmarks.bench_skill_matcher import make_descriptions
+from models.a2a import JSONRPCResponse
+from utils.a2a_response import make_agent_message, make_artifact, make_task_result
+from utils.json_response import FastJSONResponse, orjson
+
+
+def make_response(jobs: int, history: int, words: int) -> JSONRPCResponse:
+    descriptions = make_descriptions(jobs, words)
+    job_list = [
+        {
+            "job_id": f"job-{i}",
+            "job_title": f"Backend Engineer {i}",
+            "employer_name": "Acme Corp",
+            "job_city": "Lagos",
+            "job_country": "NG",
+            "job_description": d,
+            "job_apply_link": f"https://jobs.example.com/{i}",
+        }
+        for i, d in enumerate(descriptions)
+    ]
+    messages = [make_agent_message(f"turn {i}: found {jobs} job(s)", "task") for i in range(history)]
+    artifacts = [
+        make_artifact("jobs", "data", {"jobs": job_list}),
+        make_artifact("skills", "data", {"top_skills": ["python", "sql", "docker"]}),
+        make_artifact("recommendation", "text", "Highlight projects and quantify outcomes."),
+    ]
+    result = make_task_result("task", "ctx", "input-required", messages[-1] if messages else make_agent_message("", "task"), artifacts, messages)
+    return JSONRPCResponse(id="1", result=result)
+
+
+def legacy_encode(response: JSONRPCResponse) -> bytes:
+    # what FastAPI did with the `response.model_dump()` the endpoint used to return
+    return JSONResponse(content=jsonable_encoder(response.model_dump())).body
+
+
+def fast_encode(response: JSONRPCResponse) -> bytes:
+    return FastJSONResponse(content=response).body
+
+
+def fast_encode_cold(args) -> bytes:
+    # fresh models every call: no cached fragments, pays the full encoding cost
+    return fast_encode(make_response(args.jobs, args.history, args.words))
+
+
+def main(args):
+    response = make_response(args.jobs, args.history, args.words)
+    legacy_bytes = legacy_encode(response)
+    fast_bytes = fast_encode(response)
+    build = timed(make_response, args.jobs, args.history, args.words, repeat=args.repeat)
+    legacy = timed(legacy_encode, response, repeat=args.repeat)
+    warm = timed(fast_encode, response, repeat=args.repeat)
+    cold = timed(fast_encode_cold, args, repeat=args.repeat)
+    build_p50 = percentiles(build)["p50"]
+    results = {
+        "jobs": args.jobs,
+        "history": args.history,
+        "response_bytes": len(legacy_bytes),
+        "byte_identical": legacy_bytes == fast_bytes,
+        "orjson": orjson is not None,
+        "legacy_ms": percentiles(legacy),
+        "fast_cached_ms": percentiles(warm),
+        # cold timings include building the models; build_ms is subtracted in the speedup
+        "fast_cold_with_build_ms": percentiles(cold),
+        "build_ms": percentiles(build),
+        "speedup_cold_p50": round(percentiles(legacy)["p50"] / max(percentiles(cold)["p50"] - build_p50, 1e-6), 2),
+        "speedup_cached_p50": round(percentiles(legacy)["p50"] / percentiles(warm)["p50"], 2),
+    }
+    write_results("json_response", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--history", type=int, default=20)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--repeat", type=int, default=500)
+    main(parser.parse_args())
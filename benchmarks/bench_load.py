@@ -0,0 +1,187 @@
+# benchmarks/bench_load.py
+"""
+Concurrent load against /a2a/jobseeker: throughput, p50/p95/p99 latency and status codes.
+
+    python -m benchmarks.bench_load --concurrency 16 --duration 30 --queries 50 --latency-ms 200
+    python -m benchmarks.bench_load --url http://127.0.0.1:8000 --concurrency 32 --duration 60
+
+Without --url the JSearch stub (benchmarks/jsearch_stub.py) is started on a thread and the app in a
+uvicorn subprocess pointed at it through JSEARCH_BASE_URL, with the RapidAPI rate limit lifted and the
+job index in a temporary directory. With --url an already running app is driven as is.
+
+Each of --concurrency workers sends message/send calls back to back (closed loop). Keywords are drawn
+from --queries distinct queries, so fewer queries means more job cache hits. --text-ratio sends that
+share as free text, which goes through spaCy/KeyBERT instead of a structured data part.
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+import uvicorn
+
+from benchmarks._common import ROOT, percentiles, write_results
+from benchmarks.jsearch_stub import ROLES, create_app
+
+SKILLS = ["python", "go", "java", "react", "kubernetes", "sql", "aws", "spark", "terraform", "typescript"]
+CITIES = ["Lagos", "Nairobi", "Berlin", "London", "Austin", "Remote"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_stub(args) -> str:
+    # own thread and event loop: stub latency and serialization do not run on the load generator's loop
+    port = _free_port()
+    app = create_app(args.latency_ms, args.jitter, args.description_words, args.error_rate, seed=1)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+def _start_app(stub_url: str, tmp: str, workers: int) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "JSEARCH_BASE_URL": f"{stub_url}/search",
+        "JSEARCH_API_KEY": "stub",
+        "JSEARCH_RATE_PER_SEC": "100000",
+        "JSEARCH_RATE_BURST": "100000",
+        "JOB_INDEX_PATH": os.path.join(tmp, "jobs.db"),
+        "CONTEXT_STORE_PATH": os.path.join(tmp, "contexts.db"),
+    }
+    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--workers", str(workers)]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 120.0
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"app exited with {proc.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return proc, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("app did not become healthy within 120 s")
+
+
+def _queries(n: int, seed: int = 5) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {"keywords": f"{rng.choice(ROLES).lower()} {rng.choice(SKILLS)} engineer", "location": rng.choice(CITIES), "userSkills": rng.sample(SKILLS, 3)}
+        for _ in range(n)
+    ]
+
+
+def _payload(i: int, query: Dict[str, Any], args, rng: random.Random) -> Dict[str, Any]:
+    if rng.random() < args.text_ratio:
+        part = {"kind": "text", "text": {"message": f"{query['keywords']} jobs in {query['location']}"}}
+    else:
+        part = {"kind": "data", "data": {**query, "perPage": args.per_page, "pages": args.pages}}
+    return {"jsonrpc": "2.0", "id": str(i), "method": "message/send", "params": {"message": {"role": "user", "parts": [part]}}}
+
+
+def _new_run() -> Dict[str, Any]:
+    return {"latency": [], "ok_latency": [], "status": Counter()}
+
+
+async def _worker(client: httpx.AsyncClient, url: str, queries, args, stop_at: float, tickets: Optional[Iterator[int]], out: Dict[str, Any], seed: int):
+    # `tickets` caps the total number of requests across workers (None: run until stop_at)
+    rng = random.Random(seed)
+    while time.monotonic() < stop_at:
+        if tickets is not None and next(tickets, None) is None:
+            return
+        i = rng.randrange(1 << 30)
+        t0 = time.perf_counter()
+        try:
+            r = await client.post(url, json=_payload(i, rng.choice(queries), args, rng))
+            status = str(r.status_code)
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        elapsed = (time.perf_counter() - t0) * 1000.0
+        out["latency"].append(elapsed)
+        out["status"][status] += 1
+        if status == "200":
+            out["ok_latency"].append(elapsed)
+
+
+async def _drive(url: str, args) -> Dict[str, Any]:
+    queries = _queries(args.queries)
+    endpoint = f"{url}/a2a/jobseeker"
+    out = _new_run()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        if args.warmup:
+            # connections, caches and models warm; not measured
+            stop_at = time.monotonic() + args.warmup
+            await asyncio.gather(*(_worker(client, endpoint, queries, args, stop_at, None, _new_run(), 1000 + w) for w in range(args.concurrency)))
+        tickets = iter(range(args.requests)) if args.requests else None
+        started = time.perf_counter()
+        stop_at = time.monotonic() + args.duration
+        await asyncio.gather(*(_worker(client, endpoint, queries, args, stop_at, tickets, out, w) for w in range(args.concurrency)))
+        wall = time.perf_counter() - started
+        health = (await client.get(f"{url}/health")).json()
+    return {
+        "wall_s": round(wall, 3),
+        "requests": len(out["latency"]),
+        "throughput_rps": round(len(out["latency"]) / wall, 2),
+        "ok_throughput_rps": round(len(out["ok_latency"]) / wall, 2),
+        "latency_ms": percentiles(out["latency"]),
+        "ok_latency_ms": percentiles(out["ok_latency"]),
+        "status": dict(out["status"]),
+        "server": {k: health.get(k) for k in ("job_cache", "upstream_flight", "jsearch_resilience", "extraction")},
+    }
+
+
+def main(args):
+    config = {k: v for k, v in vars(args).items() if k != "url"}
+    if args.url:
+        results = asyncio.run(_drive(args.url.rstrip("/"), args))
+        write_results("load", {"target": args.url, "config": config, **results})
+        return
+    stub_url = _start_stub(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        proc, url = _start_app(stub_url, tmp, args.workers)
+        try:
+            results = asyncio.run(_drive(url, args))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+    results["stub"] = httpx.get(f"{stub_url}/stats").json()
+    write_results("load", {"target": "local stub", "config": config, **results})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="drive a running app instead of starting the stub and the app")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of measured load")
+    parser.add_argument("--requests", type=int, help="stop after this many requests (and at --duration at the latest)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of unmeasured load first")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--queries", type=int, default=50, help="distinct queries; fewer means more cache hits")
+    parser.add_argument("--per-page", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--text-ratio", type=float, default=0.0, help="share of free-text requests (spaCy/KeyBERT)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the local app")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="stub latency per page")
+    parser.add_argument("--jitter", type=float, default=0.5)
+    parser.add_argument("--description-words", type=int, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    main(parser.parse_args())
@@ -0,0 +1,124 @@
+# benchmarks/bench_micro.py
+"""
+Micro-benchmarks of the request path, one stage at a time:
+
+- extract_keywords: spaCy only, and spaCy + KeyBERT (skipped when the models are not installed);
+- JSearchClient._normalize_job on raw JSearch-shaped jobs;
+- find_jobs_and_skills with an instant in-memory upstream: cache miss (new query) vs cache hit;
+- response serialization (FastJSONResponse) of fresh and of already-encoded results.
+
+    python -m benchmarks.bench_micro --repeat 200 --per-page 10 --description-words 200
+    python -m benchmarks.bench_micro --only normalize serialize
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks._common import percentiles, timed, write_results
+from benchmarks.bench_json_response import fast_encode, make_response
+from benchmarks.jsearch_stub import make_job
+from services import jobseeker_service
+from services.jobseeker_service import find_jobs_and_skills, jsearch
+from services.rate_limiter import RateLimiter
+
+TEXTS = [
+    "senior backend python engineer remote in Lagos",
+    "looking for a data analyst role with SQL and Tableau in Nairobi",
+    "machine learning engineer, pytorch and kubernetes, Berlin or remote",
+    "entry level react frontend developer jobs in London",
+]
+STAGES = ["extract_keywords", "normalize", "find_jobs", "serialize"]
+
+
+def bench_extract_keywords(args):
+    try:
+        from services.skill_extractor import extract_keywords
+        extract_keywords(TEXTS[0], use_semantic=True)  # model load is not measured
+    except (ImportError, OSError) as e:
+        return {"skipped": f"models unavailable: {e}"}
+    out = {}
+    for semantic in (False, True):
+        samples = []
+        for i in range(args.repeat):
+            t0 = time.perf_counter()
+            extract_keywords(TEXTS[i % len(TEXTS)], use_semantic=semantic)
+            samples.append((time.perf_counter() - t0) * 1000.0)
+        out["spacy_keybert_ms" if semantic else "spacy_ms"] = percentiles(samples)
+    return out
+
+
+def bench_normalize(args):
+    raw = [make_job("python engineer", 1, i, args.description_words) for i in range(args.per_page)]
+    per_page = timed(lambda: [jsearch._normalize_job(j) for j in raw], repeat=args.repeat * 10)
+    return {
+        "jobs_per_call": len(raw),
+        "page_ms": percentiles(per_page),
+        "per_job_us": round(sum(per_page) / len(per_page) / len(raw) * 1000.0, 3),
+    }
+
+
+def _upstream(description_words: int):
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        jobs = [make_job(params["query"], int(params["page"]), i, description_words) for i in range(int(params["size"]))]
+        return httpx.Response(200, json={"status": "OK", "data": jobs})
+
+    return httpx.MockTransport(handler)
+
+
+async def _find_jobs(args):
+    jsearch.api_key = "bench"
+    jsearch._client = httpx.AsyncClient(transport=_upstream(args.description_words))
+    # measure the request path, not the RapidAPI quota or background index writes
+    jsearch.limiter = RateLimiter(rate=1e9, burst=1_000_000)
+    jobseeker_service.JOB_INDEX_INGEST = False
+    miss, hit = [], []
+    for i in range(args.repeat):
+        for bucket, query in ((miss, f"engineer {i}"), (hit, "engineer 0")):
+            t0 = time.perf_counter()
+            res = await find_jobs_and_skills(query, "Remote", per_page=args.per_page, pages=args.pages)
+            bucket.append((time.perf_counter() - t0) * 1000.0)
+            assert res["jobs"], "no jobs returned"
+    await jsearch.aclose()
+    # includes building the stub payload and httpx's in-memory round trip on a miss
+    return {"cache_miss_ms": percentiles(miss), "cache_hit_ms": percentiles(hit)}
+
+
+def bench_find_jobs(args):
+    return asyncio.run(_find_jobs(args))
+
+
+def bench_serialize(args):
+    fresh = [make_response(args.per_page * args.pages, args.history, args.description_words) for _ in range(args.repeat)]
+    samples = []
+    for response in fresh:
+        t0 = time.perf_counter()
+        body = fast_encode(response)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return {
+        "response_bytes": len(body),
+        "fresh_ms": percentiles(samples),
+        # artifacts and messages are encoded once and reused as fragments (e.g. tasks/get)
+        "reencode_ms": percentiles(timed(fast_encode, fresh[0], repeat=args.repeat)),
+    }
+
+
+def main(args):
+    runners = {"extract_keywords": bench_extract_keywords, "normalize": bench_normalize, "find_jobs": bench_find_jobs, "serialize": bench_serialize}
+    results = {"per_page": args.per_page, "pages": args.pages, "description_words": args.description_words}
+    for stage in args.only or STAGES:
+        results[stage] = runners[stage](args)
+    write_results("micro", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--description-words", type=int, default=200)
+    parser.add_argument("--history", type=int, default=20)
+    parser.add_argument("--only", nargs="+", choices=STAGES)
+    main(parser.parse_args())
@@ -0,0 +1,81 @@
+# benchmarks/bench_push_notifier.py
+"""
+Push-notification delivery against the stub receiver (started in-process on a free port).
+
+    python -m benchmarks.bench_push_notifier --notifications 500 --fail-rate 0.2 --concurrency 8
+"""
+import argparse
+import asyncio
+import socket
+import time
+
+import uvicorn
+
+from benchmarks._common import write_results
+from benchmarks.push_receiver import create_app
+from models.a2a import PushNotificationConfig
+from services.push_notifier import PushNotifier
+from utils.a2a_response import make_agent_message, make_task_result
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def main(args):
+    app = create_app(args.fail_rate, args.fail_status, args.delay_ms, seed=7)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    notifier = PushNotifier(
+        concurrency=args.concurrency,
+        max_queue=args.notifications,
+        backoff_base=args.backoff_base,
+        rate_per_host=args.rate,
+        burst_per_host=args.burst,
+        # the stub receiver is on loopback, which is refused unless allowlisted
+        allowed_hosts=["127.0.0.1"],
+    )
+    config = PushNotificationConfig(url=f"http://127.0.0.1:{port}/hook", token="bench")
+    t0 = time.perf_counter()
+    for i in range(args.notifications):
+        msg = make_agent_message(f"Found {i} job(s)", f"task-{i}")
+        notifier.notify(config, make_task_result(f"task-{i}", "ctx", "completed", msg, [], [msg]))
+    while notifier.stats()["queue_depth"] or notifier.stats()["in_flight"] or notifier.stats()["pending_retries"]:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - t0
+    await notifier.aclose()
+    server.should_exit = True
+    await serving
+
+    received = app.state.receiver
+    results = {
+        "notifications": args.notifications,
+        "concurrency": args.concurrency,
+        "fail_rate": args.fail_rate,
+        "rate_per_host": args.rate,
+        "elapsed_s": round(elapsed, 3),
+        "delivered_per_s": round(received["received"] / elapsed, 1),
+        "receiver": {"received": received["received"], "failed_on_purpose": received["failed"], "unique_tasks": len(received["tasks"])},
+        "notifier": notifier.stats(),
+        "dead_letters": notifier.dead_letters()[:5],
+    }
+    write_results("push_notifier", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notifications", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--fail-rate", type=float, default=0.2)
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument("--delay-ms", type=float, default=5.0)
+    parser.add_argument("--backoff-base", type=float, default=0.05)
+    parser.add_argument("--rate", type=float, default=200.0)
+    parser.add_argument("--burst", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
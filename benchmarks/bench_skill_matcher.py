@@ -0,0 +1,98 @@
+# benchmarks/bench_skill_matcher.py
+"""
+Top-skill extraction: legacy regex token counting vs the compiled skill matcher.
+
+    python -m benchmarks.bench_skill_matcher --descriptions 2000 --repeat 20
+"""
+import argparse
+import random
+import re
+import tracemalloc
+
+from benchmarks._common import percentiles, timed, write_results
+from services.skill_aggregator import SkillAggregator
+from services.skill_matcher import SkillMatcher
+
+FILLER = (
+    "we are seeking a motivated engineer to join our growing team you will design build and maintain "
+    "scalable services collaborate with product and design and mentor junior colleagues experience "
+    "with modern tooling strong problem solving skills and ownership are required benefits include "
+    "remote work flexible hours learning budget and health insurance"
+).split()
+SKILL_PHRASES = [
+    "Python", "SQL", "Docker", "Kubernetes", "AWS", "GCP", "CI/CD", "machine learning", "React",
+    "Node.js", "TypeScript", "PostgreSQL", "Terraform", "C++", "C#", ".NET", "Power BI", "Tableau",
+    "REST APIs", "microservices", "Kafka", "Spark", "pandas", "scikit-learn", "Figma", "Agile",
+]
+
+
+def legacy_top_skills(texts):
+    # the pre-matcher implementation of find_jobs_and_skills, kept here for comparison
+    tokens = []
+    for t in texts:
+        tokens.extend(re.findall(r"[A-Za-z\+\-\.#]{2,}", t.lower()))
+    stop = set(["the","and","with","for","our","we","you","is","in","on","to","a","an"])
+    freq = {}
+    for tk in tokens:
+        if tk in stop: continue
+        freq[tk] = freq.get(tk,0)+1
+    common_ordered = sorted(freq.items(), key=lambda x:-x[1])
+    return [k for k,_ in common_ordered[:10]]
+
+
+def matcher_top_skills(matcher, texts):
+    return [k for k, _ in matcher.count(texts).most_common(10)]
+
+
+def peak_alloc_kb(fn, *args) -> float:
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(peak / 1024.0, 1)
+
+
+def aggregator_top_skills(matcher, texts):
+    return SkillAggregator(matcher).add_many(texts).top_k(10)
+
+
+def make_descriptions(n: int, words: int, seed: int = 7):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        parts = [rng.choice(FILLER) for _ in range(words)]
+        for _ in range(max(1, words // 25)):
+            parts.insert(rng.randrange(len(parts)), rng.choice(SKILL_PHRASES) + ",")
+        out.append(" ".join(parts))
+    return out
+
+
+def main(args):
+    texts = make_descriptions(args.descriptions, args.words)
+    matcher = SkillMatcher()
+    legacy = timed(legacy_top_skills, texts, repeat=args.repeat)
+    compiled = timed(matcher_top_skills, matcher, texts, repeat=args.repeat)
+    streaming = timed(aggregator_top_skills, matcher, texts, repeat=args.repeat)
+    results = {
+        "descriptions": args.descriptions,
+        "words_per_description": args.words,
+        "input_bytes": sum(len(t) for t in texts),
+        "legacy_ms": percentiles(legacy),
+        "matcher_ms": percentiles(compiled),
+        "aggregator_ms": percentiles(streaming),
+        "speedup_p50": round(percentiles(legacy)["p50"] / percentiles(compiled)["p50"], 2),
+        "legacy_peak_alloc_kb": peak_alloc_kb(legacy_top_skills, texts),
+        "matcher_peak_alloc_kb": peak_alloc_kb(matcher_top_skills, matcher, texts),
+        "aggregator_peak_alloc_kb": peak_alloc_kb(aggregator_top_skills, matcher, texts),
+        "legacy_top_skills": legacy_top_skills(texts),
+        "matcher_top_skills": matcher_top_skills(matcher, texts),
+    }
+    write_results("skill_matcher", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--descriptions", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
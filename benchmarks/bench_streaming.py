@@ -0,0 +1,128 @@
+# benchmarks/bench_streaming.py
+"""
+Client-side time to first byte vs total time: message/send (blocking) vs message/stream (SSE).
+
+    python -m benchmarks.bench_streaming --requests 20 --pages 4 --page-latency-ms 150
+
+The app runs in-process under uvicorn; JSearch is replaced by an in-memory transport whose pages take
+--page-latency-ms each (jittered), so the numbers reflect the pipeline rather than RapidAPI.
+Every request uses new keywords, so the job cache never answers.
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import time
+
+import httpx
+import uvicorn
+
+from benchmarks._common import percentiles, write_results
+import main as app_main
+from services.jobseeker_service import jsearch
+from services.rate_limiter import RateLimiter
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _upstream(latency_ms: float, per_page: int):
+    rng = random.Random(7)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        await asyncio.sleep(latency_ms * rng.uniform(0.5, 1.5) / 1000.0)
+        jobs = [
+            {"job_id": f"{request.url.params['query']}-{page}-{i}", "job_title": "Engineer", "job_description": "Python, SQL and Docker on AWS."}
+            for i in range(per_page)
+        ]
+        return httpx.Response(200, json={"data": jobs})
+
+    return httpx.MockTransport(handler)
+
+
+def _payload(i: int, method: str, args) -> dict:
+    data = {"keywords": f"engineer {method} {i}", "location": "Remote", "pages": args.pages, "perPage": args.per_page}
+    return {
+        "jsonrpc": "2.0",
+        "id": str(i),
+        "method": method,
+        "params": {"message": {"role": "user", "parts": [{"kind": "data", "data": data}]}},
+    }
+
+
+async def _blocking(client: httpx.AsyncClient, url: str, i: int, args):
+    t0 = time.perf_counter()
+    async with client.stream("POST", url, json=_payload(i, "message/send", args)) as r:
+        ttfb = None
+        async for _ in r.aiter_bytes():
+            if ttfb is None:
+                ttfb = (time.perf_counter() - t0) * 1000.0
+    return ttfb, (time.perf_counter() - t0) * 1000.0, None
+
+
+async def _streaming(client: httpx.AsyncClient, url: str, i: int, args):
+    t0 = time.perf_counter()
+    ttfb = first_jobs = None
+    async with client.stream("POST", url, json=_payload(i, "message/stream", args)) as r:
+        async for line in r.aiter_lines():
+            if not line:
+                continue
+            now = (time.perf_counter() - t0) * 1000.0
+            ttfb = ttfb if ttfb is not None else now
+            event = json.loads(line[len("data: "):]).get("result") or {}
+            if first_jobs is None and event.get("artifact", {}).get("name") == "jobs":
+                first_jobs = now
+    return ttfb, (time.perf_counter() - t0) * 1000.0, first_jobs
+
+
+async def _run(fn, client, url, args, offset: int):
+    ttfb, total, first_jobs = [], [], []
+    for i in range(args.requests):
+        t, tot, fj = await fn(client, url, offset + i, args)
+        ttfb.append(t)
+        total.append(tot)
+        if fj is not None:
+            first_jobs.append(fj)
+    out = {"ttfb_ms": percentiles(ttfb), "total_ms": percentiles(total)}
+    if first_jobs:
+        out["first_jobs_chunk_ms"] = percentiles(first_jobs)
+    return out
+
+
+async def main(args):
+    jsearch.api_key = "bench"
+    jsearch._client = httpx.AsyncClient(transport=_upstream(args.page_latency_ms, args.per_page))
+    jsearch.limiter = RateLimiter(rate=1e9, burst=1_000_000)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app_main.app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    url = f"http://127.0.0.1:{port}/a2a/jobseeker"
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        results = {
+            "requests": args.requests,
+            "pages": args.pages,
+            "per_page": args.per_page,
+            "page_latency_ms": args.page_latency_ms,
+            "message_send": await _run(_blocking, client, url, args, 0),
+            "message_stream": await _run(_streaming, client, url, args, args.requests),
+        }
+    server.should_exit = True
+    await serving
+    results["server_stream_stats"] = app_main.stream_stats()
+    write_results("streaming", results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--per-page", type=int, default=8)
+    parser.add_argument("--page-latency-ms", type=float, default=150.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,117 @@
+# benchmarks/jsearch_stub.py
+"""
+Local stand-in for the RapidAPI JSearch /search endpoint, with configurable latency, payload size and
+error rate. Point the app at it instead of RapidAPI:
+
+    python -m benchmarks.jsearch_stub --port 9010 --latency-ms 200 --jitter 0.5 --description-words 300 --error-rate 0.02
+    JSEARCH_BASE_URL=http://127.0.0.1:9010/search JSEARCH_API_KEY=stub uvicorn main:app --port 8000
+
+Responses have the JSearch shape ({"status": "OK", "data": [...]}) and honour query/page/size.
+The same (query, page) always returns the same jobs, so the app's cache and dedup behave as with the
+real API. --rate-limit-rate answers that share of calls with 429 + Retry-After; GET /stats shows
+what was served.
+"""
+import argparse
+import asyncio
+import hashlib
+import itertools
+import random
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from benchmarks.bench_skill_matcher import FILLER, SKILL_PHRASES
+
+ROLES = ["Backend", "Frontend", "Data", "DevOps", "Mobile", "Security", "Platform", "Machine Learning", "QA"]
+LEVELS = ["Junior", "Mid-level", "Senior", "Staff", "Lead"]
+CITIES = [("Lagos", "NG"), ("Nairobi", "KE"), ("Berlin", "DE"), ("London", "GB"), ("Austin", "US"), ("Remote", None)]
+# a few hundred made-up words, so descriptions differ as much as real ones do (and survive dedup)
+_SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "bra", "cle", "dro", "fi", "gu", "ho", "ja", "pe", "qui", "sto", "wa"]
+VOCAB = ["".join(p) for p in itertools.product(_SYLLABLES, repeat=2)]
+
+
+def make_job(query: str, page: int, i: int, description_words: int) -> Dict[str, Any]:
+    seed = int.from_bytes(hashlib.blake2b(f"{query}|{page}|{i}".encode(), digest_size=8).digest(), "little")
+    rng = random.Random(seed)
+    city, country = rng.choice(CITIES)
+    employer = f"{rng.choice(VOCAB).title()} {rng.choice(['Labs', 'Systems', 'Group', 'Technologies'])}"
+    words = [rng.choice(FILLER) if rng.random() < 0.5 else rng.choice(VOCAB) for _ in range(description_words)]
+    for _ in range(max(1, description_words // 25)):
+        words.insert(rng.randrange(len(words)), rng.choice(SKILL_PHRASES) + ",")
+    return {
+        "job_id": f"stub-{seed:016x}",
+        "job_title": f"{rng.choice(LEVELS)} {rng.choice(ROLES)} Engineer",
+        "employer_name": employer,
+        "job_city": city,
+        "job_country": country,
+        "job_description": " ".join(words),
+        "job_apply_link": f"https://jobs.example.com/{seed:016x}",
+        "job_employment_type": rng.choice(["FULLTIME", "CONTRACTOR", "PARTTIME"]),
+        "job_is_remote": city == "Remote",
+    }
+
+
+def create_app(
+    latency_ms: float = 100.0,
+    jitter: float = 0.5,
+    description_words: int = 200,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    rate_limit_rate: float = 0.0,
+    seed: Optional[int] = None,
+) -> FastAPI:
+    app = FastAPI(title="JSearch stub")
+    rng = random.Random(seed)
+    state: Dict[str, Any] = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "jobs_served": 0, "bytes_served": 0}
+    app.state.stub = state
+
+    @app.get("/search")
+    async def search(request: Request):
+        params = request.query_params
+        state["requests"] += 1
+        if latency_ms:
+            # uniform in latency * (1 ± jitter)
+            await asyncio.sleep(max(0.0, latency_ms * rng.uniform(1.0 - jitter, 1.0 + jitter)) / 1000.0)
+        if rng.random() < rate_limit_rate:
+            state["rate_limited"] += 1
+            return JSONResponse(status_code=429, content={"message": "Too many requests"}, headers={"Retry-After": "1"})
+        if rng.random() < error_rate:
+            state["errors"] += 1
+            return JSONResponse(status_code=error_status, content={"message": "stub failure"})
+        query = params.get("query", "")
+        page = int(params.get("page", 1))
+        size = int(params.get("size", 10))
+        jobs: List[Dict[str, Any]] = [make_job(query, page, i, description_words) for i in range(size)]
+        response = JSONResponse(
+            content={"status": "OK", "request_id": f"stub-{state['requests']}", "data": jobs},
+            headers={"X-RateLimit-Requests-Limit": "1000000", "X-RateLimit-Requests-Remaining": "999999"},
+        )
+        state["ok"] += 1
+        state["jobs_served"] += len(jobs)
+        state["bytes_served"] += len(response.body)
+        return response
+
+    @app.get("/stats")
+    async def stats():
+        return state
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9010)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--jitter", type=float, default=0.5, help="latency varies uniformly by ± this fraction")
+    parser.add_argument("--description-words", type=int, default=200, help="payload size: words per job description")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    app = create_app(args.latency_ms, args.jitter, args.description_words, args.error_rate, args.error_status, args.rate_limit_rate, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,60 @@
+# benchmarks/push_receiver.py
+"""
+Stub webhook receiver for push-notification tests: records deliveries and can inject failures.
+
+    python -m benchmarks.push_receiver --port 9009 --fail-rate 0.3 --fail-status 503 --delay-ms 20
+
+Point a task's pushNotificationConfig.url at http://127.0.0.1:9009/hook; GET /stats shows what arrived.
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Request, Response
+
+
+def create_app(fail_rate: float = 0.0, fail_status: int = 503, delay_ms: float = 0.0, token: Optional[str] = None, seed: Optional[int] = None) -> FastAPI:
+    app = FastAPI(title="push receiver stub")
+    rng = random.Random(seed)
+    state: Dict[str, Any] = {"received": 0, "failed": 0, "rejected": 0, "tasks": {}, "first_at": None, "last_at": None}
+    app.state.receiver = state
+
+    @app.post("/hook")
+    async def hook(request: Request):
+        body = await request.json()
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000.0)
+        if token is not None and request.headers.get("x-a2a-notification-token") != token:
+            state["rejected"] += 1
+            return Response(status_code=401)
+        if rng.random() < fail_rate:
+            state["failed"] += 1
+            return Response(status_code=fail_status)
+        now = time.time()
+        state["received"] += 1
+        state["first_at"] = state["first_at"] or now
+        state["last_at"] = now
+        state["tasks"][body.get("id")] = body.get("status", {}).get("state")
+        return {"ok": True}
+
+    @app.get("/stats")
+    async def stats():
+        return {k: (len(v) if k == "tasks" else v) for k, v in state.items()}
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9009)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument("--delay-ms", type=float, default=0.0)
+    parser.add_argument("--token")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.fail_rate, args.fail_status, args.delay_ms, args.token), host=args.host, port=args.port, log_level="warning")
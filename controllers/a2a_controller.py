@@ -54,19 +54,103 @@
 
 # controllers/a2a_controller.py
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import ValidationError
-from models.a2a import JSONRPCRequest, JSONRPCResponse, TaskResult
+from collections import deque
+from time import perf_counter
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+from uuid import uuid4
+from models.a2a import JSONRPCRequest, JSONRPCResponse, TaskResult, MessageParams, ExecuteParams, TaskQueryParams, TaskStatusUpdateEvent
 from agents.jobseeker_agent import JobSeekerAgent
-from utils.a2a_response import create_error_response, A2AErrorCode
+from services.task_engine import task_engine, TaskQueueFull
+from services.push_notifier import push_notifier
+from services.rate_limiter import RateLimitExceeded
+from services.request_profiler import ProfileSession, request_profiler
+from services.resilience import CircuitOpenError
+from utils.a2a_response import create_error_response, A2AErrorCode, make_working_task
+from utils.json_response import FastJSONResponse, dumps, encode_model
+from utils.metrics import timed
+import asyncio
+import json
+import math
+import os
 import traceback
 
 router = APIRouter()
 agent = JobSeekerAgent()
 
+_PARAMS = {"message/send": MessageParams, "message/stream": MessageParams, "execute": ExecuteParams, "tasks/get": TaskQueryParams}
+
+# JSON-RPC batch arrays: at most BATCH_MAX_SIZE calls per request, BATCH_MAX_CONCURRENCY of them running at once
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "20"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+# (time to first event, total time) in ms for recent message/stream calls
+_stream_timings: Deque[Tuple[Optional[float], float]] = deque(maxlen=1000)
+
 @router.post("/a2a/jobseeker")
 async def a2a_endpoint(request: Request):
-    body = await request.json()
+    started = perf_counter()
+    try:
+        body = await request.json()
+    except ValueError as e:
+        return JSONResponse(status_code=400, content=create_error_response(None, A2AErrorCode.PARSE_ERROR, "Parse error", {"details": str(e)}))
+    # PROFILE_TOKEN / PROFILE_SAMPLE_RATE unset: a single attribute check, no profiler code runs
+    if request_profiler.enabled:
+        method = body.get("method") if isinstance(body, dict) else "batch"
+        # a stream's work runs after the response is returned; it is not profiled
+        session = request_profiler.start(request.headers, str(method)) if method != "message/stream" else None
+        if session is not None:
+            return await _profiled(session, body, started)
+    return await _dispatch(body, started)
+
+async def _dispatch(body: Any, started: float) -> Response:
+    if isinstance(body, list):
+        return await handle_batch(body, started)
+    return await handle_request(body, started)
+
+async def _profiled(session: ProfileSession, body: Any, started: float) -> Response:
+    try:
+        response = await _dispatch(body, started)
+    finally:
+        summary = await request_profiler.finish(session)
+    if summary is None:
+        return response
+    # admin-requested profile: the top functions go back in result.metadata / error.data
+    payload = json.loads(response.body)
+    if isinstance(payload, dict) and isinstance(payload.get("result"), dict):
+        payload["result"]["metadata"] = {**(payload["result"].get("metadata") or {}), "profile": summary}
+    elif isinstance(payload, dict) and isinstance(payload.get("error"), dict):
+        payload["error"]["data"] = {**(payload["error"].get("data") or {}), "profile": summary}
+    else:
+        # batch: one profile for the whole array, reachable through the saved file
+        payload = None
+    headers = {k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")}
+    if summary["file"]:
+        headers["X-Profile-File"] = summary["file"]
+    content = dumps(payload) if payload is not None else response.body
+    return FastJSONResponse(content=content, status_code=response.status_code, headers=headers)
+
+async def handle_batch(items: List[Any], started: float) -> Response:
+    if not items:
+        return JSONResponse(status_code=400, content=create_error_response(None, A2AErrorCode.INVALID_REQUEST, "Invalid Request: empty batch"))
+    if len(items) > BATCH_MAX_SIZE:
+        return JSONResponse(status_code=400, content=create_error_response(None, A2AErrorCode.INVALID_REQUEST, f"Invalid Request: batch larger than {BATCH_MAX_SIZE}"))
+    sem = asyncio.Semaphore(max(1, BATCH_MAX_CONCURRENCY))
+
+    async def one(item: Any) -> bytes:
+        # every element is validated and answered on its own; identical upstream searches
+        # in the batch are coalesced by the job cache and single-flight layer
+        async with sem:
+            return (await handle_request(item, started, batched=True)).body
+
+    bodies = await asyncio.gather(*(one(item) for item in items))
+    # responses in request order, whatever order the calls finished in
+    return FastJSONResponse(content=b"[" + b",".join(bodies) + b"]")
+
+async def handle_request(body: Any, started: float, batched: bool = False) -> Response:
+    if not isinstance(body, dict):
+        return JSONResponse(status_code=400, content=create_error_response(None, A2AErrorCode.INVALID_REQUEST, "Invalid Request: expected a JSON object"))
     # basic JSON-RPC validation
     if body.get("jsonrpc") != "2.0" or "id" not in body:
         return JSONResponse(status_code=400, content=create_error_response(body.get("id"), A2AErrorCode.INVALID_REQUEST, "Invalid Request: jsonrpc must be '2.0' and id is required"))
@@ -75,6 +159,13 @@ async def a2a_endpoint(request: Request):
         rpc_request = JSONRPCRequest(**body)
     except ValidationError as e:
         return JSONResponse(status_code=400, content=create_error_response(body.get("id"), A2AErrorCode.INVALID_PARAMS, "Invalid params", {"details": str(e)}))
+    if not isinstance(rpc_request.params, _PARAMS[rpc_request.method]):
+        return JSONResponse(status_code=400, content=create_error_response(rpc_request.id, A2AErrorCode.INVALID_PARAMS, f"Invalid params for {rpc_request.method}"))
+
+    if rpc_request.method == "tasks/get":
+        return get_task(rpc_request)
+    if batched and rpc_request.method == "message/stream":
+        return JSONResponse(status_code=400, content=create_error_response(rpc_request.id, A2AErrorCode.INVALID_REQUEST, "message/stream cannot be used in a batch"))
 
     # parse input
     messages = []
@@ -82,19 +173,126 @@ async def a2a_endpoint(request: Request):
     task_id = None
     config = None
 
-    if rpc_request.method == "message/send":
+    if rpc_request.method in ("message/send", "message/stream"):
         messages = [rpc_request.params.message]
         config = rpc_request.params.configuration
     else:  # execute
         messages = rpc_request.params.messages
         context_id = rpc_request.params.contextId
         task_id = rpc_request.params.taskId
+        config = rpc_request.params.configuration
+
+    # ids are fixed up front so a non-blocking task can be polled before it starts
+    task_id = _task_id(task_id or (messages[-1].taskId if messages else None), context_id)
+    context_id = context_id or str(uuid4())
+
+    if rpc_request.method == "message/stream":
+        events = agent.stream_messages(messages=messages, context_id=context_id, task_id=task_id, config=config, on_complete=_record_status)
+        return StreamingResponse(
+            _sse(rpc_request.id, events, started),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    if config is not None and not config.blocking and messages:
+        # return a `working` task now; the pipeline runs on the task engine's workers
+        working = make_working_task(task_id, context_id, messages[-1])
+        push_config = config.pushNotificationConfig
+        # the final task is POSTed to the client's webhook instead of waiting to be polled
+        on_done = (lambda task: push_notifier.notify(push_config, task)) if push_config is not None else None
+        try:
+            task_engine.submit(working, lambda: agent.process_messages(messages=messages, context_id=context_id, task_id=task_id, config=config), on_done=on_done)
+        except TaskQueueFull as e:
+            return JSONResponse(status_code=503, content=create_error_response(rpc_request.id, A2AErrorCode.INTERNAL_ERROR, "Server busy", {"details": str(e)}))
+        return FastJSONResponse(content=JSONRPCResponse(id=rpc_request.id, result=working))
 
     try:
         result: TaskResult = await agent.process_messages(messages=messages, context_id=context_id, task_id=task_id, config=config)
+        _record_status(result)
         response = JSONRPCResponse(id=rpc_request.id, result=result)
-        return response.model_dump()  # pydantic -> dict
+        # encoded straight from the models, reusing the artifacts' and messages' cached JSON fragments
+        with timed("serialize"):
+            return FastJSONResponse(content=response)
+    except RateLimitExceeded as e:
+        # out of RapidAPI quota (or queued too long for it): tell the client when to come back
+        return _retry_later(429, rpc_request.id, A2AErrorCode.RATE_LIMIT_EXCEEDED, "Rate limit exceeded", e)
+    except CircuitOpenError as e:
+        # JSearch is down and there is no earlier result for this query to fall back to
+        return _retry_later(503, rpc_request.id, A2AErrorCode.UPSTREAM_UNAVAILABLE, "Job search temporarily unavailable", e)
     except Exception as e:
         # internal error: return A2A error envelope
         tb = traceback.format_exc()
         return JSONResponse(status_code=500, content=create_error_response(rpc_request.id, A2AErrorCode.INTERNAL_ERROR, "Internal error", {"details": str(e), "trace": tb}))
+
+def _record_status(task: TaskResult) -> None:
+    # the client already holds the full result of a blocking or streamed call: keep only its status
+    # (for tasks/get and continuation), not the artifacts and history of up to TASK_MAX_STORED tasks
+    task_engine.record(task.model_copy(update={"artifacts": [], "history": []}))
+
+def _task_id(requested: Optional[str], context_id: Optional[str]) -> str:
+    # a client-supplied id only continues an existing task of the same context; new tasks always get
+    # a server-generated id, so a caller cannot overwrite (and then read) a task it did not create
+    if requested and context_id:
+        task = task_engine.get(requested)
+        if task is not None and task.contextId == context_id:
+            return requested
+    return str(uuid4())
+
+def _retry_later(status_code: int, request_id: str, code: A2AErrorCode, message: str, e: Exception) -> JSONResponse:
+    retry_after = max(1, math.ceil(getattr(e, "retry_after", None) or 0))
+    return JSONResponse(
+        status_code=status_code,
+        content=create_error_response(request_id, code, message, {"details": str(e), "retryAfter": retry_after}),
+        headers={"Retry-After": str(retry_after)},
+    )
+
+def get_task(rpc_request: JSONRPCRequest):
+    params: TaskQueryParams = rpc_request.params
+    task = task_engine.get(params.id)
+    # a task of another context is reported as missing, not as forbidden
+    if task is None or (params.contextId is not None and task.contextId != params.contextId):
+        return JSONResponse(status_code=404, content=create_error_response(rpc_request.id, A2AErrorCode.TASK_NOT_FOUND, "Task not found", {"taskId": params.id}))
+    if params.historyLength is not None:
+        task = task.model_copy(update={"history": task.history[-params.historyLength:] if params.historyLength else []})
+    return FastJSONResponse(content=JSONRPCResponse(id=rpc_request.id, result=task))
+
+async def _sse(request_id: str, events: AsyncIterator[Any], started: float) -> AsyncIterator[bytes]:
+    # one JSON-RPC response per SSE event; a pipeline error ends the stream with an error event
+    ttfb_ms: Optional[float] = None
+    try:
+        async for event in events:
+            if ttfb_ms is None:
+                ttfb_ms = round((perf_counter() - started) * 1000.0, 2)
+            if isinstance(event, TaskStatusUpdateEvent) and event.final:
+                timing = {"ttfbMs": ttfb_ms, "totalMs": round((perf_counter() - started) * 1000.0, 2)}
+                event.metadata = {**(event.metadata or {}), "timing": timing}
+            with timed("serialize"):
+                data = b"data: " + encode_model(JSONRPCResponse(id=request_id, result=event)) + b"\n\n"
+            yield data
+    except RateLimitExceeded as e:
+        error = create_error_response(request_id, A2AErrorCode.RATE_LIMIT_EXCEEDED, "Rate limit exceeded", {"details": str(e), "retryAfter": e.retry_after})
+        yield b"data: " + dumps(error) + b"\n\n"
+    except CircuitOpenError as e:
+        error = create_error_response(request_id, A2AErrorCode.UPSTREAM_UNAVAILABLE, "Job search temporarily unavailable", {"details": str(e), "retryAfter": e.retry_after})
+        yield b"data: " + dumps(error) + b"\n\n"
+    except Exception as e:
+        error = create_error_response(request_id, A2AErrorCode.INTERNAL_ERROR, "Internal error", {"details": str(e)})
+        yield b"data: " + dumps(error) + b"\n\n"
+    finally:
+        _stream_timings.append((ttfb_ms, round((perf_counter() - started) * 1000.0, 2)))
+
+def stream_stats() -> Dict[str, Any]:
+    """Time to first event vs total time of recent message/stream calls (server side, ms)."""
+    ttfb = sorted(t for t, _ in _stream_timings if t is not None)
+    total = sorted(t for _, t in _stream_timings)
+
+    def pct(values, p: float) -> Optional[float]:
+        return values[min(len(values) - 1, int(p / 100.0 * len(values)))] if values else None
+
+    return {
+        "streams": len(total),
+        "ttfb_ms_p50": pct(ttfb, 50),
+        "ttfb_ms_p95": pct(ttfb, 95),
+        "total_ms_p50": pct(total, 50),
+        "total_ms_p95": pct(total, 95),
+    }
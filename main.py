@@ -1,14 +1,77 @@
 # main.py
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from controllers.a2a_controller import router as a2a_router
+from fastapi.responses import Response
+from controllers.a2a_controller import router as a2a_router, stream_stats
+from services.jobseeker_service import jsearch, job_cache, upstream_flight
+from services.extraction_pool import extraction_service
+from services.extraction_batcher import keyword_batcher
+from services.model_registry import registry, MODELS_EAGER_LOAD
+from services.context_store import context_store
+from services.task_engine import task_engine
+from services.push_notifier import push_notifier
+from services.job_index import job_index
+from services.job_ranker import job_ranker
+from services.job_dedup import simhasher
+from services.request_profiler import request_profiler
+from utils.metrics import CONTENT_TYPE, ServerTimingMiddleware, metrics
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 
 
 load_dotenv()
 
-app = FastAPI(title="JobSeekerAI A2A (JSON-RPC mode)", version="0.1.0")
+# component stats: returned by /health and exported as gauges by /metrics. Each is called on the
+# event loop at every scrape, so it only reads counters kept in memory (never the SQLite stores)
+COMPONENT_STATS = {
+    "jsearch_pool": jsearch.pool_stats,
+    "jsearch_rate_limit": jsearch.limiter.stats,
+    "jsearch_resilience": jsearch.resilience_stats,
+    "job_cache": job_cache.stats,
+    "upstream_flight": upstream_flight.stats,
+    "extraction": extraction_service.stats,
+    "extraction_batching": keyword_batcher.stats,
+    "models": registry.stats,
+    "context_store": context_store.stats,
+    "tasks": task_engine.stats,
+    "push_notifications": push_notifier.stats,
+    "job_index": job_index.stats,
+    "job_ranking": job_ranker.stats,
+    "job_dedup": simhasher.stats,
+    "profiling": request_profiler.stats,
+    "streaming": stream_stats,
+}
+for _name, _source in COMPONENT_STATS.items():
+    metrics.register_stats(_name, _source)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # one pooled upstream client for the whole process; closed cleanly on shutdown
+    await jsearch.startup()
+    extraction_service.start()
+    task_engine.start()
+    push_notifier.start()
+    job_index.start()
+    if MODELS_EAGER_LOAD:
+        # warm-up hook: pay model load time before serving instead of on the first request
+        await asyncio.to_thread(registry.warm_up)
+    try:
+        yield
+    finally:
+        await task_engine.shutdown()
+        await push_notifier.aclose()
+        await job_index.aclose()
+        await job_cache.aclose()
+        await jsearch.aclose()
+        await keyword_batcher.aclose()
+        await extraction_service.shutdown()
+        context_store.close()
+
+
+app = FastAPI(title="JobSeekerAI A2A (JSON-RPC mode)", version="0.1.0", lifespan=lifespan)
 
 
 # Add CORS
@@ -18,7 +81,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
+# per-stage durations of each request in a Server-Timing header (SERVER_TIMING=0 turns it off)
+app.add_middleware(ServerTimingMiddleware)
 app.include_router(a2a_router)
 @app.get("/")
 async def root():
@@ -26,7 +92,12 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "agent": "jobseeker"}
+    return {"status": "healthy", "agent": "jobseeker", **metrics.collect()}
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    # Prometheus text format: stage latency histograms plus the /health stats as gauges
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE)
 
 if __name__ == "__main__":
     import uvicorn
@@ -68,7 +68,7 @@
 #     error: Optional[Dict[str, Any]] = None
 
 # models/a2a.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Literal, Optional, List, Dict, Any
 from datetime import datetime
 from uuid import uuid4
@@ -87,6 +87,8 @@ class A2AMessage(BaseModel):
     messageId: str = Field(default_factory=lambda: str(uuid4()))
     taskId: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    # encoded JSON, filled on first serialization (utils/json_response.encode_model)
+    _json: Optional[bytes] = PrivateAttr(default=None)
 
 class PushNotificationConfig(BaseModel):
     url: str
@@ -97,6 +99,9 @@ class MessageConfiguration(BaseModel):
     blocking: bool = True
     acceptedOutputModes: List[str] = ["application/json"]
     pushNotificationConfig: Optional[PushNotificationConfig] = None
+    # history returned in the task: newest N messages (None -> server default), or only this turn's messages
+    historyLength: Optional[int] = Field(default=None, ge=0)
+    historyTurnOnly: Optional[bool] = None
 
 class MessageParams(BaseModel):
     message: A2AMessage
@@ -106,12 +111,20 @@ class ExecuteParams(BaseModel):
     contextId: Optional[str] = None
     taskId: Optional[str] = None
     messages: List[A2AMessage]
+    configuration: Optional[MessageConfiguration] = None
+
+class TaskQueryParams(BaseModel):
+    id: str
+    # optional scope: when given, a task of another context is reported as not found
+    contextId: Optional[str] = None
+    historyLength: Optional[int] = Field(default=None, ge=0)
+    metadata: Optional[Dict[str, Any]] = None
 
 class JSONRPCRequest(BaseModel):
     jsonrpc: Literal["2.0"]
     id: str
-    method: Literal["message/send", "execute"]
-    params: MessageParams | ExecuteParams
+    method: Literal["message/send", "message/stream", "execute", "tasks/get"]
+    params: MessageParams | ExecuteParams | TaskQueryParams
 
 class TaskStatus(BaseModel):
     state: Literal["working", "completed", "input-required", "failed"]
@@ -122,6 +135,8 @@ class Artifact(BaseModel):
     artifactId: str = Field(default_factory=lambda: str(uuid4()))
     name: str
     parts: List[MessagePart]
+    metadata: Optional[Dict[str, Any]] = None
+    _json: Optional[bytes] = PrivateAttr(default=None)
 
 class TaskResult(BaseModel):
     id: str
@@ -131,8 +146,27 @@ class TaskResult(BaseModel):
     history: List[A2AMessage] = []
     kind: Literal["task"] = "task"
 
+class TaskStatusUpdateEvent(BaseModel):
+    # message/stream: state changes; the last event of a stream has final=True
+    taskId: str
+    contextId: str
+    kind: Literal["status-update"] = "status-update"
+    status: TaskStatus
+    final: bool = False
+    metadata: Optional[Dict[str, Any]] = None
+
+class TaskArtifactUpdateEvent(BaseModel):
+    # message/stream: an artifact or a chunk of one; chunks with append=True extend the artifact with the same artifactId
+    taskId: str
+    contextId: str
+    kind: Literal["artifact-update"] = "artifact-update"
+    artifact: Artifact
+    append: bool = False
+    lastChunk: bool = True
+    metadata: Optional[Dict[str, Any]] = None
+
 class JSONRPCResponse(BaseModel):
     jsonrpc: Literal["2.0"] = "2.0"
     id: str
-    result: Optional[TaskResult] = None
+    result: Optional[TaskResult | TaskStatusUpdateEvent | TaskArtifactUpdateEvent] = None
     error: Optional[Dict[str, Any]] = None
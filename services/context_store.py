@@ -0,0 +1,335 @@
+# services/context_store.py
+import abc
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from models.a2a import A2AMessage
+from utils.json_response import encode_model
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+
+# "memory" (per process) or "sqlite" (shared by every worker process on the host)
+CONTEXT_STORE_BACKEND = os.getenv("CONTEXT_STORE_BACKEND", "memory").lower()
+CONTEXT_STORE_PATH = os.getenv("CONTEXT_STORE_PATH", os.path.join(ROOT, "data", "contexts.db"))
+CONTEXT_MAX_CONTEXTS = int(os.getenv("CONTEXT_MAX_CONTEXTS", "10000"))
+CONTEXT_MAX_MESSAGES = int(os.getenv("CONTEXT_MAX_MESSAGES", "100"))
+CONTEXT_IDLE_TTL = float(os.getenv("CONTEXT_IDLE_TTL", "3600"))
+
+
+class ContextStore(abc.ABC):
+    """
+    Conversation history per contextId. Backends keep at most `max_messages` (the newest) per context.
+    append/get/delete are coroutines so a backend doing blocking I/O can keep it off the event loop.
+    """
+
+    @abc.abstractmethod
+    async def append(self, context_id: str, message: A2AMessage) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def get(self, context_id: str, limit: Optional[int] = None) -> List[A2AMessage]:
+        """Messages for `context_id`, oldest first; with `limit`, only the newest `limit` of them."""
+
+    @abc.abstractmethod
+    async def delete(self, context_id: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class _Context:
+    __slots__ = ("messages", "sizes", "last_access")
+
+    def __init__(self, max_messages: int):
+        self.messages: Deque[A2AMessage] = deque(maxlen=max_messages)
+        self.sizes: Deque[int] = deque(maxlen=max_messages)
+        self.last_access = time.monotonic()
+
+
+class InMemoryContextStore(ContextStore):
+    """Process-local store with LRU eviction, idle-TTL expiry and a per-context message cap."""
+
+    def __init__(self, max_contexts: int = CONTEXT_MAX_CONTEXTS, max_messages: int = CONTEXT_MAX_MESSAGES, idle_ttl: float = CONTEXT_IDLE_TTL):
+        self.max_contexts = max_contexts
+        self.max_messages = max_messages
+        self.idle_ttl = idle_ttl
+        self._contexts: "OrderedDict[str, _Context]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.evicted_lru = 0
+        self.evicted_idle = 0
+        self.trimmed_messages = 0
+
+    def _expire(self, now: float) -> None:
+        # contexts are kept in access order, so idle ones are at the front
+        while self._contexts:
+            context_id, ctx = next(iter(self._contexts.items()))
+            if now - ctx.last_access <= self.idle_ttl:
+                break
+            self._drop(context_id)
+            self.evicted_idle += 1
+
+    def _drop(self, context_id: str) -> None:
+        ctx = self._contexts.pop(context_id, None)
+        if ctx is not None:
+            self._bytes -= sum(ctx.sizes)
+
+    def _touch(self, context_id: str, create: bool) -> Optional[_Context]:
+        now = time.monotonic()
+        self._expire(now)
+        ctx = self._contexts.get(context_id)
+        if ctx is None:
+            if not create:
+                return None
+            ctx = self._contexts[context_id] = _Context(self.max_messages)
+            while len(self._contexts) > self.max_contexts:
+                self._drop(next(iter(self._contexts)))
+                self.evicted_lru += 1
+        else:
+            self._contexts.move_to_end(context_id)
+        ctx.last_access = now
+        return ctx
+
+    async def append(self, context_id: str, message: A2AMessage) -> None:
+        size = len(encode_model(message))
+        with self._lock:
+            ctx = self._touch(context_id, create=True)
+            if len(ctx.messages) == ctx.messages.maxlen:
+                self._bytes -= ctx.sizes[0]
+                self.trimmed_messages += 1
+            ctx.messages.append(message)
+            ctx.sizes.append(size)
+            self._bytes += size
+
+    async def get(self, context_id: str, limit: Optional[int] = None) -> List[A2AMessage]:
+        with self._lock:
+            ctx = self._touch(context_id, create=False)
+            if ctx is None or limit == 0:
+                return []
+            messages = list(ctx.messages)
+            return messages[-limit:] if limit is not None else messages
+
+    async def delete(self, context_id: str) -> None:
+        with self._lock:
+            self._drop(context_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                "backend": "memory",
+                "contexts": len(self._contexts),
+                "messages": sum(len(c.messages) for c in self._contexts.values()),
+                "approx_bytes": self._bytes,
+                "max_contexts": self.max_contexts,
+                "max_messages": self.max_messages,
+                "idle_ttl": self.idle_ttl,
+                "evicted_lru": self.evicted_lru,
+                "evicted_idle": self.evicted_idle,
+                "trimmed_messages": self.trimmed_messages,
+            }
+
+
+def _load_message(payload: str) -> A2AMessage:
+    message = A2AMessage.model_validate_json(payload)
+    # the stored payload is already this message's JSON; reuse it when the history is sent back
+    message._json = payload.encode("utf-8")
+    return message
+
+
+class SQLiteContextStore(ContextStore):
+    """
+    Host-local store in SQLite (WAL mode), so every uvicorn worker process sees the same history.
+    Caps and idle expiry match InMemoryContextStore; expiry sweeps run every `sweep_every` appends.
+    Queries run on a worker thread: a write can wait up to 5 s for another process's lock.
+    `stats` never touches the database: sizes are kept up to date by this process's writes and
+    recounted at every sweep, which also picks up other processes' writes.
+    """
+
+    def __init__(
+        self,
+        path: str = CONTEXT_STORE_PATH,
+        max_contexts: int = CONTEXT_MAX_CONTEXTS,
+        max_messages: int = CONTEXT_MAX_MESSAGES,
+        idle_ttl: float = CONTEXT_IDLE_TTL,
+        sweep_every: int = 200,
+    ):
+        self.path = path
+        self.max_contexts = max_contexts
+        self.max_messages = max_messages
+        self.idle_ttl = idle_ttl
+        self.sweep_every = sweep_every
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._appends = 0
+        self._contexts = 0
+        self._messages = 0
+        self._bytes = 0
+        self.evicted_lru = 0
+        self.evicted_idle = 0
+        self.trimmed_messages = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # opened on first use: importing the module must not create files
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS contexts (
+                    context_id TEXT PRIMARY KEY,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS contexts_last_access ON contexts(last_access);
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    context_id TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS messages_context ON messages(context_id, id);
+                """
+            )
+            self._recount(conn)
+            self._conn = conn
+        return self._conn
+
+    def _recount(self, conn: sqlite3.Connection) -> None:
+        contexts = conn.execute("SELECT COUNT(*) FROM contexts").fetchone()[0]
+        messages, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM messages").fetchone()
+        self._contexts, self._messages, self._bytes = contexts, messages, size
+
+    async def append(self, context_id: str, message: A2AMessage) -> None:
+        await asyncio.to_thread(self._append, context_id, message)
+
+    async def get(self, context_id: str, limit: Optional[int] = None) -> List[A2AMessage]:
+        if limit == 0:
+            return []
+        return await asyncio.to_thread(self._get, context_id, limit)
+
+    async def delete(self, context_id: str) -> None:
+        await asyncio.to_thread(self._delete, context_id)
+
+    def _append(self, context_id: str, message: A2AMessage) -> None:
+        payload = encode_model(message).decode("utf-8")
+        now = time.time()
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT last_access FROM contexts WHERE context_id = ?", (context_id,)).fetchone()
+                removed = []
+                if row is not None and row[0] < now - self.idle_ttl:
+                    # an idle-expired context not swept yet starts over, as get() already treats it as gone
+                    removed = conn.execute("DELETE FROM messages WHERE context_id = ? RETURNING LENGTH(payload)", (context_id,)).fetchall()
+                    self.evicted_idle += 1
+                conn.execute(
+                    "INSERT INTO contexts(context_id, last_access) VALUES (?, ?) "
+                    "ON CONFLICT(context_id) DO UPDATE SET last_access = excluded.last_access",
+                    (context_id, now),
+                )
+                conn.execute("INSERT INTO messages(context_id, payload) VALUES (?, ?)", (context_id, payload))
+                trimmed = conn.execute(
+                    "DELETE FROM messages WHERE context_id = ? AND id <= ("
+                    "SELECT id FROM messages WHERE context_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?) "
+                    "RETURNING LENGTH(payload)",
+                    (context_id, context_id, self.max_messages),
+                ).fetchall()
+                self.trimmed_messages += len(trimmed)
+                self._appends += 1
+                swept = self._appends % self.sweep_every == 0
+                if swept:
+                    self._sweep(conn, now)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if swept:
+                self._recount(conn)
+                return
+            removed += trimmed
+            self._contexts += row is None
+            self._messages += 1 - len(removed)
+            self._bytes += len(payload) - sum(n for (n,) in removed)
+
+    def _sweep(self, conn: sqlite3.Connection, now: float) -> None:
+        idle = conn.execute("DELETE FROM contexts WHERE last_access < ?", (now - self.idle_ttl,)).rowcount
+        self.evicted_idle += max(idle, 0)
+        over = conn.execute(
+            "DELETE FROM contexts WHERE context_id IN ("
+            "SELECT context_id FROM contexts ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_contexts,),
+        ).rowcount
+        self.evicted_lru += max(over, 0)
+        conn.execute("DELETE FROM messages WHERE context_id NOT IN (SELECT context_id FROM contexts)")
+
+    def _get(self, context_id: str, limit: Optional[int]) -> List[A2AMessage]:
+        with self._lock:
+            conn = self.conn
+            row = conn.execute("SELECT last_access FROM contexts WHERE context_id = ?", (context_id,)).fetchone()
+            if row is None:
+                return []
+            now = time.time()
+            if now - row[0] > self.idle_ttl:
+                return []
+            conn.execute("UPDATE contexts SET last_access = ? WHERE context_id = ?", (now, context_id))
+            rows = conn.execute(
+                "SELECT payload FROM messages WHERE context_id = ? ORDER BY id DESC LIMIT ?",
+                (context_id, -1 if limit is None else limit),
+            ).fetchall()
+        return [_load_message(payload) for (payload,) in reversed(rows)]
+
+    def _delete(self, context_id: str) -> None:
+        with self._lock:
+            conn = self.conn
+            removed = conn.execute("DELETE FROM messages WHERE context_id = ? RETURNING LENGTH(payload)", (context_id,)).fetchall()
+            contexts = conn.execute("DELETE FROM contexts WHERE context_id = ?", (context_id,)).rowcount
+            self._contexts -= max(contexts, 0)
+            self._messages -= len(removed)
+            self._bytes -= sum(n for (n,) in removed)
+
+    def stats(self) -> Dict[str, Any]:
+        # no query and no lock: scrapes must not wait behind a writer holding the database lock
+        return {
+            "backend": "sqlite",
+            "path": self.path,
+            "contexts": self._contexts,
+            "messages": self._messages,
+            "approx_bytes": self._bytes,
+            "max_contexts": self.max_contexts,
+            "max_messages": self.max_messages,
+            "idle_ttl": self.idle_ttl,
+            "evicted_lru": self.evicted_lru,
+            "evicted_idle": self.evicted_idle,
+            "trimmed_messages": self.trimmed_messages,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_context_store(backend: str = CONTEXT_STORE_BACKEND) -> ContextStore:
+    if backend == "sqlite":
+        return SQLiteContextStore()
+    if backend == "memory":
+        return InMemoryContextStore()
+    raise ValueError(f"Unknown CONTEXT_STORE_BACKEND {backend!r}; expected memory or sqlite")
+
+
+context_store = create_context_store()
@@ -0,0 +1,270 @@
+# services/embedding_cache.py
+import hashlib
+import os
+import re
+import threading
+import warnings
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: single-process use only
+    fcntl = None
+
+from services.model_registry import MODEL_CACHE_DIR
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE", "1").lower() in ("1", "true", "yes")
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join(MODEL_CACHE_DIR, "embeddings"))
+EMBEDDING_CACHE_MEMORY_ITEMS = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", "20000"))
+# set to 0 to keep the cache in memory only
+EMBEDDING_CACHE_DISK = os.getenv("EMBEDDING_CACHE_DISK", "1").lower() in ("1", "true", "yes")
+
+
+def text_key(text: str, model_name: str) -> str:
+    """Content address of `text` under `model_name`."""
+    return hashlib.blake2b(f"{model_name}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class DiskEmbeddingStore:
+    """
+    On-disk tier: an append-only float32 matrix (memory-mapped for reads) plus an append-only
+    `key<TAB>row` index. Appends take an exclusive flock, so several worker processes can share one store;
+    a row is always written before its index line, so readers never see a half-written vector.
+    A torn append (crash mid-write) leaves a partial row at the end of the matrix, or a partial index line;
+    the next writer cuts the row off and ends the line before appending. Malformed index lines and
+    lines pointing past the last whole row are ignored.
+    """
+
+    def __init__(self, directory: str, model_name: str, dim: int):
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        os.makedirs(directory, exist_ok=True)
+        self.dim = dim
+        self.vectors_path = os.path.join(directory, f"{slug}-{dim}.f32")
+        self.index_path = os.path.join(directory, f"{slug}-{dim}.idx")
+        self.lock_path = os.path.join(directory, f"{slug}-{dim}.lock")
+        self._index: Dict[str, int] = {}
+        self._index_pos = 0
+        self._mm: Optional[np.memmap] = None
+        self._mm_rows = 0
+        self._lock = threading.Lock()
+        self._sync_index()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _sync_index(self) -> None:
+        # pick up rows appended by this or other processes since the last read
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_pos)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1
+        rows = self._rows_on_disk()
+        for line in chunk[:end].splitlines():
+            parts = line.split(b"\t")
+            # a torn line, possibly joined with the next writer's first entry
+            if len(parts) != 2 or not parts[1].isdigit():
+                continue
+            try:
+                key = parts[0].decode("ascii")
+            except UnicodeDecodeError:
+                continue
+            if int(parts[1]) < rows:
+                self._index[key] = int(parts[1])
+        self._index_pos += end
+
+    def _rows_on_disk(self) -> int:
+        try:
+            return os.path.getsize(self.vectors_path) // (self.dim * 4)
+        except OSError:
+            return 0
+
+    def _matrix(self, min_rows: int) -> np.memmap:
+        if self._mm is None or self._mm_rows < min_rows:
+            rows = os.path.getsize(self.vectors_path) // (self.dim * 4)
+            self._mm = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+            self._mm_rows = rows
+        return self._mm
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        with self._lock:
+            if any(k not in self._index for k in keys):
+                self._sync_index()
+            rows = {k: self._index[k] for k in keys if k in self._index}
+            if not rows:
+                return {}
+            mm = self._matrix(max(rows.values()) + 1)
+            return {k: np.array(mm[r]) for k, r in rows.items()}
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(keys), self.dim)
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._sync_index()
+                fresh, seen = [], set()
+                for i, k in enumerate(keys):
+                    if k not in self._index and k not in seen:
+                        seen.add(k)
+                        fresh.append(i)
+                if not fresh:
+                    return
+                row_bytes = self.dim * 4
+                with open(self.vectors_path, "ab") as vf:
+                    size = vf.tell()
+                    if size % row_bytes:
+                        # a previous append was torn: drop the partial row so new rows stay aligned
+                        warnings.warn(f"Embedding store {self.vectors_path}: dropping {size % row_bytes} bytes of a partial row")
+                        size -= size % row_bytes
+                        os.ftruncate(vf.fileno(), size)
+                        vf.seek(size)
+                    start = size // row_bytes
+                    vf.write(vectors[fresh].tobytes())
+                    vf.flush()
+                    os.fsync(vf.fileno())
+                lines = "".join(f"{keys[i]}\t{start + n}\n" for n, i in enumerate(fresh)).encode("ascii")
+                with open(self.index_path, "ab+") as xf:
+                    if xf.seek(0, os.SEEK_END):
+                        xf.seek(-1, os.SEEK_END)
+                        if xf.read(1) != b"\n":
+                            # a previous append was torn: end the partial line so it stays on its own
+                            lines = b"\n" + lines
+                    xf.write(lines)
+                self._sync_index()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache: a bounded in-memory LRU in front of an optional DiskEmbeddingStore.
+    `lookup` resolves a whole batch at once so only the misses need to be encoded.
+    """
+
+    def __init__(self, model_name: str, dim: int, memory_items: int = EMBEDDING_CACHE_MEMORY_ITEMS, disk_dir: Optional[str] = None):
+        self.model_name = model_name
+        self.dim = dim
+        self.memory_items = memory_items
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.disk = DiskEmbeddingStore(disk_dir, model_name, dim) if disk_dir else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def lookup(self, texts: Sequence[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """Return ({position: vector} for cached texts, [positions of misses])."""
+        keys = [text_key(t, self.model_name) for t in texts]
+        hits: Dict[int, np.ndarray] = {}
+        pending: List[int] = []
+        with self._lock:
+            for i, k in enumerate(keys):
+                vec = self._memory.get(k)
+                if vec is not None:
+                    self._memory.move_to_end(k)
+                    hits[i] = vec
+                else:
+                    pending.append(i)
+            self.memory_hits += len(hits)
+        misses = pending
+        if pending and self.disk is not None:
+            found = self.disk.get_many([keys[i] for i in pending])
+            misses = []
+            with self._lock:
+                for i in pending:
+                    vec = found.get(keys[i])
+                    if vec is None:
+                        misses.append(i)
+                    else:
+                        hits[i] = vec
+                        self._remember(keys[i], vec)
+                        self.disk_hits += 1
+        with self._lock:
+            self.misses += len(misses)
+        return hits, misses
+
+    def store(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        keys = [text_key(t, self.model_name) for t in texts]
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            for k, v in zip(keys, vectors):
+                self._remember(k, v)
+        if self.disk is not None and keys:
+            try:
+                self.disk.put_many(keys, vectors)
+            except OSError as e:
+                warnings.warn(f"Embedding cache disk write failed: {e}")
+
+    def encode(self, texts: Sequence[str], encode_fn: Callable[[List[str]], Any]) -> np.ndarray:
+        """Embeddings for `texts` in order; `encode_fn` is called once, with the misses only."""
+        texts = list(texts)
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        hits, misses = self.lookup(texts)
+        for i, vec in hits.items():
+            out[i] = vec
+        if misses:
+            # identical texts inside one batch are encoded once
+            unique = list(dict.fromkeys(texts[i] for i in misses))
+            encoded = np.asarray(encode_fn(unique), dtype=np.float32).reshape(len(unique), self.dim)
+            self.store(unique, encoded)
+            by_text = dict(zip(unique, encoded))
+            for i in misses:
+                out[i] = by_text[texts[i]]
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "model": self.model_name,
+            "memory_items": len(self._memory),
+            "disk_items": len(self.disk) if self.disk is not None else 0,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+class CachedEncoder:
+    """SentenceTransformer-like `encode` that reads through an EmbeddingCache."""
+
+    def __init__(self, model: Any, model_name: str, cache: Optional[EmbeddingCache] = None):
+        self.model = model
+        self.model_name = model_name
+        if cache is None:
+            dim = model.get_sentence_embedding_dimension()
+            try:
+                cache = EmbeddingCache(model_name, dim, disk_dir=EMBEDDING_CACHE_DIR if EMBEDDING_CACHE_DISK else None)
+            except OSError as e:
+                warnings.warn(f"Embedding cache disk tier unavailable ({e}); using memory only.")
+                cache = EmbeddingCache(model_name, dim)
+        self.cache = cache
+
+    def encode(self, texts: Sequence[str], show_progress_bar: bool = False) -> np.ndarray:
+        return self.cache.encode(texts, lambda misses: self.model.encode(misses, show_progress_bar=show_progress_bar))
+
+
+def keybert_backend(encoder: CachedEncoder) -> Any:
+    """Wrap a CachedEncoder as a KeyBERT backend so document and candidate embeddings hit the cache."""
+    from keybert.backend import BaseEmbedder
+
+    class _CachedKeyBERTBackend(BaseEmbedder):
+        def __init__(self):
+            super().__init__(embedding_model=encoder.model)
+
+        def embed(self, documents, verbose: bool = False) -> np.ndarray:
+            return encoder.encode(list(documents), show_progress_bar=verbose)
+
+    return _CachedKeyBERTBackend()
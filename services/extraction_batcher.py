@@ -0,0 +1,108 @@
+# services/extraction_batcher.py
+import asyncio
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.extraction_pool import ExtractionService, extraction_service
+
+# a batch is flushed when it reaches MAX_SIZE items or its first item has waited MAX_WAIT_MS
+EXTRACTION_BATCH_MAX_SIZE = int(os.getenv("EXTRACTION_BATCH_MAX_SIZE", "16"))
+EXTRACTION_BATCH_MAX_WAIT_MS = float(os.getenv("EXTRACTION_BATCH_MAX_WAIT_MS", "5"))
+
+
+def _extract_batch(texts: List[str], use_semantic: bool) -> List[Dict[str, Any]]:
+    from services.skill_extractor import extract_keywords_batch
+    return extract_keywords_batch(texts, use_semantic=use_semantic)
+
+
+class KeywordBatcher:
+    """
+    Micro-batcher in front of extract_keywords.
+    Concurrent callers are grouped (per `use_semantic` flag) and each batch runs as a single
+    nlp.pipe + batched KeyBERT call on the extraction pool; every caller gets its own result.
+    max_batch_size <= 1 disables batching.
+    """
+
+    def __init__(
+        self,
+        service: ExtractionService = extraction_service,
+        max_batch_size: int = EXTRACTION_BATCH_MAX_SIZE,
+        max_wait_ms: float = EXTRACTION_BATCH_MAX_WAIT_MS,
+    ):
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._pending: Dict[bool, List[Tuple[str, asyncio.Future]]] = {True: [], False: []}
+        self._timers: Dict[bool, Optional[asyncio.TimerHandle]] = {True: None, False: None}
+        self._tasks: set = set()
+        self.batches = 0
+        self.items = 0
+
+    async def extract(self, text: str, use_semantic: bool = True) -> Dict[str, Optional[List[str]]]:
+        if self.max_batch_size <= 1:
+            self.batches += 1
+            self.items += 1
+            return await self.service.extract(text, use_semantic)
+
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        batch = self._pending[use_semantic]
+        batch.append((text, fut))
+        if len(batch) >= self.max_batch_size:
+            self._flush(use_semantic)
+        elif self._timers[use_semantic] is None:
+            self._timers[use_semantic] = loop.call_later(self.max_wait, self._flush, use_semantic)
+        return await fut
+
+    def _flush(self, use_semantic: bool) -> None:
+        timer = self._timers[use_semantic]
+        if timer is not None:
+            timer.cancel()
+            self._timers[use_semantic] = None
+        batch, self._pending[use_semantic] = self._pending[use_semantic], []
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(batch, use_semantic))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]], use_semantic: bool) -> None:
+        # callers cancelled while waiting for the flush are dropped from the batch
+        live = [(text, fut) for text, fut in batch if not fut.done()]
+        if not live:
+            return
+        self.batches += 1
+        self.items += len(live)
+        try:
+            results = await self.service.run(_extract_batch, [text for text, _ in live], use_semantic)
+        except asyncio.CancelledError:
+            for _, fut in live:
+                fut.cancel()
+            raise
+        except Exception as e:
+            for _, fut in live:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), result in zip(live, results):
+            if not fut.done():
+                fut.set_result(result)
+
+    async def aclose(self) -> None:
+        for use_semantic in (True, False):
+            self._flush(use_semantic)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "waiting": sum(len(b) for b in self._pending.values()),
+        }
+
+
+keyword_batcher = KeywordBatcher()
@@ -0,0 +1,114 @@
+# services/extraction_pool.py
+import asyncio
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# "thread" (default), "process" (models loaded once per worker process) or "inline" (no executor, debugging only)
+EXTRACTION_EXECUTOR = os.getenv("EXTRACTION_EXECUTOR", "thread").lower()
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "2"))
+# calls allowed to wait for a free worker; beyond this, submissions are rejected
+EXTRACTION_MAX_QUEUE = int(os.getenv("EXTRACTION_MAX_QUEUE", "64"))
+
+
+class ExtractionQueueFull(RuntimeError):
+    pass
+
+
+def _init_worker() -> None:
+    # runs once per worker: load spaCy/KeyBERT before the first request reaches it.
+    # a failure here must not break the pool; the first real call reports it instead.
+    try:
+        from services.model_registry import registry
+        registry.warm_up()
+    except Exception as e:
+        warnings.warn(f"Extraction worker warm-up failed: {e}")
+
+
+def _extract(text: str, use_semantic: bool) -> Dict[str, Any]:
+    from services.skill_extractor import extract_keywords
+    return extract_keywords(text, use_semantic=use_semantic)
+
+
+class ExtractionService:
+    """
+    Runs spaCy/KeyBERT inference off the event loop.
+    At most `workers` calls run at once and at most `max_queue` more wait for a worker;
+    further submissions raise ExtractionQueueFull instead of piling up.
+    """
+
+    def __init__(self, mode: str = EXTRACTION_EXECUTOR, workers: int = EXTRACTION_WORKERS, max_queue: int = EXTRACTION_MAX_QUEUE):
+        if mode not in ("thread", "process", "inline"):
+            raise ValueError(f"Unknown EXTRACTION_EXECUTOR {mode!r}; expected thread, process or inline")
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        if self._executor is not None or self.mode == "inline":
+            return
+        if self.mode == "process":
+            # spawn: forking a parent that already holds torch/spaCy state is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="extraction",
+                initializer=_init_worker,
+            )
+
+    async def shutdown(self) -> None:
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, lambda: executor.shutdown(wait=True, cancel_futures=True))
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a picklable top-level `fn(*args)` on the pool and await its result."""
+        if self.mode == "inline":
+            return fn(*args)
+        if self._pending >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise ExtractionQueueFull(f"Keyword extraction queue is full ({self._pending} pending)")
+        self.start()
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        cf = self._executor.submit(fn, *args)
+        # release the slot when the work really finishes, even if the awaiting request was cancelled
+        cf.add_done_callback(lambda f: loop.is_closed() or loop.call_soon_threadsafe(self._release, f))
+        return await asyncio.wrap_future(cf)
+
+    def _release(self, cf) -> None:
+        self._pending -= 1
+        if cf.cancelled() or cf.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+
+    async def extract(self, text: str, use_semantic: bool = True) -> Dict[str, Optional[List[str]]]:
+        return await self.run(_extract, text, use_semantic)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "queued": max(0, self._pending - self.workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+extraction_service = ExtractionService()
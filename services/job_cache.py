@@ -0,0 +1,212 @@
+# services/job_cache.py
+import asyncio
+import copy
+import json
+import os
+import time
+import warnings
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+JOB_CACHE_TTL = float(os.getenv("JOB_CACHE_TTL", "300"))
+JOB_CACHE_STALE_TTL = float(os.getenv("JOB_CACHE_STALE_TTL", "600"))
+JOB_CACHE_MAX_ENTRIES = int(os.getenv("JOB_CACHE_MAX_ENTRIES", "512"))
+JOB_CACHE_MAX_BYTES = int(os.getenv("JOB_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+CacheKey = Tuple[str, str, int, int]
+Fetcher = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+def make_cache_key(query: str, location: Optional[str], size: int, pages: int = 1) -> CacheKey:
+    """
+    Canonical (query, location, size, pages) key.
+    Query tokens are lowercased, de-duplicated and sorted: extracted keywords come out of a set,
+    so "python backend" and "backend python" must land on the same entry.
+    """
+    tokens = sorted(set((query or "").lower().split()))
+    loc = " ".join((location or "").lower().split())
+    return (" ".join(tokens), loc, int(size), int(pages))
+
+
+def _approx_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class _Entry:
+    __slots__ = ("value", "size", "fetched_at", "refreshing")
+
+    def __init__(self, value: List[Dict[str, Any]], size: int, fetched_at: float):
+        self.value = value
+        self.size = size
+        self.fetched_at = fetched_at
+        self.refreshing = False
+
+
+class JobSearchCache:
+    """
+    Bounded in-process cache of normalized job lists.
+
+    - fresh for `ttl` seconds;
+    - then served stale for another `stale_ttl` seconds while one background task refreshes it;
+    - after that treated as a miss (the entry is kept until evicted, see `get_last_good`).
+    Eviction is LRU, bounded both by entry count and by approximate JSON size in bytes.
+    Cached lists are shared between requests: callers get a shallow copy and must not mutate the job dicts.
+    Values flagged `partial` (some upstream pages timed out) are returned, flag included, but never stored.
+    """
+
+    def __init__(
+        self,
+        ttl: float = JOB_CACHE_TTL,
+        stale_ttl: float = JOB_CACHE_STALE_TTL,
+        max_entries: int = JOB_CACHE_MAX_ENTRIES,
+        max_bytes: int = JOB_CACHE_MAX_BYTES,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._refresh_tasks: set = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refresh_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: CacheKey) -> Tuple[Optional[_Entry], Optional[str]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, None
+        age = time.monotonic() - entry.fetched_at
+        if age <= self.ttl:
+            state = "fresh"
+        elif age <= self.ttl + self.stale_ttl:
+            state = "stale"
+        else:
+            return entry, None
+        self._entries.move_to_end(key)
+        return entry, state
+
+    def get(self, key: CacheKey) -> Optional[List[Dict[str, Any]]]:
+        """Return a fresh or stale value without fetching, or None."""
+        entry, state = self._lookup(key)
+        if state is None:
+            return None
+        return list(entry.value)
+
+    def get_last_good(self, key: CacheKey) -> Optional[List[Dict[str, Any]]]:
+        """Return the last stored value regardless of age (used as a fallback when upstream is down)."""
+        entry = self._entries.get(key)
+        return list(entry.value) if entry is not None else None
+
+    def age(self, key: CacheKey) -> Optional[float]:
+        """Seconds since `key` was last stored, or None."""
+        entry = self._entries.get(key)
+        return time.monotonic() - entry.fetched_at if entry is not None else None
+
+    def set(self, key: CacheKey, value: List[Dict[str, Any]]) -> None:
+        if getattr(value, "partial", False):
+            return
+        size = _approx_size(value)
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = _Entry(list(value), size, time.monotonic())
+        self._bytes += size
+        self._evict()
+
+    def invalidate(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    def lookup(self, key: CacheKey, refresh: Optional[Fetcher] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fresh or stale value for `key`, or None (counted as a miss; the caller fetches).
+        A stale hit schedules one background `refresh`.
+        """
+        entry, state = self._lookup(key)
+        if state == "fresh":
+            self.hits += 1
+            return list(entry.value)
+        if state == "stale":
+            self.stale_hits += 1
+            if not entry.refreshing and refresh is not None:
+                entry.refreshing = True
+                task = asyncio.create_task(self._refresh(key, entry, refresh))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return list(entry.value)
+        self.misses += 1
+        return None
+
+    async def get_or_fetch(self, key: CacheKey, fetch: Fetcher, refresh: Optional[Fetcher] = None) -> List[Dict[str, Any]]:
+        """
+        Serve `key` from cache, fetching on a miss.
+        Stale hits return immediately and schedule `refresh` (defaults to `fetch`) in the background.
+        """
+        cached = self.lookup(key, refresh or fetch)
+        if cached is not None:
+            return cached
+        started = time.monotonic()
+        value = await fetch()
+        current = self._entries.get(key)
+        # coalesced callers all come back here with the same result; store it once
+        if current is None or current.fetched_at < started:
+            self.set(key, value)
+        # a copy of the same type, so a JobList keeps `partial` and its page counts
+        return copy.copy(value)
+
+    async def _refresh(self, key: CacheKey, entry: _Entry, fetch: Fetcher) -> None:
+        try:
+            value = await fetch()
+            self.set(key, value)
+        except Exception as e:
+            self.refresh_errors += 1
+            warnings.warn(f"Background refresh failed for {key!r}: {e}")
+        finally:
+            # not replaced (failed, partial or too large): let the next stale hit try again
+            if self._entries.get(key) is entry:
+                entry.refreshing = False
+
+    async def aclose(self) -> None:
+        """Cancel pending background refreshes (app shutdown)."""
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        if self._refresh_tasks:
+            await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "refreshing": len(self._refresh_tasks),
+            "refresh_errors": self.refresh_errors,
+        }
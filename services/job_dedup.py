@@ -0,0 +1,145 @@
+# services/job_dedup.py
+import hashlib
+import os
+import re
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# drop jobs whose title + employer + description is a near-duplicate of one already kept
+JOB_DEDUP = os.getenv("JOB_DEDUP", "1").lower() in ("1", "true", "yes")
+# SimHash similarity (1 - hamming distance / 64) at or above which two jobs are duplicates
+DEDUP_SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", "0.9"))
+DEDUP_CACHE_ITEMS = int(os.getenv("DEDUP_CACHE_ITEMS", "50000"))
+
+_BITS = 64
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+class _LRU(OrderedDict):
+    def __init__(self, max_items: int):
+        super().__init__()
+        self.max_items = max_items
+
+    def put(self, key, value) -> None:
+        self[key] = value
+        if len(self) > self.max_items:
+            self.popitem(last=False)
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    return " ".join(str(job.get(k) or "") for k in ("job_title", "employer_name", "job_description")).lower()
+
+
+class SimHasher:
+    """
+    64-bit SimHash of term-frequency weighted tokens. Token hashes and finished fingerprints are kept in
+    bounded LRUs (fingerprints keyed by a digest of the text), so repeated jobs, e.g. from the job cache,
+    cost one digest instead of re-tokenizing their description.
+    """
+
+    def __init__(self, cache_items: int = DEDUP_CACHE_ITEMS):
+        self._tokens = _LRU(cache_items)
+        self._fingerprints = _LRU(cache_items)
+        self.hits = 0
+        self.misses = 0
+        self.removed = 0
+
+    def fingerprint(self, text: str) -> int:
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        fp = self._fingerprints.get(key)
+        if fp is None:
+            self.misses += 1
+            fp = self._simhash(text)
+            self._fingerprints.put(key, fp)
+        else:
+            self.hits += 1
+        return fp
+
+    def _token_hash(self, token: str) -> int:
+        h = self._tokens.get(token)
+        if h is None:
+            h = _hash64(token)
+            self._tokens.put(token, h)
+        return h
+
+    def _simhash(self, text: str) -> int:
+        counts = Counter(_TOKEN.findall(text))
+        if not counts:
+            return 0
+        hashes = np.fromiter((self._token_hash(t) for t in counts), dtype=np.uint64, count=len(counts))
+        # bit matrix (tokens x 64, column i = bit i): each token votes +weight / -weight on every bit
+        bits = np.unpackbits(hashes.astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+        weights = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        votes = weights @ (bits.astype(np.float32) * 2.0 - 1.0)
+        return int(np.packbits(votes > 0, bitorder="little").view("<u8")[0])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": JOB_DEDUP,
+            "similarity": DEDUP_SIMILARITY,
+            "max_distance": max_distance(DEDUP_SIMILARITY),
+            "duplicates_removed": self.removed,
+            "fingerprints_cached": len(self._fingerprints),
+            "fingerprint_hits": self.hits,
+            "fingerprint_misses": self.misses,
+        }
+
+
+def max_distance(similarity: float) -> int:
+    return max(0, min(_BITS - 1, int((1.0 - similarity) * _BITS)))
+
+
+class NearDuplicateFilter:
+    """
+    Incremental near-duplicate detector for one result set.
+    Fingerprints within `max_distance(similarity)` bits are duplicates. The 64 bits are split into
+    distance + 1 bands; by pigeonhole two such fingerprints agree on at least one whole band, so only
+    jobs sharing a band bucket are compared and the whole pass stays roughly linear.
+    """
+
+    def __init__(self, similarity: float = DEDUP_SIMILARITY, hasher: Optional[SimHasher] = None):
+        self.distance = max_distance(similarity)
+        self.hasher = hasher or simhasher
+        bands = self.distance + 1
+        width, extra = divmod(_BITS, bands)
+        self._bands: List[Tuple[int, int]] = []
+        shift = 0
+        for b in range(bands):
+            w = width + (1 if b < extra else 0)
+            self._bands.append((shift, (1 << w) - 1))
+            shift += w
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in self._bands]
+        self.removed = 0
+
+    def add(self, job: Dict[str, Any]) -> bool:
+        """Remember `job` and return True, or return False if it near-duplicates one already added."""
+        fp = self.hasher.fingerprint(job_text(job))
+        keys = [(fp >> shift) & mask for shift, mask in self._bands]
+        for bucket, key in zip(self._buckets, keys):
+            for other in bucket.get(key, ()):
+                if (fp ^ other).bit_count() <= self.distance:
+                    self.removed += 1
+                    self.hasher.removed += 1
+                    return False
+        for bucket, key in zip(self._buckets, keys):
+            bucket.setdefault(key, []).append(fp)
+        return True
+
+    def filter(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [job for job in jobs if self.add(job)]
+
+
+def dedupe(jobs: List[Dict[str, Any]], similarity: float = DEDUP_SIMILARITY) -> Tuple[List[Dict[str, Any]], int]:
+    """Jobs without near-duplicates (the first of each group is kept, order preserved) and how many were dropped."""
+    f = NearDuplicateFilter(similarity)
+    kept = f.filter(jobs)
+    return kept, f.removed
+
+
+simhasher = SimHasher()
@@ -0,0 +1,356 @@
+# services/job_index.py
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import warnings
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+
+# every normalized upstream job is upserted here by job_id (JOB_INDEX_INGEST=0 turns that off);
+# searches with source=local|hybrid read it back
+JOB_INDEX_INGEST = os.getenv("JOB_INDEX_INGEST", "1").lower() in ("1", "true", "yes")
+JOB_INDEX_PATH = os.getenv("JOB_INDEX_PATH", os.path.join(ROOT, "data", "jobs.db"))
+# jobs not seen upstream for this long are evicted; beyond JOB_INDEX_MAX_JOBS the least recently seen go first
+JOB_INDEX_MAX_AGE = float(os.getenv("JOB_INDEX_MAX_AGE", str(7 * 24 * 3600)))
+JOB_INDEX_MAX_JOBS = int(os.getenv("JOB_INDEX_MAX_JOBS", "100000"))
+# ingestion: jobs waiting to be written (beyond this they are dropped) and jobs written per transaction
+JOB_INDEX_MAX_QUEUE = int(os.getenv("JOB_INDEX_MAX_QUEUE", "10000"))
+JOB_INDEX_BATCH = int(os.getenv("JOB_INDEX_BATCH", "500"))
+JOB_INDEX_SWEEP_INTERVAL = float(os.getenv("JOB_INDEX_SWEEP_INTERVAL", "300"))
+
+# BM25 column weights: job_title, employer_name, job_description, location (location only filters)
+_BM25_WEIGHTS = (10.0, 3.0, 1.0, 0.0)
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs(last_seen);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    job_title, employer_name, job_description, location,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def _terms(text: Optional[str]) -> List[str]:
+    seen: List[str] = []
+    for token in _TOKEN.findall((text or "").lower()):
+        if token not in seen:
+            seen.append(token)
+    return seen
+
+
+def match_expression(query: str, location: Optional[str] = None, all_terms: bool = False) -> Optional[str]:
+    """
+    FTS5 MATCH expression: any (or, with `all_terms`, every) query term in title/employer/description,
+    and, with a location, any of its terms in the location column.
+    Terms are quoted, so user input cannot inject FTS5 syntax.
+    """
+    terms = _terms(query)
+    if not terms:
+        return None
+    joiner = " AND " if all_terms else " OR "
+    expr = "{job_title employer_name job_description} : (" + joiner.join(f'"{t}"' for t in terms) + ")"
+    places = _terms(location)
+    if places:
+        expr += " AND location : (" + " OR ".join(f'"{t}"' for t in places) + ")"
+    return expr
+
+
+def _content_hash(payload: str) -> str:
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class JobIndex:
+    """
+    Local full-text index of every job seen upstream (SQLite FTS5, WAL).
+
+    `ingest` only queues jobs; one background task writes them in batches on a worker thread, so the
+    request path never waits for SQLite writes. Upserts are keyed by job_id: an unchanged job only has
+    its last_seen bumped, a changed one is re-indexed. Jobs not seen for `max_age` seconds are evicted,
+    and beyond `max_jobs` the least recently seen go first.
+    `search` reads through its own connection, so it never waits behind a write transaction.
+    """
+
+    def __init__(
+        self,
+        path: str = JOB_INDEX_PATH,
+        max_age: float = JOB_INDEX_MAX_AGE,
+        max_jobs: int = JOB_INDEX_MAX_JOBS,
+        max_queue: int = JOB_INDEX_MAX_QUEUE,
+        batch_size: int = JOB_INDEX_BATCH,
+        sweep_interval: float = JOB_INDEX_SWEEP_INTERVAL,
+    ):
+        self.path = path
+        self.max_age = max_age
+        self.max_jobs = max_jobs
+        self.max_queue = max(1, max_queue)
+        self.batch_size = max(1, batch_size)
+        self.sweep_interval = sweep_interval
+        self._writer: Optional[sqlite3.Connection] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_sweep = 0.0
+        self._search_ms: Deque[float] = deque(maxlen=1000)
+        self.queued = 0
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.dropped = 0
+        self.evicted = 0
+        self.searches = 0
+        # rows in the jobs table: counted when the writer connects and after each sweep, kept up to
+        # date by inserts in between (other processes' writes show up at the next sweep)
+        self._jobs = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # opened on first use: importing the module must not create files
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    @property
+    def writer(self) -> sqlite3.Connection:
+        if self._writer is None:
+            writer = self._connect()
+            self._jobs = writer.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            self._writer = writer
+        return self._writer
+
+    @property
+    def reader(self) -> sqlite3.Connection:
+        if self._reader is None:
+            # the schema must exist before the first read, so the writer connects first;
+            # an in-memory database is private to its connection, so it is shared instead
+            writer = self.writer
+            self._reader = writer if self.path == ":memory:" else self._connect()
+        return self._reader
+
+    # ingestion
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        if self._reader is None:
+            # connect (and create the schema) at startup rather than inside the first request
+            try:
+                self.reader
+            except (sqlite3.Error, OSError) as e:
+                warnings.warn(f"Could not open job index at {self.path}: {e}")
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._ingester(), name="job-index-ingester")
+
+    async def aclose(self, grace: float = 5.0) -> None:
+        """Write what is still queued (for up to `grace` seconds), then stop and close both connections."""
+        if self._queue is not None and grace > 0:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=grace)
+            except asyncio.TimeoutError:
+                pass
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._queue = None
+        self.close()
+
+    def ingest(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        """Queue normalized jobs for indexing; returns how many were queued (jobs without a job_id are skipped)."""
+        self.start()
+        queued = 0
+        for job in jobs:
+            if not job.get("job_id"):
+                continue
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                continue
+            queued += 1
+        self.queued += queued
+        return queued
+
+    async def _ingester(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self.upsert, batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                warnings.warn(f"Job index ingestion failed for {len(batch)} job(s): {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def upsert(self, jobs: List[Dict[str, Any]]) -> None:
+        """Write `jobs` in one transaction (blocking; called from the ingestion thread)."""
+        now = time.time()
+        with self._write_lock:
+            conn = self.writer
+            inserted = self.inserted
+            swept = False
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for job in jobs:
+                    self._upsert_one(conn, job, now)
+                if now - self._last_sweep >= self.sweep_interval:
+                    self._sweep(conn, now)
+                    self._last_sweep = now
+                    swept = True
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if swept:
+                self._jobs = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            else:
+                self._jobs += self.inserted - inserted
+
+    def _upsert_one(self, conn: sqlite3.Connection, job: Dict[str, Any], now: float) -> None:
+        payload = json.dumps(job, ensure_ascii=False, separators=(",", ":"), sort_keys=True, default=str)
+        digest = _content_hash(payload)
+        row = conn.execute("SELECT id, content_hash FROM jobs WHERE job_id = ?", (job["job_id"],)).fetchone()
+        if row is not None and row[1] == digest:
+            conn.execute("UPDATE jobs SET last_seen = ? WHERE id = ?", (now, row[0]))
+            self.unchanged += 1
+            return
+        fields = (
+            job.get("job_title") or "",
+            job.get("employer_name") or "",
+            job.get("job_description") or "",
+            " ".join(str(job.get(k) or "") for k in ("job_city", "job_country")),
+        )
+        if row is None:
+            cur = conn.execute(
+                "INSERT INTO jobs(job_id, payload, content_hash, first_seen, last_seen) VALUES (?, ?, ?, ?, ?)",
+                (job["job_id"], payload, digest, now, now),
+            )
+            rowid = cur.lastrowid
+            self.inserted += 1
+        else:
+            rowid = row[0]
+            conn.execute("UPDATE jobs SET payload = ?, content_hash = ?, last_seen = ? WHERE id = ?", (payload, digest, now, rowid))
+            conn.execute("DELETE FROM jobs_fts WHERE rowid = ?", (rowid,))
+            self.updated += 1
+        conn.execute(
+            "INSERT INTO jobs_fts(rowid, job_title, employer_name, job_description, location) VALUES (?, ?, ?, ?, ?)",
+            (rowid, *fields),
+        )
+
+    def _sweep(self, conn: sqlite3.Connection, now: float) -> None:
+        doomed = (
+            "SELECT id FROM jobs WHERE last_seen < ? "
+            "UNION SELECT id FROM (SELECT id FROM jobs ORDER BY last_seen DESC LIMIT -1 OFFSET ?)"
+        )
+        params = (now - self.max_age, self.max_jobs)
+        conn.execute(f"DELETE FROM jobs_fts WHERE rowid IN ({doomed})", params)
+        evicted = conn.execute(f"DELETE FROM jobs WHERE id IN ({doomed})", params).rowcount
+        self.evicted += max(evicted, 0)
+
+    # search
+
+    def search(self, query: str, location: Optional[str] = None, limit: int = 20, exclude: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """
+        Jobs matching `query` (and `location`), best BM25 score first. Jobs containing every query term
+        come first; only if there are fewer than `limit` of them are jobs matching any term added.
+        (BM25 scores every matching row, so the narrower all-terms query is what keeps the common case fast.)
+        Jobs older than `max_age` are skipped even if the eviction sweep has not removed them yet.
+        `exclude` drops job_ids already shown.
+        """
+        if not _terms(query) or limit <= 0:
+            return []
+        expressions = [match_expression(query, location, all_terms=True)]
+        if len(_terms(query)) > 1:
+            expressions.append(match_expression(query, location))
+        seen = set(exclude)
+        wanted = limit + len(seen)
+        started = time.perf_counter()
+        jobs: List[Dict[str, Any]] = []
+        with self._read_lock:
+            for expr in expressions:
+                for job_id, payload in self._ranked(expr, wanted):
+                    if job_id not in seen and len(jobs) < limit:
+                        seen.add(job_id)
+                        jobs.append(json.loads(payload))
+                if len(jobs) >= limit:
+                    break
+        self.searches += 1
+        self._search_ms.append((time.perf_counter() - started) * 1000.0)
+        return jobs
+
+    async def asearch(self, query: str, location: Optional[str] = None, limit: int = 20, exclude: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """`search` on a worker thread, for callers on the event loop."""
+        return await asyncio.to_thread(self.search, query, location, limit, list(exclude))
+
+    def _ranked(self, expr: str, limit: int) -> List[Tuple[str, str]]:
+        # rank inside the FTS table first; only the top rows are joined back to their payloads
+        return self.reader.execute(
+            "SELECT jobs.job_id, jobs.payload FROM ("
+            "SELECT rowid, bm25(jobs_fts, " + ", ".join(map(str, _BM25_WEIGHTS)) + ") AS score "
+            "FROM jobs_fts WHERE jobs_fts MATCH ? ORDER BY score LIMIT ?"
+            ") AS hits JOIN jobs ON jobs.id = hits.rowid WHERE jobs.last_seen >= ? ORDER BY hits.score",
+            (expr, limit, time.time() - self.max_age),
+        ).fetchall()
+
+    def close(self) -> None:
+        with self._read_lock:
+            if self._reader is not None:
+                if self._reader is not self._writer:
+                    self._reader.close()
+                self._reader = None
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def stats(self) -> Dict[str, Any]:
+        timings = sorted(self._search_ms)
+
+        def pct(p: float) -> Optional[float]:
+            return round(timings[min(len(timings) - 1, int(p / 100.0 * len(timings)))], 2) if timings else None
+
+        stats = {
+            "ingest": JOB_INDEX_INGEST,
+            "path": self.path,
+            "open": self._writer is not None,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queued": self.queued,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "dropped": self.dropped,
+            "evicted": self.evicted,
+            "searches": self.searches,
+            "search_ms_p50": pct(50),
+            "search_ms_p95": pct(95),
+        }
+        if self._writer is not None:
+            stats["jobs"] = self._jobs
+        return stats
+
+
+job_index = JobIndex()
@@ -0,0 +1,93 @@
+# services/job_ranker.py
+import os
+import warnings
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from services.extraction_pool import ExtractionService, extraction_service
+
+# semantic ranking of the jobs artifact against the user's skills / query ("0" keeps upstream order)
+JOB_RANKING = os.getenv("JOB_RANKING", "1").lower() in ("1", "true", "yes")
+# characters of each job (title + description) that are embedded; the model truncates long inputs anyway
+JOB_RANK_MAX_CHARS = int(os.getenv("JOB_RANK_MAX_CHARS", "1000"))
+
+
+def job_text(job: Dict[str, Any], max_chars: int = JOB_RANK_MAX_CHARS) -> str:
+    return f"{job.get('job_title') or ''}. {job.get('job_description') or ''}"[:max_chars]
+
+
+def profile_text(keywords: str, user_skills: Sequence[str]) -> str:
+    # the user's skills say more about fit than the search keywords; both go into one query text
+    skills = ", ".join(s.strip() for s in user_skills if s and s.strip())
+    return f"{keywords}. Skills: {skills}" if skills else keywords
+
+
+def cosine_scores(query: np.ndarray, docs: np.ndarray) -> np.ndarray:
+    """Cosine similarity of one query vector against every row of `docs`: one normalization and one matmul."""
+    docs = np.asarray(docs, dtype=np.float32)
+    query = np.asarray(query, dtype=np.float32).reshape(-1)
+    norms = np.linalg.norm(docs, axis=1)
+    norms[norms == 0] = 1.0
+    q_norm = float(np.linalg.norm(query)) or 1.0
+    return (docs @ query) / (norms * q_norm)
+
+
+def _score(query: str, texts: List[str]) -> List[float]:
+    # runs on the extraction pool: one batched encode (through the embedding cache) for query + all jobs
+    from services.model_registry import registry
+    vectors = np.asarray(registry.get("embedder").encode([query] + texts), dtype=np.float32)
+    return cosine_scores(vectors[0], vectors[1:]).tolist()
+
+
+class JobRanker:
+    """
+    Orders jobs by cosine similarity between the user's profile (skills + keywords) and each job's
+    title/description, using the shared sentence-transformer on the extraction pool.
+    Ranking is best effort: if the embedder cannot be loaded or the pool is saturated, jobs keep their
+    upstream order and carry no score.
+    """
+
+    def __init__(self, service: ExtractionService = extraction_service, enabled: bool = JOB_RANKING):
+        self.service = service
+        self.enabled = enabled
+        self.ranked = 0
+        self.jobs_scored = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+
+    async def rank(self, jobs: List[Dict[str, Any]], keywords: str, user_skills: Sequence[str] = ()) -> List[Dict[str, Any]]:
+        """
+        Jobs sorted by descending `match_score` (cosine similarity, 4 decimals).
+        Returns new dicts: job dicts can be shared with the job cache and must not be mutated.
+        """
+        if not self.enabled or len(jobs) == 0:
+            return jobs
+        try:
+            scores = await self.service.run(_score, profile_text(keywords, user_skills), [job_text(j) for j in jobs])
+        except Exception as e:
+            self.failed += 1
+            if isinstance(e, ImportError):
+                # sentence-transformers is not installed: that will not change until a restart
+                self.enabled = False
+            if self.last_error is None:
+                warnings.warn(f"Job ranking unavailable, keeping upstream order: {e}")
+            self.last_error = str(e)
+            return jobs
+        self.ranked += 1
+        self.jobs_scored += len(jobs)
+        # stable: equal scores keep upstream order
+        order = sorted(range(len(jobs)), key=lambda i: -scores[i])
+        return [{**jobs[i], "match_score": round(float(scores[i]), 4)} for i in order]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ranked": self.ranked,
+            "jobs_scored": self.jobs_scored,
+            "failed": self.failed,
+            "last_error": self.last_error,
+        }
+
+
+job_ranker = JobRanker()
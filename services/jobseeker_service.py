@@ -116,30 +116,247 @@
 #     return " ".join(parts)
 
 # services/job_service.py
-from typing import List, Dict, Any, Optional
-from services.jsearch_client import JSearchClient
+import asyncio
+import os
+from typing import AsyncIterator, Iterable, List, Dict, Any, Optional, Tuple
+from services.jsearch_client import JSearchClient, JobList
+from services.job_cache import JobSearchCache, make_cache_key
+from services.job_dedup import JOB_DEDUP, NearDuplicateFilter, dedupe
+from services.job_index import JOB_INDEX_INGEST, job_index
+from services.rate_limiter import BACKGROUND, INTERACTIVE
+from services.resilience import CircuitOpenError
+from services.single_flight import SingleFlight
+from services.skill_aggregator import SkillAggregator
+from utils.metrics import timed, timed_async
+
+# where searches are answered: "upstream" (JSearch), "local" (the FTS job index only)
+# or "hybrid" (JSearch, topped up from the index when it returns fewer jobs than asked for)
+SEARCH_SOURCES = ("upstream", "local", "hybrid")
+JOB_SEARCH_SOURCE = os.getenv("JOB_SEARCH_SOURCE", "upstream").lower()
 
 jsearch = JSearchClient()
+job_cache = JobSearchCache()
+upstream_flight = SingleFlight()
+
+def _ingest(jobs: List[Dict[str, Any]]) -> None:
+    # queued only: the index is written by a background task, never on the request path.
+    # mock jobs (no JSEARCH_API_KEY) are not real postings and are not indexed
+    if JOB_INDEX_INGEST and jsearch.api_key and jobs:
+        job_index.ingest(jobs)
+
+async def _search_and_index(query: str, location: Optional[str], per_page: int, pages: int, priority: int) -> List[Dict[str, Any]]:
+    jobs = await jsearch.search_jobs(query=query, location=location, per_page=per_page, pages=pages, priority=priority)
+    _ingest(jobs)
+    return jobs
+
+async def _fetch_jobs(key, query: str, location: Optional[str], per_page: int, pages: int, priority: int = INTERACTIVE) -> List[Dict[str, Any]]:
+    # identical concurrent upstream searches share one RapidAPI call
+    return await upstream_flight.do(key, lambda: _search_and_index(query, location, per_page, pages, priority))
+
+class _PageFanout:
+    """
+    Pages of one in-flight streamed upstream search, kept so every message/stream call that joins the
+    same single-flight call replays them from the first page and then follows along.
+    """
+
+    def __init__(self):
+        self.pages: List[Tuple[int, List[Dict[str, Any]]]] = []
+        self.closed = False
+        self._changed = asyncio.Event()
+
+    def publish(self, page: int, jobs: List[Dict[str, Any]]) -> None:
+        self.pages.append((page, jobs))
+        self._wake()
+
+    def close(self) -> None:
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
 
-async def find_jobs_and_skills(query: str, location: Optional[str] = None, per_page: int = 8) -> Dict[str, Any]:
+    async def follow(self, call: "asyncio.Future") -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        i = 0
+        while True:
+            while i < len(self.pages):
+                yield self.pages[i]
+                i += 1
+            if self.closed or call.done():
+                return
+            changed = asyncio.ensure_future(self._changed.wait())
+            try:
+                await asyncio.wait([changed, call], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                changed.cancel()
+
+# cache key -> pages of the streamed upstream search currently in flight for it
+_fanouts: Dict[Any, _PageFanout] = {}
+
+async def _stream_search(key, fanout: _PageFanout, query: str, location: Optional[str], per_page: int, pages: int) -> JobList:
+    # the shared single-flight call behind message/stream: publishes pages as they arrive and returns
+    # the merged list, so message/send callers coalesced onto it get the same result
+    merged = JobList(pages_requested=pages)
+    seen = set()
+    try:
+        async for page, jobs in jsearch.iter_pages(query, location, per_page, pages):
+            fresh = []
+            for job in jobs:
+                job_id = job.get("job_id")
+                if job_id and job_id in seen:
+                    continue
+                seen.add(job_id)
+                fresh.append(job)
+            merged.extend(fresh)
+            merged.pages_fetched += 1
+            _ingest(fresh)
+            fanout.publish(page, fresh)
+    finally:
+        fanout.close()
+        if _fanouts.get(key) is fanout:
+            del _fanouts[key]
+    merged.partial = merged.pages_fetched < merged.pages_requested
+    job_cache.set(key, merged)
+    return merged
+
+def _partial_metadata(jobs: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # some upstream pages missed the deadline or failed: the result is not cached, and says so
+    if not getattr(jobs, "partial", False):
+        return None
+    return {"partial": True, "pagesFetched": jobs.pages_fetched, "pagesRequested": jobs.pages_requested}
+
+async def _local_fill(query: str, location: Optional[str], limit: int, jobs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # hybrid mode: indexed jobs not already in `jobs`, best BM25 match first, up to `limit` in total
+    jobs = list(jobs)
+    if len(jobs) >= limit:
+        return []
+    return await job_index.asearch(query, location, limit=limit - len(jobs), exclude=[j.get("job_id") for j in jobs])
+
+def _last_good(key, error: CircuitOpenError) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    # JSearch is failing: serve the last stored result for this query, however old, marked stale
+    jobs = job_cache.get_last_good(key)
+    if jobs is None:
+        raise error
+    return jobs, {"stale": True, "staleReason": "circuit_open", "ageSeconds": round(job_cache.age(key) or 0.0)}
+
+@timed_async("find_jobs")
+async def find_jobs_and_skills(query: str, location: Optional[str] = None, per_page: int = 8, pages: int = 1, source: Optional[str] = None) -> Dict[str, Any]:
     """
-    Returns dict: {"jobs": [...], "top_skills": [...]}.
-    Normalizes jobs and extracts frequent keywords via simple heuristics.
+    Returns dict: {"jobs": [...], "top_skills": [...], "jobs_metadata": {...} | None}.
+    Normalizes jobs and ranks the skills most often mentioned in their descriptions.
+    `jobs_metadata` is set when the jobs did not all come from JSearch: a stale fallback served while
+    the JSearch circuit is open, or jobs from the local index (`source` local or hybrid); when some
+    upstream pages were missing (`partial`, `pagesFetched`, `pagesRequested`); and when
+    near-duplicate postings were dropped (`duplicatesRemoved`).
     """
-    jobs = await jsearch.search_jobs(query=query, location=location, per_page=per_page)
-    # Extract keywords from job_description via simple heuristics (word freq)
-    all_texts = [j.get("job_description","") for j in jobs]
-    tokens = []
-    import re
-    for t in all_texts:
-        tokens.extend(re.findall(r"[A-Za-z\+\-\.#]{2,}", t.lower()))
-    # naive stopwords
-    stop = set(["the","and","with","for","our","we","you","is","in","on","to","a","an"])
-    freq = {}
-    for tk in tokens:
-        if tk in stop: continue
-        freq[tk] = freq.get(tk,0)+1
-    # choose some known skills or most frequent tokens
-    common_ordered = sorted(freq.items(), key=lambda x:-x[1])
-    top_skills = [k for k,_ in common_ordered[:10]]
-    return {"jobs": jobs, "top_skills": top_skills}
+    source = source or JOB_SEARCH_SOURCE
+    limit = per_page * pages
+    metadata = None
+    if source == "local":
+        jobs = await job_index.asearch(query, location, limit=limit)
+        metadata = {"source": "local"}
+    else:
+        key = make_cache_key(query, location, per_page, pages)
+        try:
+            # stale-while-revalidate refreshes queue behind interactive searches for the RapidAPI quota
+            jobs = await job_cache.get_or_fetch(
+                key,
+                lambda: _fetch_jobs(key, query, location, per_page, pages),
+                refresh=lambda: _fetch_jobs(key, query, location, per_page, pages, priority=BACKGROUND),
+            )
+            metadata = _partial_metadata(jobs)
+        except CircuitOpenError as e:
+            try:
+                jobs, metadata = _last_good(key, e)
+            except CircuitOpenError:
+                # hybrid can still answer from the index alone
+                if source != "hybrid":
+                    raise
+                jobs = []
+        if source == "hybrid":
+            extra = await _local_fill(query, location, limit, jobs)
+            if extra:
+                jobs = jobs + extra
+                metadata = {**(metadata or {}), "source": "hybrid", "localJobs": len(extra)}
+    if JOB_DEDUP:
+        # the same posting re-listed by several boards / agencies; the cache keeps the raw list
+        with timed("dedup"):
+            jobs, removed = dedupe(jobs)
+        if removed:
+            metadata = {**(metadata or {}), "duplicatesRemoved": removed}
+    # stream descriptions through the skill matcher; top-k comes from a heap, not a full sort
+    with timed("skill_aggregation"):
+        top_skills = SkillAggregator().add_jobs(jobs).top_k(10)
+    return {"jobs": jobs, "top_skills": top_skills, "jobs_metadata": metadata}
+
+async def stream_jobs(query: str, location: Optional[str] = None, per_page: int = 8, pages: int = 1, source: Optional[str] = None) -> AsyncIterator[Tuple[Optional[int], List[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """
+    Yields (page, jobs, metadata) as upstream pages arrive, for message/stream.
+    A cached result is yielded at once as a single chunk with page None (a stale one is refreshed in the
+    background, as in find_jobs_and_skills); so is the stale fallback served while the JSearch circuit
+    is open, with its `metadata` set.
+    On a miss the search runs under the same single-flight key as message/send: concurrent identical
+    streams share one set of upstream calls and each replays its pages. Joining a message/send search
+    already in flight yields its jobs in one chunk when it completes.
+    Job ids already yielded are dropped from later pages; a complete stream stores the merged list in the cache.
+    With `source` local the index answers in one chunk; with hybrid, indexed jobs fill a last chunk.
+    Near-duplicates of jobs already yielded are dropped across chunks; once any were, chunk metadata
+    carries the running `duplicatesRemoved` count.
+    """
+    source = source or JOB_SEARCH_SOURCE
+    limit = per_page * pages
+    dedup = NearDuplicateFilter() if JOB_DEDUP else None
+
+    def chunk(jobs: List[Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None):
+        if dedup is None:
+            return jobs, metadata
+        jobs = dedup.filter(jobs)
+        if dedup.removed:
+            metadata = {**(metadata or {}), "duplicatesRemoved": dedup.removed}
+        return jobs, metadata
+
+    if source == "local":
+        yield (None, *chunk(await job_index.asearch(query, location, limit=limit), {"source": "local"}))
+        return
+    key = make_cache_key(query, location, per_page, pages)
+    cached = job_cache.lookup(key, refresh=lambda: _fetch_jobs(key, query, location, per_page, pages, priority=BACKGROUND))
+    if cached is not None:
+        yield (None, *chunk(cached))
+        shown = cached
+    else:
+        fanout = _PageFanout()
+        call, started = upstream_flight.join(key, lambda: _stream_search(key, fanout, query, location, per_page, pages))
+        if started:
+            _fanouts[key] = fanout
+        else:
+            # None: a message/send search owns the call, its jobs arrive in one chunk at the end
+            fanout = _fanouts.get(key)
+        # pages are published in the order they are merged, so what is left to yield is the tail
+        yielded = 0
+        try:
+            if fanout is not None:
+                async for page, jobs in fanout.follow(call.task):
+                    yielded += len(jobs)
+                    yield (page, *chunk(jobs))
+            merged = await asyncio.shield(call.task)
+        except CircuitOpenError as e:
+            # the upstream search only raises when no page came through, so nothing has been yielded yet
+            try:
+                merged, metadata = _last_good(key, e)
+            except CircuitOpenError:
+                if source != "hybrid":
+                    raise
+                merged = []
+            else:
+                yield (None, *chunk(merged, metadata))
+        else:
+            metadata = _partial_metadata(merged)
+            if len(merged) > yielded or metadata:
+                yield (None, *chunk(merged[yielded:], metadata))
+        finally:
+            upstream_flight.leave(call)
+        shown = merged
+    if source == "hybrid":
+        extra = await _local_fill(query, location, limit, shown)
+        if extra:
+            yield (None, *chunk(extra, {"source": "hybrid", "localJobs": len(extra)}))
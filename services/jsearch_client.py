@@ -49,37 +49,364 @@
 #         ]
 
 # services/jsearch_client.py
+import asyncio
 import os
-from typing import List, Dict, Any, Optional
+import time
+import warnings
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import httpx
+from services.rate_limiter import INTERACTIVE, RateLimiter, RateLimitExceeded
+from services.resilience import CircuitBreaker, LatencyTracker, full_jitter
+from utils.metrics import record_stage, timed_async
 
 JSEARCH_BASE = os.getenv("JSEARCH_BASE_URL", "https://jsearch.p.rapidapi.com/search")
 JSEARCH_KEY = os.getenv("JSEARCH_API_KEY")
 JSEARCH_HOST = os.getenv("JSEARCH_HOST", "jsearch.p.rapidapi.com")
 
+# connection pool tuning (shared client owned by the app lifespan)
+JSEARCH_TIMEOUT = float(os.getenv("JSEARCH_TIMEOUT", "15.0"))
+JSEARCH_MAX_CONNECTIONS = int(os.getenv("JSEARCH_MAX_CONNECTIONS", "20"))
+JSEARCH_MAX_KEEPALIVE = int(os.getenv("JSEARCH_MAX_KEEPALIVE", "10"))
+JSEARCH_KEEPALIVE_EXPIRY = float(os.getenv("JSEARCH_KEEPALIVE_EXPIRY", "30.0"))
+JSEARCH_HTTP2 = os.getenv("JSEARCH_HTTP2", "0").lower() in ("1", "true", "yes")
+
+# multi-page mode: pages are fetched concurrently under a cap and an overall deadline
+JSEARCH_MAX_PAGES = int(os.getenv("JSEARCH_MAX_PAGES", "10"))
+JSEARCH_PAGE_CONCURRENCY = int(os.getenv("JSEARCH_PAGE_CONCURRENCY", "4"))
+JSEARCH_PAGE_DEADLINE = float(os.getenv("JSEARCH_PAGE_DEADLINE", "10.0"))
+
+# retries of idempotent failures (network errors, timeouts, 5xx), with full-jitter backoff
+JSEARCH_RETRIES = int(os.getenv("JSEARCH_RETRIES", "2"))
+JSEARCH_RETRY_BACKOFF_BASE = float(os.getenv("JSEARCH_RETRY_BACKOFF_BASE", "0.2"))
+JSEARCH_RETRY_BACKOFF_MAX = float(os.getenv("JSEARCH_RETRY_BACKOFF_MAX", "2.0"))
+# hedging: send a duplicate request when the first is slower than this percentile of recent calls
+JSEARCH_HEDGE = os.getenv("JSEARCH_HEDGE", "0").lower() in ("1", "true", "yes")
+JSEARCH_HEDGE_PERCENTILE = float(os.getenv("JSEARCH_HEDGE_PERCENTILE", "95"))
+JSEARCH_HEDGE_MIN_DELAY = float(os.getenv("JSEARCH_HEDGE_MIN_DELAY", "0.05"))
+
+_RETRY_STATUSES = {500, 502, 503, 504}
+
+
+class JobList(list):
+    """List of normalized jobs; `partial` is set when some pages timed out or failed."""
+
+    def __init__(self, jobs=(), partial: bool = False, pages_fetched: int = 0, pages_requested: int = 0):
+        super().__init__(jobs)
+        self.partial = partial
+        self.pages_fetched = pages_fetched
+        self.pages_requested = pages_requested
+
+
 class JSearchClient:
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_connections: int = JSEARCH_MAX_CONNECTIONS,
+        max_keepalive: int = JSEARCH_MAX_KEEPALIVE,
+        keepalive_expiry: float = JSEARCH_KEEPALIVE_EXPIRY,
+        http2: bool = JSEARCH_HTTP2,
+        timeout: float = JSEARCH_TIMEOUT,
+        limiter: Optional[RateLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        retries: int = JSEARCH_RETRIES,
+        hedge: bool = JSEARCH_HEDGE,
+    ):
         self.api_key = api_key or JSEARCH_KEY
         self.base_url = base_url or JSEARCH_BASE
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._in_flight = 0
+        # every upstream call takes a token first; quota headers and 429s feed back into it
+        self.limiter = limiter or RateLimiter()
+        # upstream failing or slow: fail fast instead of holding every caller for `timeout`
+        self.breaker = breaker or CircuitBreaker("JSearch")
+        self.retries = max(0, retries)
+        self.hedge = hedge
+        self.latency = LatencyTracker()
+        self.retried = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    async def startup(self) -> None:
+        """Create the shared pooled client. Called from the FastAPI lifespan."""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+
+    async def aclose(self) -> None:
+        """Close the pooled client and drop all keep-alive connections."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                warnings.warn("JSEARCH_HTTP2 requested but 'h2' is not installed; falling back to HTTP/1.1.")
+                http2 = False
+        return httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=http2)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # lazily create the pool for callers running outside the app lifespan (scripts, shells)
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Connection pool statistics: active/idle connections and requests waiting for one.
+        Reads httpcore's pool state defensively, the internals are not a public API.
+        """
+        stats = {
+            "max_connections": self.limits.max_connections,
+            "max_keepalive": self.limits.max_keepalive_connections,
+            "http2": self.http2,
+            "open": self._client is not None and not self._client.is_closed,
+            "in_flight": self._in_flight,
+            "connections": 0,
+            "active": 0,
+            "idle": 0,
+            "waiting": 0,
+        }
+        if not stats["open"]:
+            return stats
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        if pool is None:
+            return stats
+        try:
+            connections = list(pool.connections)
+            idle = sum(1 for c in connections if c.is_idle())
+            stats["connections"] = len(connections)
+            stats["idle"] = idle
+            stats["active"] = len(connections) - idle
+            stats["waiting"] = sum(1 for r in list(pool._requests) if r.is_queued())
+        except Exception:
+            pass
+        return stats
 
-    async def search_jobs(self, query: str, location: Optional[str] = None, per_page: int = 8) -> List[Dict[str, Any]]:
+    @timed_async("jsearch")
+    async def search_jobs(
+        self,
+        query: str,
+        location: Optional[str] = None,
+        per_page: int = 8,
+        pages: int = 1,
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None,
+        priority: int = INTERACTIVE,
+    ) -> List[Dict[str, Any]]:
+        pages = max(1, min(int(pages), JSEARCH_MAX_PAGES))
         if not self.api_key:
-            return self._mock_jobs(query, location, per_page)
+            return self._mock_jobs(query, location, per_page, pages)
+        if pages == 1:
+            return await self._fetch_page(query, location, per_page, 1, priority)
+        return await self._fetch_pages(
+            query, location, per_page, pages,
+            concurrency or JSEARCH_PAGE_CONCURRENCY,
+            JSEARCH_PAGE_DEADLINE if deadline is None else deadline,
+            priority,
+        )
 
+    async def _fetch_page(self, query: str, location: Optional[str], per_page: int, page: int, priority: int = INTERACTIVE) -> List[Dict[str, Any]]:
         headers = {
             "X-RapidAPI-Key": self.api_key,
             "X-RapidAPI-Host": JSEARCH_HOST
         }
-        params = {"query": query, "num_pages": 1, "page": 1, "size": per_page}
+        params = {"query": query, "num_pages": 1, "page": page, "size": per_page}
         if location:
             params["location"] = location
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(self.base_url, params=params, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
-            jobs_raw = data.get("data") or data.get("jobs") or []
-            return [self._normalize_job(j) for j in jobs_raw]
+        attempt = 0
+        while True:
+            try:
+                resp = await self._attempt(params, headers, priority)
+                break
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                # GET is idempotent: network errors, timeouts and 5xx are retried while the breaker allows it
+                retryable = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code in _RETRY_STATUSES
+                if not retryable or attempt >= self.retries:
+                    raise
+                await asyncio.sleep(full_jitter(attempt, JSEARCH_RETRY_BACKOFF_BASE, JSEARCH_RETRY_BACKOFF_MAX))
+                attempt += 1
+                self.retried += 1
+        data = resp.json()
+        jobs_raw = data.get("data") or data.get("jobs") or []
+        return [self._normalize_job(j) for j in jobs_raw]
+
+    async def _attempt(self, params: Dict[str, Any], headers: Dict[str, str], priority: int) -> httpx.Response:
+        """One upstream call through the breaker and the rate limiter; returns a 2xx response or raises."""
+        self.breaker.allow()
+        started = time.monotonic()
+        try:
+            await self.limiter.acquire(priority)
+            started = time.monotonic()
+            resp = await self._send(params, headers)
+        except httpx.TransportError:
+            self.breaker.on_failure()
+            raise
+        except BaseException:
+            self.breaker.on_ignored()
+            raise
+        self.limiter.observe(resp.status_code, resp.headers)
+        if resp.status_code == 429:
+            self.breaker.on_ignored()
+            raise RateLimitExceeded("JSearch rate limit exceeded (HTTP 429)", retry_after=self.limiter.paused_for())
+        if resp.status_code >= 500:
+            self.breaker.on_failure()
+        elif resp.status_code >= 400:
+            self.breaker.on_ignored()
+        else:
+            self.breaker.on_success(time.monotonic() - started)
+        resp.raise_for_status()
+        return resp
+
+    async def _get(self, params: Dict[str, Any], headers: Dict[str, str]) -> httpx.Response:
+        self._in_flight += 1
+        started = time.monotonic()
+        try:
+            resp = await self.client.get(self.base_url, params=params, headers=headers)
+        finally:
+            self._in_flight -= 1
+            # RapidAPI time alone, without rate-limit waits and retry backoff
+            record_stage("jsearch_http", time.monotonic() - started)
+        if resp.is_success:
+            self.latency.add(time.monotonic() - started)
+        return resp
+
+    async def _send(self, params: Dict[str, Any], headers: Dict[str, str]) -> httpx.Response:
+        """
+        GET once; with hedging on, a second identical GET goes out if the first has not answered within
+        the recent p95 latency, and whichever succeeds first wins (the other is cancelled).
+        The hedge needs a free rate-limit slot and is skipped otherwise.
+        """
+        delay = self.latency.percentile(JSEARCH_HEDGE_PERCENTILE) if self.hedge else None
+        if delay is None:
+            return await self._get(params, headers)
+        first = asyncio.ensure_future(self._get(params, headers))
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=max(delay, JSEARCH_HEDGE_MIN_DELAY))
+            if done or not self.limiter.try_acquire():
+                return await first
+            self.hedged += 1
+            second = asyncio.ensure_future(self._get(params, headers))
+            pending = {first, second}
+            failed: Optional[asyncio.Future] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    if t.exception() is None and t.result().is_success:
+                        if t is second:
+                            self.hedge_wins += 1
+                        return t.result()
+                    failed = failed or t
+            # neither succeeded: return the error response (or raise the exception) of the first to finish
+            return failed.result()
+        finally:
+            for t in pending:
+                t.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        p95 = self.latency.percentile(JSEARCH_HEDGE_PERCENTILE)
+        return {
+            "breaker": self.breaker.stats(),
+            "retried": self.retried,
+            "hedging": self.hedge,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay_ms": round(p95 * 1000.0, 1) if p95 is not None else None,
+        }
+
+    async def iter_pages(
+        self,
+        query: str,
+        location: Optional[str] = None,
+        per_page: int = 8,
+        pages: int = 1,
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None,
+        priority: int = INTERACTIVE,
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Yield (page, jobs) for pages 1..pages as each one arrives, fetching at most `concurrency` at a time.
+        Failed pages are skipped and pages still running at `deadline` are cancelled;
+        an error is raised only if no page succeeded.
+        """
+        pages = max(1, min(int(pages), JSEARCH_MAX_PAGES))
+        if not self.api_key:
+            jobs = self._mock_jobs(query, location, per_page, pages)
+            for page in range(1, pages + 1):
+                yield page, jobs[(page - 1) * per_page:page * per_page]
+            return
+        deadline = JSEARCH_PAGE_DEADLINE if deadline is None else deadline
+        sem = asyncio.Semaphore(max(1, concurrency or JSEARCH_PAGE_CONCURRENCY))
+
+        async def fetch(page: int) -> List[Dict[str, Any]]:
+            async with sem:
+                return await self._fetch_page(query, location, per_page, page, priority)
+
+        tasks = {asyncio.ensure_future(fetch(page)): page for page in range(1, pages + 1)}
+        pending = set(tasks)
+        fetched = 0
+        first_error: Optional[BaseException] = None
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + deadline
+        try:
+            while pending:
+                remaining = deadline_at - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for t in sorted(done, key=tasks.__getitem__):
+                    if t.exception() is not None:
+                        first_error = first_error or t.exception()
+                        continue
+                    fetched += 1
+                    yield tasks[t], t.result()
+        finally:
+            for t in pending:
+                t.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if fetched == 0:
+            if first_error is not None:
+                raise first_error
+            raise asyncio.TimeoutError(f"No JSearch page completed within {deadline}s")
+        if fetched < pages:
+            warnings.warn(f"JSearch returned {fetched}/{pages} pages for {query!r}; serving partial results.")
+
+    async def _fetch_pages(self, query: str, location: Optional[str], per_page: int, pages: int, concurrency: int, deadline: float, priority: int = INTERACTIVE) -> JobList:
+        """
+        Fetch pages 1..pages concurrently (see `iter_pages`) and merge them in page order, dropping repeated job ids.
+        The merged list is marked partial when some pages failed or missed the deadline.
+        """
+        by_page: Dict[int, List[Dict[str, Any]]] = {}
+        async for page, jobs in self.iter_pages(query, location, per_page, pages, concurrency, deadline, priority):
+            by_page[page] = jobs
+
+        merged: List[Dict[str, Any]] = []
+        seen = set()
+        for page in sorted(by_page):
+            for job in by_page[page]:
+                job_id = job.get("job_id")
+                if job_id and job_id in seen:
+                    continue
+                seen.add(job_id)
+                merged.append(job)
+        return JobList(merged, partial=len(by_page) < pages, pages_fetched=len(by_page), pages_requested=pages)
 
     def _normalize_job(self, j: Dict[str, Any]) -> Dict[str, Any]:
         # defensive mapping; handle different provider shapes
@@ -93,19 +420,31 @@ class JSearchClient:
             "job_apply_link": j.get("url") or j.get("job_apply_link") or j.get("apply_link") or j.get("apply_url")
         }
 
-    def _mock_jobs(self, query: str, location: Optional[str], per_page: int):
+    def _mock_jobs(self, query: str, location: Optional[str], per_page: int, pages: int = 1):
+        # varied enough that near-duplicate filtering keeps them apart
+        levels = ["Junior", "Mid-level", "Senior", "Lead"]
+        employers = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries"]
+        stacks = [
+            "Python, SQL, Docker and CI/CD. Familiarity with AWS or GCP is a plus",
+            "Java, Spring Boot, Kafka and PostgreSQL, running on Kubernetes",
+            "TypeScript, React and Node.js; you will own features end to end",
+            "Go, gRPC and Terraform, with on-call for services handling heavy traffic",
+            "Spark, Airflow and dbt to build reliable data pipelines on Snowflake",
+            "C#, .NET and Azure; experience with automated testing and code review",
+            "Rust and Linux internals for low-latency systems; Python for tooling",
+        ]
         return [
             {
                 "job_id": f"mock-{i}",
-                "job_title": f"{query.title()} Engineer {i}",
-                "employer_name": "Acme Corp",
+                "job_title": f"{levels[i % len(levels)]} {query.title()} Engineer",
+                "employer_name": employers[i % len(employers)],
                 "job_city": location or "Remote",
                 "job_country": "Anywhere",
                 "job_description": (
-                    f"We are seeking a {query} engineer with experience in Python, SQL, Docker, "
-                    "and CI/CD. Familiarity with AWS or GCP is a plus."
+                    f"{employers[i % len(employers)]} is hiring a {levels[i % len(levels)].lower()} {query} engineer. "
+                    f"You will work with {stacks[i % len(stacks)]}."
                 ),
                 "job_apply_link": f"https://jobs.example.com/{query}-{i}"
             }
-            for i in range(1, per_page + 1)
+            for i in range(1, per_page * pages + 1)
         ]
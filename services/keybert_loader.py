@@ -1,11 +1,18 @@
-from keybert import KeyBERT
-from sentence_transformers import SentenceTransformer
+# services/keybert_loader.py
+from services.model_registry import registry
 
-# Load sentence-BERT model for KeyBERT
-model = SentenceTransformer("all-MiniLM-L6-v2")
-kw_model = KeyBERT(model=model)
+def __getattr__(name: str):
+    # shared instances from the registry; nothing is loaded at import time
+    if name == "kw_model":
+        return registry.get("keybert")
+    if name == "model":
+        return registry.get("sentence_transformer")
+    raise AttributeError(name)
 
 def extract_keywords(text, top_n=5):
+    kw_model = registry.get("keybert")
+    if kw_model is None:
+        return []
     keywords = kw_model.extract_keywords(
         text,
         keyphrase_ngram_range=(1,2),
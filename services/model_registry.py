@@ -0,0 +1,143 @@
+# services/model_registry.py
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+import warnings
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+MODEL_CACHE_DIR = os.getenv("MODEL_CACHE_DIR", os.path.join(ROOT, "dp_model"))
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+SENTENCE_MODEL = os.getenv("SENTENCE_MODEL", "all-MiniLM-L6-v2")
+# opt-in: run `python -m spacy download` when the spaCy package is missing (dev boxes only; it is a
+# network fetch and a subprocess inside whichever request first needs the model)
+MODELS_AUTO_DOWNLOAD = os.getenv("MODELS_AUTO_DOWNLOAD", "0").lower() in ("1", "true", "yes")
+# load every model in the app lifespan instead of on first use
+MODELS_EAGER_LOAD = os.getenv("MODELS_EAGER_LOAD", "0").lower() in ("1", "true", "yes")
+
+DEFAULT_MODELS = ("spacy", "keybert")
+
+
+def _load_spacy() -> Any:
+    import spacy
+
+    local_path = os.path.join(MODEL_CACHE_DIR, SPACY_MODEL)
+    if os.path.exists(os.path.join(local_path, "config.cfg")):
+        return spacy.load(local_path)
+    try:
+        nlp = spacy.load(SPACY_MODEL)
+    except OSError as e:
+        if not MODELS_AUTO_DOWNLOAD:
+            raise OSError(
+                f"spaCy model {SPACY_MODEL!r} is not installed: run `python -m spacy download {SPACY_MODEL}` "
+                f"(or set MODELS_AUTO_DOWNLOAD=1 to download it on first use)"
+            ) from e
+        logger.warning("Downloading spaCy model %s (MODELS_AUTO_DOWNLOAD=1)", SPACY_MODEL)
+        subprocess.run([sys.executable, "-m", "spacy", "download", SPACY_MODEL], check=True)
+        nlp = spacy.load(SPACY_MODEL)
+    try:
+        # native serialization; later loads read this directory instead of resolving the package
+        os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+        nlp.to_disk(local_path)
+    except OSError as e:
+        warnings.warn(f"Could not cache spaCy model to {local_path}: {e}")
+    return nlp
+
+
+def _load_sentence_transformer() -> Any:
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(SENTENCE_MODEL)
+
+
+class ModelRegistry:
+    """
+    Process-wide owner of the NLP models. Each model is loaded once, on first `get` or in `warm_up`,
+    and shared by every caller; importing this module loads nothing.
+    Optional models (KeyBERT) resolve to None when they cannot be loaded, so callers degrade instead of failing.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self._loaders: Dict[str, Callable[[], Any]] = {
+            "spacy": _load_spacy,
+            "sentence_transformer": _load_sentence_transformer,
+            "embedder": self._load_embedder,
+            "keybert": self._load_keybert,
+        }
+        self._optional = {"keybert"}
+        self.load_times: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    def register(self, name: str, loader: Callable[[], Any], optional: bool = False) -> None:
+        with self._lock:
+            self._loaders[name] = loader
+            self._models.pop(name, None)
+            if optional:
+                self._optional.add(name)
+
+    def _load_embedder(self) -> Any:
+        # sentence-transformer behind the content-addressed embedding cache (same `encode` API)
+        from services.embedding_cache import CachedEncoder, EMBEDDING_CACHE_ENABLED
+        model = self.get("sentence_transformer")
+        return CachedEncoder(model, SENTENCE_MODEL) if EMBEDDING_CACHE_ENABLED else model
+
+    def _load_keybert(self) -> Any:
+        from keybert import KeyBERT
+        from services.embedding_cache import CachedEncoder, keybert_backend
+        # share the sentence-transformer instance instead of letting KeyBERT load its own copy
+        embedder = self.get("embedder")
+        if isinstance(embedder, CachedEncoder):
+            return KeyBERT(model=keybert_backend(embedder))
+        return KeyBERT(model=embedder)
+
+    def get(self, name: str) -> Any:
+        try:
+            return self._models[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name in self._models:
+                return self._models[name]
+            if name not in self._loaders:
+                raise KeyError(f"Unknown model {name!r}")
+            t0 = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                if name not in self._optional:
+                    raise
+                warnings.warn(f"⚠️ Could not load {name}: {e}\nFalling back to basic keyword extraction.")
+                self.errors[name] = str(e)
+                model = None
+            self.load_times[name] = round((time.perf_counter() - t0) * 1000.0, 1)
+            self._models[name] = model
+            logger.info("Model %s ready in %.0f ms", name, self.load_times[name])
+            return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        for name in names or DEFAULT_MODELS:
+            self.get(name)
+        return dict(self.load_times)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "loaded": name in self._models,
+                "available": self._models.get(name) is not None,
+                "load_ms": self.load_times.get(name),
+                "error": self.errors.get(name),
+            }
+            for name in self._loaders
+        }
+
+
+registry = ModelRegistry()
@@ -0,0 +1,343 @@
+# services/push_notifier.py
+import asyncio
+import ipaddress
+import json
+import os
+import socket
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from models.a2a import PushNotificationConfig, TaskResult
+from services.rate_limiter import TokenBucket
+from services.resilience import full_jitter
+from utils.json_response import encode_model
+
+# deliveries sent at once, and deliveries allowed to wait (beyond this, notifications are dropped)
+PUSH_CONCURRENCY = int(os.getenv("PUSH_CONCURRENCY", "8"))
+PUSH_MAX_QUEUE = int(os.getenv("PUSH_MAX_QUEUE", "1000"))
+PUSH_TIMEOUT = float(os.getenv("PUSH_TIMEOUT", "10.0"))
+PUSH_MAX_CONNECTIONS = int(os.getenv("PUSH_MAX_CONNECTIONS", "50"))
+# retries: attempt n waits uniform(0, min(PUSH_BACKOFF_MAX, PUSH_BACKOFF_BASE * 2**n)) seconds
+PUSH_MAX_ATTEMPTS = int(os.getenv("PUSH_MAX_ATTEMPTS", "5"))
+PUSH_BACKOFF_BASE = float(os.getenv("PUSH_BACKOFF_BASE", "0.5"))
+PUSH_BACKOFF_MAX = float(os.getenv("PUSH_BACKOFF_MAX", "30.0"))
+# per destination host: sustained requests/second and burst size
+PUSH_RATE_PER_HOST = float(os.getenv("PUSH_RATE_PER_HOST", "10"))
+PUSH_BURST_PER_HOST = int(os.getenv("PUSH_BURST_PER_HOST", "20"))
+# failed deliveries kept for inspection; optionally also appended to a JSON-lines file
+PUSH_DEAD_LETTER_MAX = int(os.getenv("PUSH_DEAD_LETTER_MAX", "1000"))
+PUSH_DEAD_LETTER_PATH = os.getenv("PUSH_DEAD_LETTER_PATH")
+# comma-separated webhook hosts ("hooks.example.com", "*.example.com"); when set, only these get
+# notifications, and they may be internal. Unset: any host resolving to public addresses only.
+PUSH_ALLOWED_HOSTS = [h.strip().lower() for h in os.getenv("PUSH_ALLOWED_HOSTS", "").split(",") if h.strip()] or None
+
+# statuses worth retrying; any other 4xx means the receiver rejected the notification
+_RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+_MAX_BUCKETS = 1024
+
+
+class _Delivery:
+    __slots__ = ("task_id", "url", "host", "hostname", "port", "body", "headers", "attempts", "created", "last_error", "last_status")
+
+    def __init__(self, task_id: str, url: str, body: bytes, headers: Dict[str, str]):
+        self.task_id = task_id
+        self.url = url
+        parts = urlsplit(url)
+        self.host = parts.netloc.lower()
+        self.hostname = parts.hostname or ""
+        try:
+            self.port = parts.port
+        except ValueError:
+            self.port = None
+        self.body = body
+        self.headers = headers
+        self.attempts = 0
+        self.created = time.monotonic()
+        self.last_error: Optional[str] = None
+        self.last_status: Optional[int] = None
+
+
+class PushNotifier:
+    """
+    Delivers task webhooks (A2A pushNotificationConfig) in the background.
+    `notify` only encodes and queues; `concurrency` workers POST over one pooled client,
+    each destination host is rate limited, transient failures are retried with exponential backoff
+    and full jitter, and deliveries that still fail are kept as dead letters.
+    Webhook URLs come from clients: outside `allowed_hosts`, a destination that resolves to a private,
+    loopback, link-local or otherwise non-public address is dead-lettered instead of requested.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = PUSH_CONCURRENCY,
+        max_queue: int = PUSH_MAX_QUEUE,
+        max_attempts: int = PUSH_MAX_ATTEMPTS,
+        backoff_base: float = PUSH_BACKOFF_BASE,
+        backoff_max: float = PUSH_BACKOFF_MAX,
+        rate_per_host: float = PUSH_RATE_PER_HOST,
+        burst_per_host: int = PUSH_BURST_PER_HOST,
+        timeout: float = PUSH_TIMEOUT,
+        dead_letter_max: int = PUSH_DEAD_LETTER_MAX,
+        dead_letter_path: Optional[str] = PUSH_DEAD_LETTER_PATH,
+        allowed_hosts: Optional[Iterable[str]] = PUSH_ALLOWED_HOSTS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(1, max_queue)
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_per_host = rate_per_host
+        self.burst_per_host = burst_per_host
+        self.timeout = timeout
+        self.dead_letter_path = dead_letter_path
+        self.allowed_hosts = frozenset(h.lower() for h in allowed_hosts) if allowed_hosts is not None else None
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._retries: Dict[asyncio.TimerHandle, _Delivery] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._dead: Deque[Dict[str, Any]] = deque(maxlen=dead_letter_max)
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self._in_flight = 0
+        self.queued = 0
+        self.delivered = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.dropped = 0
+        self.refused = 0
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=PUSH_MAX_CONNECTIONS, max_keepalive_connections=self.concurrency),
+                transport=self.transport,
+            )
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [asyncio.create_task(self._worker(), name=f"push-worker-{i}") for i in range(self.concurrency)]
+
+    async def aclose(self, grace: float = 5.0) -> None:
+        """Give queued deliveries `grace` seconds, then dead-letter whatever is left and close the client."""
+        if self._queue is not None and grace > 0:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=grace)
+            except asyncio.TimeoutError:
+                pass
+        for handle, delivery in list(self._retries.items()):
+            handle.cancel()
+            self._dead_letter(delivery, "shutdown")
+        self._retries.clear()
+        workers, self._workers = self._workers, []
+        for w in workers:
+            w.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            self._dead_letter(self._queue.get_nowait(), "shutdown")
+        self._queue = None
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    def notify(self, config: PushNotificationConfig, task: TaskResult) -> bool:
+        """Queue a webhook carrying `task` for `config.url`; returns False if it was dropped."""
+        if urlsplit(config.url).scheme not in ("http", "https"):
+            self._dead_letter(_Delivery(task.id, config.url, b"", {}), "unsupported url scheme")
+            return False
+        if not self._host_allowed(urlsplit(config.url).hostname or ""):
+            self.refused += 1
+            self._dead_letter(_Delivery(task.id, config.url, b"", {}), "host not allowed")
+            return False
+        self.start()
+        delivery = _Delivery(task.id, config.url, encode_model(task), _headers(config))
+        try:
+            self._queue.put_nowait(delivery)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._dead_letter(delivery, "queue full")
+            return False
+        self.queued += 1
+        return True
+
+    def _host_allowed(self, hostname: str) -> bool:
+        if not hostname:
+            return False
+        if self.allowed_hosts is None:
+            return True
+        if hostname in self.allowed_hosts:
+            return True
+        labels = hostname.split(".")
+        return any("*." + ".".join(labels[i:]) in self.allowed_hosts for i in range(1, len(labels)))
+
+    async def _refused_address(self, delivery: _Delivery) -> Optional[str]:
+        """Why the destination must not be requested, or None. Allowlisted hosts are trusted as configured."""
+        if self.allowed_hosts is not None:
+            return None
+        try:
+            addresses = [ipaddress.ip_address(delivery.hostname.strip("[]"))]
+        except ValueError:
+            infos = await asyncio.get_running_loop().getaddrinfo(delivery.hostname, delivery.port, type=socket.SOCK_STREAM)
+            addresses = [ipaddress.ip_address(info[4][0].split("%", 1)[0]) for info in infos]
+        # checked on every attempt; the client resolves again when it connects, so a host that
+        # rebinds in between is only stopped by PUSH_ALLOWED_HOSTS
+        for address in addresses:
+            if getattr(address, "ipv4_mapped", None) is not None:
+                address = address.ipv4_mapped
+            if not address.is_global or address.is_multicast:
+                return f"address not allowed: {address}"
+        return None
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            if len(self._buckets) >= _MAX_BUCKETS:
+                # forget hosts whose bucket has refilled; they behave exactly like new ones
+                for h in [h for h, b in self._buckets.items() if b.idle()]:
+                    del self._buckets[h]
+            bucket = self._buckets[host] = TokenBucket(self.rate_per_host, self.burst_per_host)
+        return bucket
+
+    async def _worker(self) -> None:
+        while True:
+            delivery = await self._queue.get()
+            try:
+                wait = self._bucket(delivery.host).reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._in_flight += 1
+                try:
+                    await self._send(delivery)
+                finally:
+                    self._in_flight -= 1
+            except asyncio.CancelledError:
+                self._dead_letter(delivery, "shutdown")
+                raise
+            except Exception as e:
+                self._dead_letter(delivery, f"unexpected error: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _send(self, delivery: _Delivery) -> None:
+        delivery.attempts += 1
+        retry_after = None
+        try:
+            refused = await self._refused_address(delivery)
+            if refused:
+                self.refused += 1
+                self._dead_letter(delivery, refused)
+                return
+            response = await self._client.post(delivery.url, content=delivery.body, headers=delivery.headers)
+            delivery.last_status = response.status_code
+            if response.is_success:
+                self.delivered += 1
+                self._latencies.append((time.monotonic() - delivery.created) * 1000.0)
+                return
+            delivery.last_error = f"HTTP {response.status_code}"
+            if response.status_code not in _RETRY_STATUSES:
+                self._dead_letter(delivery, delivery.last_error)
+                return
+            retry_after = _retry_after(response)
+        except (httpx.HTTPError, socket.gaierror) as e:
+            delivery.last_error = f"{type(e).__name__}: {e}"
+        if delivery.attempts >= self.max_attempts:
+            self._dead_letter(delivery, delivery.last_error or "failed")
+            return
+        self._schedule_retry(delivery, retry_after)
+
+    def _schedule_retry(self, delivery: _Delivery, retry_after: Optional[float]) -> None:
+        # full jitter spreads retries from many failed deliveries instead of synchronizing them
+        delay = full_jitter(delivery.attempts - 1, self.backoff_base, self.backoff_max)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        self.retried += 1
+        loop = asyncio.get_running_loop()
+        handle: Optional[asyncio.TimerHandle] = None
+
+        def requeue() -> None:
+            self._retries.pop(handle, None)
+            if self._queue is None:
+                self._dead_letter(delivery, "shutdown")
+                return
+            try:
+                self._queue.put_nowait(delivery)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                self._dead_letter(delivery, "queue full")
+
+        handle = loop.call_later(delay, requeue)
+        self._retries[handle] = delivery
+
+    def _dead_letter(self, delivery: _Delivery, reason: str) -> None:
+        record = {
+            "task_id": delivery.task_id,
+            "url": delivery.url,
+            "attempts": delivery.attempts,
+            "status": delivery.last_status,
+            "reason": reason,
+            "at": time.time(),
+        }
+        self._dead.append(record)
+        self.dead_lettered += 1
+        if self.dead_letter_path:
+            try:
+                with open(self.dead_letter_path, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError:
+                pass
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        return list(self._dead)
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def pct(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p / 100.0 * len(latencies)))], 1)
+
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "in_flight": self._in_flight,
+            "pending_retries": len(self._retries),
+            "queued": self.queued,
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "dropped": self.dropped,
+            "refused": self.refused,
+            "hosts": len(self._buckets),
+            "delivery_ms_p50": pct(50),
+            "delivery_ms_p95": pct(95),
+        }
+
+
+def _headers(config: PushNotificationConfig) -> Dict[str, str]:
+    headers = {"Content-Type": "application/json"}
+    if config.token:
+        headers["X-A2A-Notification-Token"] = config.token
+    auth = config.authentication or {}
+    credentials = auth.get("credentials")
+    schemes = [str(s).lower() for s in auth.get("schemes") or []]
+    if credentials and (not schemes or "bearer" in schemes):
+        headers["Authorization"] = f"Bearer {credentials}"
+    return headers
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+push_notifier = PushNotifier()
@@ -0,0 +1,238 @@
+# services/rate_limiter.py
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+
+# outbound JSearch budget: sustained requests/second and burst (set these to the RapidAPI plan's limits)
+JSEARCH_RATE_PER_SEC = float(os.getenv("JSEARCH_RATE_PER_SEC", "5"))
+JSEARCH_RATE_BURST = int(os.getenv("JSEARCH_RATE_BURST", "5"))
+# how long a call may wait for a token before it is rejected; background refreshes may wait longer
+JSEARCH_RATE_MAX_WAIT = float(os.getenv("JSEARCH_RATE_MAX_WAIT", "5.0"))
+JSEARCH_RATE_BACKGROUND_MAX_WAIT = float(os.getenv("JSEARCH_RATE_BACKGROUND_MAX_WAIT", "30.0"))
+JSEARCH_RATE_MAX_QUEUE = int(os.getenv("JSEARCH_RATE_MAX_QUEUE", "200"))
+# pause applied when the quota headers say nothing is left but give no reset time
+JSEARCH_QUOTA_RESET_DEFAULT = float(os.getenv("JSEARCH_QUOTA_RESET_DEFAULT", "60"))
+
+# lower value = served first
+INTERACTIVE = 0
+BACKGROUND = 1
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a call cannot get an upstream slot in time, or upstream answered 429."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `capacity`."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return now
+
+    def reserve(self) -> float:
+        """Take a token now, going into debt if needed; returns how long to wait before using it."""
+        self._refill()
+        self.tokens -= 1.0
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def try_take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def refund(self) -> None:
+        """Give back a token that was taken but not used."""
+        self._refill()
+        self.tokens = min(float(self.capacity), self.tokens + 1.0)
+
+    def time_until_token(self) -> float:
+        self._refill()
+        return 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / self.rate
+
+    def idle(self) -> bool:
+        return self.tokens + (time.monotonic() - self.updated) * self.rate >= self.capacity
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for outbound calls with a priority queue in front of it.
+    Calls that cannot go at once wait in (priority, arrival) order, so interactive searches overtake
+    background cache refreshes; a call still waiting after `max_wait` raises RateLimitExceeded.
+    `observe` reads RapidAPI's quota headers and 429s and pauses the limiter until the quota resets.
+    """
+
+    def __init__(
+        self,
+        rate: float = JSEARCH_RATE_PER_SEC,
+        burst: int = JSEARCH_RATE_BURST,
+        max_wait: float = JSEARCH_RATE_MAX_WAIT,
+        background_max_wait: float = JSEARCH_RATE_BACKGROUND_MAX_WAIT,
+        max_queue: int = JSEARCH_RATE_MAX_QUEUE,
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_wait = max_wait
+        self.background_max_wait = background_max_wait
+        self.max_queue = max_queue
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.paused_until = 0.0
+        self.quota_limit: Optional[float] = None
+        self.quota_remaining: Optional[float] = None
+        self._waits: Deque[float] = deque(maxlen=1000)
+        self.granted = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.upstream_429 = 0
+
+    async def acquire(self, priority: int = INTERACTIVE, max_wait: Optional[float] = None) -> float:
+        """Wait for a slot; returns the seconds spent waiting."""
+        if max_wait is None:
+            max_wait = self.background_max_wait if priority >= BACKGROUND else self.max_wait
+        now = time.monotonic()
+        paused = self.paused_until - now
+        if paused > max_wait:
+            self.rejected += 1
+            raise RateLimitExceeded(f"JSearch quota exhausted; retry in {paused:.0f}s", retry_after=paused)
+        if paused <= 0 and not self._waiters and self.bucket.try_take():
+            self.granted += 1
+            self._waits.append(0.0)
+            return 0.0
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise RateLimitExceeded(f"JSearch rate limit queue full ({self.max_queue} waiting)", retry_after=self._retry_hint())
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        self._schedule()
+        try:
+            await asyncio.wait_for(fut, timeout=max_wait)
+        except asyncio.TimeoutError:
+            # _release may have granted the slot (and taken its token) just as the wait ran out: use it
+            if not fut.done() or fut.cancelled():
+                self.rejected += 1
+                raise RateLimitExceeded(f"No JSearch rate limit slot within {max_wait:g}s", retry_after=self._retry_hint()) from None
+        except asyncio.CancelledError:
+            # the caller went away after being granted: hand the token to the next waiter
+            if fut.done() and not fut.cancelled():
+                self.bucket.refund()
+                self._schedule()
+            raise
+        waited = time.monotonic() - now
+        self.granted += 1
+        self.delayed += 1
+        self._waits.append(waited * 1000.0)
+        return waited
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now and nobody is queued (used for optional extra calls)."""
+        if self.paused_for() > 0 or self._waiters or not self.bucket.try_take():
+            return False
+        self.granted += 1
+        return True
+
+    def paused_for(self) -> float:
+        return max(0.0, self.paused_until - time.monotonic())
+
+    def _retry_hint(self) -> float:
+        return max(self.paused_for(), (len(self._waiters) + 1) / self.bucket.rate)
+
+    def _schedule(self) -> None:
+        if self._timer is not None or not self._waiters:
+            return
+        delay = max(self.paused_until - time.monotonic(), self.bucket.time_until_token(), 0.0)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        self._timer = None
+        if time.monotonic() >= self.paused_until:
+            while self._waiters:
+                fut = self._waiters[0][2]
+                if fut.done():
+                    # timed out or cancelled while queued
+                    heapq.heappop(self._waiters)
+                    continue
+                if not self.bucket.try_take():
+                    break
+                heapq.heappop(self._waiters)
+                fut.set_result(None)
+        self._schedule()
+
+    def pause(self, seconds: float) -> None:
+        """Hold every call for `seconds` (quota exhausted or upstream 429)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + max(0.0, seconds))
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._waiters:
+            self._schedule()
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Update the remaining quota from RapidAPI's X-RateLimit-Requests-* headers; pause on 429 or an empty quota."""
+        limit = _header_number(headers, "x-ratelimit-requests-limit")
+        remaining = _header_number(headers, "x-ratelimit-requests-remaining")
+        reset = _header_number(headers, "x-ratelimit-requests-reset")
+        if limit is not None:
+            self.quota_limit = limit
+        if remaining is not None:
+            self.quota_remaining = remaining
+            if remaining <= 0:
+                self.pause(reset if reset is not None else JSEARCH_QUOTA_RESET_DEFAULT)
+        if status_code == 429:
+            self.upstream_429 += 1
+            retry_after = _header_number(headers, "retry-after")
+            self.pause(retry_after if retry_after is not None else (reset if reset is not None else 1.0))
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+
+        def pct(p: float) -> Optional[float]:
+            return round(waits[min(len(waits) - 1, int(p / 100.0 * len(waits)))], 1) if waits else None
+
+        by_priority = {"interactive": 0, "background": 0}
+        for priority, _, fut in self._waiters:
+            if not fut.done():
+                by_priority["interactive" if priority < BACKGROUND else "background"] += 1
+        return {
+            "rate_per_sec": self.bucket.rate,
+            "burst": self.bucket.capacity,
+            "queued": by_priority,
+            "granted": self.granted,
+            "delayed": self.delayed,
+            "rejected": self.rejected,
+            "upstream_429": self.upstream_429,
+            "wait_ms_p50": pct(50),
+            "wait_ms_p95": pct(95),
+            "wait_ms_max": round(waits[-1], 1) if waits else None,
+            "paused_for_s": round(self.paused_for(), 1),
+            "quota_limit": self.quota_limit,
+            "quota_remaining": self.quota_remaining,
+        }
@@ -0,0 +1,238 @@
+# services/request_profiler.py
+import asyncio
+import cProfile
+import hmac
+import os
+import pstats
+import random
+import time
+import warnings
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from services.rate_limiter import TokenBucket
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+
+# requests carrying X-Profile-Token equal to this are profiled and get a summary back (unset: header ignored)
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN") or None
+# share of all requests profiled in the background (file only, nothing changes for the client)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# "auto" uses pyinstrument when installed (sampling, follows only this request's task), else cProfile
+PROFILER = os.getenv("PROFILER", "auto").lower()
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(ROOT, "data", "profiles"))
+# abuse caps: profiles running at once, profiles per minute, files kept on disk
+PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "1"))
+PROFILE_MAX_PER_MINUTE = float(os.getenv("PROFILE_MAX_PER_MINUTE", "6"))
+PROFILE_KEEP_FILES = int(os.getenv("PROFILE_KEEP_FILES", "50"))
+PROFILE_TOP = int(os.getenv("PROFILE_TOP", "15"))
+
+PROFILE_HEADER = "x-profile-token"
+
+
+def _pyinstrument_available() -> bool:
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ProfileSession:
+    """One profiled request. `authorized` sessions return a summary to the client; sampled ones only save a file."""
+
+    __slots__ = ("kind", "authorized", "label", "started", "_profiler")
+
+    def __init__(self, kind: str, authorized: bool, label: str):
+        self.kind = kind
+        self.authorized = authorized
+        self.label = label
+        self.started = time.perf_counter()
+        if kind == "pyinstrument":
+            from pyinstrument import Profiler
+            # async_mode="enabled": only time spent in this request's task is attributed to it
+            self._profiler = Profiler(async_mode="enabled")
+            self._profiler.start()
+        else:
+            # cProfile is per thread: it also records whatever else the event loop runs meanwhile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self) -> float:
+        if self.kind == "pyinstrument":
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def top_functions(self, limit: int) -> List[Dict[str, Any]]:
+        if self.kind == "pyinstrument":
+            return _pyinstrument_top(self._profiler, limit)
+        stats = pstats.Stats(self._profiler)
+        rows = []
+        for (filename, line, name), (_, calls, total, cumulative, _) in stats.stats.items():
+            rows.append({
+                "function": f"{name} ({os.path.relpath(filename, ROOT) if filename.startswith(ROOT) else filename}:{line})",
+                "calls": calls,
+                "selfMs": round(total * 1000.0, 3),
+                "cumulativeMs": round(cumulative * 1000.0, 3),
+            })
+        rows.sort(key=lambda r: -r["selfMs"])
+        return rows[:limit]
+
+    def dump(self, path_without_ext: str) -> str:
+        if self.kind == "pyinstrument":
+            path = path_without_ext + ".html"
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self._profiler.output_html())
+        else:
+            # open with `python -m pstats <file>` or snakeviz
+            path = path_without_ext + ".prof"
+            self._profiler.dump_stats(path)
+        return path
+
+
+def _pyinstrument_top(profiler, limit: int) -> List[Dict[str, Any]]:
+    # self time summed per function over the call tree
+    totals: Dict[str, List[float]] = {}
+    root = profiler.last_session.root_frame() if profiler.last_session else None
+    stack = [root] if root is not None else []
+    while stack:
+        frame = stack.pop()
+        key = f"{frame.function} ({frame.file_path_short}:{frame.line_no})"
+        entry = totals.setdefault(key, [0.0, 0.0])
+        entry[0] += frame.self_time
+        entry[1] = max(entry[1], frame.time)
+        stack.extend(frame.children)
+    rows = [{"function": k, "selfMs": round(s * 1000.0, 3), "cumulativeMs": round(t * 1000.0, 3)} for k, (s, t) in totals.items()]
+    rows.sort(key=lambda r: -r["selfMs"])
+    return rows[:limit]
+
+
+class RequestProfiler:
+    """
+    Opt-in profiling of single A2A requests, triggered by an admin token header or by sampling.
+    When neither is configured `enabled` is False and the controller never calls in here.
+    At most `max_concurrent` profiles run at once and `max_per_minute` start per minute; requests over
+    either cap simply run unprofiled.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str] = PROFILE_TOKEN,
+        sample_rate: float = PROFILE_SAMPLE_RATE,
+        profiler: str = PROFILER,
+        directory: Optional[str] = PROFILE_DIR,
+        max_concurrent: int = PROFILE_MAX_CONCURRENT,
+        max_per_minute: float = PROFILE_MAX_PER_MINUTE,
+        keep_files: int = PROFILE_KEEP_FILES,
+        top: int = PROFILE_TOP,
+    ):
+        self.token = token.encode("utf-8") if token else None
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.enabled = self.token is not None or self.sample_rate > 0
+        if profiler == "auto":
+            profiler = "pyinstrument" if _pyinstrument_available() else "cprofile"
+        elif profiler == "pyinstrument" and not _pyinstrument_available():
+            warnings.warn("PROFILER=pyinstrument but pyinstrument is not installed; using cProfile.")
+            profiler = "cprofile"
+        self.kind = profiler
+        # cProfile hooks the whole thread: two at once would corrupt each other
+        self.max_concurrent = max(1, max_concurrent) if profiler == "pyinstrument" else 1
+        self.directory = directory
+        self.keep_files = keep_files
+        self.top = top
+        self._bucket = TokenBucket(max_per_minute / 60.0, max(1, int(max_per_minute) // 6))
+        self._active = 0
+        self._rng = random.Random()
+        self.profiled = 0
+        self.sampled = 0
+        self.rejected_tokens = 0
+        self.capped = 0
+        self.save_errors = 0
+        self.last_file: Optional[str] = None
+
+    def start(self, headers, label: str) -> Optional[ProfileSession]:
+        """A running session if this request is to be profiled, else None."""
+        presented = headers.get(PROFILE_HEADER)
+        authorized = False
+        if presented is not None and self.token is not None:
+            authorized = hmac.compare_digest(presented.encode("utf-8"), self.token)
+            if not authorized:
+                self.rejected_tokens += 1
+        if not authorized and not (self.sample_rate and self._rng.random() < self.sample_rate):
+            return None
+        if self._active >= self.max_concurrent or not self._bucket.try_take():
+            self.capped += 1
+            return None
+        try:
+            session = ProfileSession(self.kind, authorized, label)
+        except Exception as e:
+            # e.g. another profiler already hooked into this thread: serve the request unprofiled
+            warnings.warn(f"Could not start request profiler: {e}")
+            return None
+        self._active += 1
+        if not authorized:
+            self.sampled += 1
+        return session
+
+    async def finish(self, session: ProfileSession) -> Optional[Dict[str, Any]]:
+        """Stop the session, save it and return the summary for the client (None for sampled requests)."""
+        try:
+            duration_ms = session.stop()
+        finally:
+            self._active -= 1
+        self.profiled += 1
+        path = None
+        if self.directory:
+            try:
+                path = await asyncio.to_thread(self._save, session)
+            except OSError as e:
+                self.save_errors += 1
+                warnings.warn(f"Could not save request profile: {e}")
+        if not session.authorized:
+            return None
+        return {
+            "profiler": session.kind,
+            "durationMs": round(duration_ms, 2),
+            "file": os.path.basename(path) if path else None,
+            "top": session.top_functions(self.top),
+        }
+
+    def _save(self, session: ProfileSession) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%fZ")
+        label = "".join(c if c.isalnum() else "-" for c in session.label)[:40]
+        path = session.dump(os.path.join(self.directory, f"{stamp}-{label}"))
+        self.last_file = path
+        self._prune()
+        return path
+
+    def _prune(self) -> None:
+        files = sorted(
+            (os.path.join(self.directory, f) for f in os.listdir(self.directory) if f.endswith((".prof", ".html"))),
+            key=os.path.getmtime,
+        )
+        for old in files[:max(0, len(files) - self.keep_files)]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "profiler": self.kind,
+            "token_configured": self.token is not None,
+            "sample_rate": self.sample_rate,
+            "active": self._active,
+            "profiled": self.profiled,
+            "sampled": self.sampled,
+            "capped": self.capped,
+            "rejected_tokens": self.rejected_tokens,
+            "save_errors": self.save_errors,
+            "last_file": self.last_file,
+        }
+
+
+request_profiler = RequestProfiler()
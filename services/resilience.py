@@ -0,0 +1,133 @@
+# services/resilience.py
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# circuit breaker: open after this many consecutive failures (slow calls count as failures),
+# stay open for JSEARCH_BREAKER_RESET seconds, then let one probe call through
+JSEARCH_BREAKER_FAILURES = int(os.getenv("JSEARCH_BREAKER_FAILURES", "5"))
+JSEARCH_BREAKER_SLOW_CALL = float(os.getenv("JSEARCH_BREAKER_SLOW_CALL", "5.0"))
+JSEARCH_BREAKER_RESET = float(os.getenv("JSEARCH_BREAKER_RESET", "30.0"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling upstream while the breaker is open."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def full_jitter(attempt: int, base: float, cap: float) -> float:
+    """Backoff before retry `attempt` (0-based): uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures or slow calls; open calls fail at once
+    with CircuitOpenError; after `reset_timeout` one probe is let through (half-open), and its outcome
+    closes the breaker again or re-opens it for another `reset_timeout`.
+    Every `allow()` must be followed by exactly one of `on_success`, `on_failure` or `on_ignored`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = JSEARCH_BREAKER_FAILURES,
+        slow_call: float = JSEARCH_BREAKER_SLOW_CALL,
+        reset_timeout: float = JSEARCH_BREAKER_RESET,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.slow_call = slow_call
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self.failures = 0
+        self.slow_calls = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> None:
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(f"{self.name} circuit open; retry in {self.retry_after():.1f}s", retry_after=self.retry_after())
+
+    def on_success(self, elapsed: float) -> None:
+        if elapsed >= self.slow_call:
+            # an answer that took this long already cost the caller its latency budget
+            self.slow_calls += 1
+            self._fail()
+            return
+        self._failures = 0
+        self._probing = False
+        self._state = CLOSED
+
+    def on_failure(self) -> None:
+        self.failures += 1
+        self._fail()
+
+    def on_ignored(self) -> None:
+        """The call ended without saying anything about upstream health (cancelled, 4xx, rate limited)."""
+        self._probing = False
+
+    def _fail(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self.failure_threshold:
+            if self._state != OPEN:
+                self.opened += 1
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        return {
+            "state": state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "failures": self.failures,
+            "slow_calls": self.slow_calls,
+            "retry_after_s": round(self.retry_after(), 1) if state == OPEN else 0.0,
+        }
+
+
+class LatencyTracker:
+    """Recent call latencies (seconds); `percentile` is None until `min_samples` have been seen."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if len(self._samples) < self.min_samples:
+            return None
+        samples = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(p / 100.0 * len(samples)))]
@@ -0,0 +1,75 @@
+# services/single_flight.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for `key` is in flight,
+    later callers await the same task instead of starting another one.
+
+    - the result (or exception) of the shared call reaches every waiter;
+    - cancelling one waiter does not cancel the shared call for the others;
+    - when the last waiter goes away the shared call is cancelled too.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call, _ = self.join(key, fn)
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            self.leave(call)
+
+    def join(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[_Call, bool]:
+        """
+        Start (True) or join (False) the call for `key` without awaiting it, for callers that need to know
+        which one happened before the call runs. Await `call.task` under asyncio.shield; `leave` when done.
+        """
+        call = self._calls.get(key)
+        started = call is None
+        if started:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda t, key=key, call=call: self._done(key, call))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        call.waiters += 1
+        return call, started
+
+    def leave(self, call: _Call) -> None:
+        call.waiters -= 1
+        if call.waiters == 0 and not call.task.done():
+            # nobody is interested any more; don't keep the upstream call running
+            call.task.cancel()
+
+    def _done(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.task.cancelled() and call.task.exception() is not None:
+            self.errors += 1
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "in_flight": len(self._calls),
+        }
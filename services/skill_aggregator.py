@@ -0,0 +1,46 @@
+# services/skill_aggregator.py
+import heapq
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from services.skill_matcher import SkillMatcher, skill_matcher
+
+
+class SkillAggregator:
+    """
+    Streaming skill counter: feed descriptions as they arrive (no intermediate token list),
+    merge partial aggregates from concurrent pages or workers, and read top-k with a heap.
+    """
+
+    def __init__(self, matcher: Optional[SkillMatcher] = None):
+        self.matcher = matcher or skill_matcher
+        self.counts: Dict[str, int] = {}
+        self.documents = 0
+        self.matches = 0
+
+    def add(self, text: str) -> None:
+        self.documents += 1
+        self.matches += self.matcher.count_into(text, self.counts)
+
+    def add_many(self, texts: Iterable[str]) -> "SkillAggregator":
+        for text in texts:
+            self.add(text)
+        return self
+
+    def add_jobs(self, jobs: Iterable[Dict]) -> "SkillAggregator":
+        return self.add_many(j.get("job_description") or "" for j in jobs)
+
+    def merge(self, other: "SkillAggregator") -> "SkillAggregator":
+        counts = self.counts
+        for skill, n in other.counts.items():
+            counts[skill] = counts.get(skill, 0) + n
+        self.documents += other.documents
+        self.matches += other.matches
+        return self
+
+    def top_k_with_counts(self, k: int = 10) -> List[Tuple[str, int]]:
+        # nlargest keeps first-seen order among equal counts, so results are deterministic
+        return heapq.nlargest(k, self.counts.items(), key=itemgetter(1))
+
+    def top_k(self, k: int = 10) -> List[str]:
+        return [skill for skill, _ in self.top_k_with_counts(k)]
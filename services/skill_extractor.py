@@ -1,75 +1,27 @@
 # services/skill_extractor.py
-import os
-import pickle
 import warnings
 from typing import Dict, List, Optional
-from requests.exceptions import ConnectionError, ReadTimeout
 
-try:
-    import spacy
-    from keybert import KeyBERT
-except Exception:
-    spacy = None
-    KeyBERT = None
-
-ROOT = os.path.dirname(os.path.dirname(__file__))
-DP_DIR = os.path.join(ROOT, "dp_model")
-os.makedirs(DP_DIR, exist_ok=True)
-
-MODEL_PATH = os.path.join(DP_DIR, "nlp_model.pkl")
-KEYBERT_PATH = os.path.join(DP_DIR, "keybert_model.pkl")
+from services.model_registry import registry
 
 # --------------------------
-# Load spaCy
+# Models (shared, loaded lazily by the registry)
 # --------------------------
-if spacy is None:
-    raise RuntimeError("spaCy not installed. Please pip install spacy and download en_core_web_sm.")
-if not os.path.exists(MODEL_PATH):
-    print("🔹 Loading spaCy model for first time (this may take a moment)...")
-    nlp = spacy.load("en_core_web_sm")
-    with open(MODEL_PATH, "wb") as f:
-        pickle.dump(nlp, f)
-else:
-    with open(MODEL_PATH, "rb") as f:
-        nlp = pickle.load(f)
-
-# --------------------------
-# Load KeyBERT safely
-# --------------------------
-def safe_load_keybert():
-    if KeyBERT is None:
-        return None
-    try:
-        print("🔹 Initializing KeyBERT (may take time)...")
-        model = KeyBERT()
-        with open(KEYBERT_PATH, "wb") as f:
-            pickle.dump(model, f)
-        print("✅ KeyBERT loaded successfully.")
-        return model
-    except (ConnectionError, ReadTimeout, TimeoutError) as e:
-        warnings.warn(f"⚠️ KeyBERT download failed: {e}\nFalling back to basic keyword extraction.")
-        return None
-    except Exception as e:
-        warnings.warn(f"⚠️ Unexpected error loading KeyBERT: {e}")
-        return None
-
-if not os.path.exists(KEYBERT_PATH):
-    kw_model = safe_load_keybert()
-else:
-    try:
-        with open(KEYBERT_PATH, "rb") as f:
-            kw_model = pickle.load(f)
-    except Exception:
-        kw_model = safe_load_keybert()
+def __getattr__(name: str):
+    # keep `skill_extractor.nlp` / `skill_extractor.kw_model` working without loading at import time
+    if name == "nlp":
+        return registry.get("spacy")
+    if name == "kw_model":
+        return registry.get("keybert")
+    raise AttributeError(name)
 
 # --------------------------
 # Keyword extraction logic
 # --------------------------
-def extract_keywords(text: str, use_semantic: bool = True) -> Dict[str, Optional[List[str]]]:
-    if not text or not isinstance(text, str):
-        return {"keywords": [], "location": None, "role": None}
+def _empty_result() -> Dict[str, Optional[List[str]]]:
+    return {"keywords": [], "location": None, "role": None}
 
-    doc = nlp(text)
+def _parse_doc(doc, semantic_keywords: List[str]) -> Dict[str, Optional[List[str]]]:
     keywords, location, role = [], None, None
 
     for ent in doc.ents:
@@ -82,13 +34,7 @@ def extract_keywords(text: str, use_semantic: bool = True) -> Dict[str, Optional
         if token.pos_ in ["NOUN", "PROPN", "ADJ"] and not token.is_stop:
             keywords.append(token.lemma_.lower())
 
-    if use_semantic and kw_model:
-        try:
-            semantic_keywords = [kw[0] for kw in kw_model.extract_keywords(text, top_n=5)]
-            keywords.extend(semantic_keywords)
-        except Exception as e:
-            warnings.warn(f"Semantic extraction failed: {e}")
-
+    keywords.extend(semantic_keywords)
     keywords = list(set(k for k in keywords if len(k) > 2))
 
     if not role:
@@ -98,3 +44,46 @@ def extract_keywords(text: str, use_semantic: bool = True) -> Dict[str, Optional
                 break
 
     return {"keywords": keywords, "location": location, "role": role}
+
+def extract_keywords(text: str, use_semantic: bool = True) -> Dict[str, Optional[List[str]]]:
+    if not text or not isinstance(text, str):
+        return _empty_result()
+
+    doc = registry.get("spacy")(text)
+
+    semantic_keywords = []
+    kw_model = registry.get("keybert") if use_semantic else None
+    if kw_model:
+        try:
+            semantic_keywords = [kw[0] for kw in kw_model.extract_keywords(text, top_n=5)]
+        except Exception as e:
+            warnings.warn(f"Semantic extraction failed: {e}")
+
+    return _parse_doc(doc, semantic_keywords)
+
+def extract_keywords_batch(texts: List[str], use_semantic: bool = True) -> List[Dict[str, Optional[List[str]]]]:
+    """
+    Batched extract_keywords: one nlp.pipe pass and one KeyBERT call for all texts.
+    Returns one result per input text, in order.
+    """
+    results: List[Dict[str, Optional[List[str]]]] = [_empty_result() for _ in texts]
+    idx = [i for i, t in enumerate(texts) if t and isinstance(t, str)]
+    if not idx:
+        return results
+    docs_text = [texts[i] for i in idx]
+
+    semantic: List[List[str]] = [[] for _ in idx]
+    kw_model = registry.get("keybert") if use_semantic else None
+    if kw_model:
+        try:
+            extracted = kw_model.extract_keywords(docs_text, top_n=5)
+            # KeyBERT returns a flat list for a single document
+            if len(docs_text) == 1:
+                extracted = [extracted]
+            semantic = [[kw[0] for kw in kws] for kws in extracted]
+        except Exception as e:
+            warnings.warn(f"Semantic extraction failed: {e}")
+
+    for i, doc, sem in zip(idx, registry.get("spacy").pipe(docs_text), semantic):
+        results[i] = _parse_doc(doc, sem)
+    return results
@@ -0,0 +1,213 @@
+# services/skill_matcher.py
+import json
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+# optional JSON file {"canonical skill": ["alias", ...]} merged into the built-in dictionary
+SKILLS_EXTRA_FILE = os.getenv("SKILLS_EXTRA_FILE")
+
+# canonical skill -> aliases (all lowercase). Multi-word and punctuated skills are fine.
+SKILLS: Dict[str, List[str]] = {
+    # languages
+    "python": [],
+    "java": [],
+    "javascript": ["js", "ecmascript"],
+    "typescript": [],
+    "c++": ["cpp"],
+    "c#": ["csharp"],
+    "golang": [],
+    "rust": [],
+    "ruby": [],
+    "php": [],
+    "kotlin": [],
+    "swift": [],
+    "scala": [],
+    "r programming": ["rstats"],
+    "sql": [],
+    "bash": ["shell scripting"],
+    # web / frameworks
+    "react": ["react.js", "reactjs"],
+    "angular": ["angularjs"],
+    "vue": ["vue.js", "vuejs"],
+    "next.js": ["nextjs"],
+    "node.js": ["nodejs", "node"],
+    "express.js": ["expressjs"],
+    "django": [],
+    "flask": [],
+    "fastapi": [],
+    "spring boot": [],
+    ".net": ["dotnet", "asp.net"],
+    "ruby on rails": ["rails"],
+    "laravel": [],
+    "html": ["html5"],
+    "css": ["css3"],
+    "tailwind": ["tailwind css", "tailwindcss"],
+    "graphql": [],
+    "rest api": ["rest apis", "restful", "restful api", "restful apis"],
+    "microservices": ["microservice"],
+    # data / ml
+    "machine learning": ["ml"],
+    "deep learning": [],
+    "artificial intelligence": ["ai"],
+    "nlp": ["natural language processing"],
+    "computer vision": [],
+    "llm": ["llms", "large language models"],
+    "data analysis": ["data analytics"],
+    "data engineering": [],
+    "statistics": ["statistical analysis"],
+    "pandas": [],
+    "numpy": [],
+    "scikit-learn": ["sklearn"],
+    "tensorflow": [],
+    "pytorch": [],
+    "spark": ["apache spark", "pyspark"],
+    "hadoop": [],
+    "airflow": ["apache airflow"],
+    "kafka": ["apache kafka"],
+    "etl": [],
+    "power bi": ["powerbi"],
+    "tableau": [],
+    "excel": ["microsoft excel"],
+    "looker": [],
+    # databases
+    "postgresql": ["postgres"],
+    "mysql": [],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "elasticsearch": [],
+    "snowflake": [],
+    "bigquery": [],
+    "dynamodb": [],
+    # cloud / devops
+    "aws": ["amazon web services"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "azure": ["microsoft azure"],
+    "docker": [],
+    "kubernetes": ["k8s"],
+    "terraform": [],
+    "ansible": [],
+    "ci/cd": ["cicd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "jenkins": [],
+    "github actions": [],
+    "git": ["github", "gitlab"],
+    "linux": ["unix"],
+    "devops": [],
+    "serverless": [],
+    "observability": ["monitoring"],
+    # mobile
+    "android": [],
+    "ios": [],
+    "react native": [],
+    "flutter": [],
+    # practices / design / product
+    "agile": ["scrum", "kanban"],
+    "tdd": ["test-driven development", "unit testing"],
+    "system design": [],
+    "security": ["cybersecurity", "application security"],
+    "figma": [],
+    "ui/ux": ["ux", "ui design", "ux design", "user experience"],
+    "user research": [],
+    "product management": [],
+    "project management": [],
+    "communication": ["communication skills"],
+    "leadership": [],
+    "seo": [],
+}
+
+# a skill must not be glued to other word characters (or to + / # as in "c++", "c#")
+_LEFT = r"(?<![\w+#])"
+_RIGHT = r"(?![\w+#])"
+
+
+def _trie_regex(node: Dict[str, dict]) -> str:
+    children = sorted(ch for ch in node if ch)
+    if not children:
+        return ""
+    alts = [re.escape(ch) + _trie_regex(node[ch]) for ch in children]
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    # "" marks the end of a word; greedy `?` tries the longer skill first ("machine learning" before "machine")
+    return "(?:" + body + ")?" if "" in node else body
+
+
+def compile_skill_pattern(phrases: Iterable[str]) -> "re.Pattern":
+    """Compile phrases into one trie-shaped regex, so a text is scanned once for all of them."""
+    trie: Dict[str, dict] = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return re.compile(_LEFT + "(?:" + _trie_regex(trie) + ")" + _RIGHT)
+
+
+def _load_extra(path: Optional[str]) -> Dict[str, List[str]]:
+    if not path:
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+class SkillMatcher:
+    """
+    Counts known skills in free text with a single compiled multi-pattern scan.
+    Aliases are folded into their canonical name ("k8s" -> "kubernetes").
+    """
+
+    def __init__(self, skills: Optional[Dict[str, List[str]]] = None, extra: Optional[Dict[str, List[str]]] = None):
+        self._skills: Dict[str, List[str]] = {}
+        self.add_skills(skills if skills is not None else SKILLS, compile=False)
+        if extra:
+            self.add_skills(extra, compile=False)
+        self._compile()
+
+    def add_skills(self, skills: Dict[str, List[str]], compile: bool = True) -> None:
+        for canonical, aliases in skills.items():
+            canonical = canonical.strip().lower()
+            merged = self._skills.setdefault(canonical, [])
+            for alias in aliases or []:
+                alias = alias.strip().lower()
+                if alias and alias not in merged:
+                    merged.append(alias)
+        if compile:
+            self._compile()
+
+    def _compile(self) -> None:
+        self._canonical: Dict[str, str] = {}
+        for canonical, aliases in self._skills.items():
+            self._canonical[canonical] = canonical
+            for alias in aliases:
+                self._canonical.setdefault(alias, canonical)
+        self.pattern = compile_skill_pattern(self._canonical)
+
+    @property
+    def skills(self) -> List[str]:
+        return list(self._skills)
+
+    def find(self, text: str) -> List[str]:
+        """Canonical skills mentioned in `text`, in order of appearance (with repeats)."""
+        if not text:
+            return []
+        lookup = self._canonical
+        return [lookup[m] for m in self.pattern.findall(text.lower())]
+
+    def count_into(self, text: str, counts: Dict[str, int]) -> int:
+        """Add the skills found in `text` to `counts` in place; returns the number of matches."""
+        if not text:
+            return 0
+        lookup = self._canonical
+        n = 0
+        for m in self.pattern.finditer(text.lower()):
+            skill = lookup[m.group()]
+            counts[skill] = counts.get(skill, 0) + 1
+            n += 1
+        return n
+
+    def count(self, texts: Iterable[str]) -> Counter:
+        """Skill occurrence counts across all `texts` in one scan."""
+        joined = "\n".join(t.lower() for t in texts if t)
+        return Counter(map(self._canonical.__getitem__, self.pattern.findall(joined)))
+
+
+skill_matcher = SkillMatcher(extra=_load_extra(SKILLS_EXTRA_FILE))
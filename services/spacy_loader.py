@@ -1,18 +1,16 @@
-import spacy
+# services/spacy_loader.py
+from services.model_registry import registry
 
-# Load small English NLP model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    # If model isn't installed, install automatically
-    import subprocess, sys
-    subprocess.run([sys.executable, "-m", "spacy", "download", "en_core_web_sm"])
-    nlp = spacy.load("en_core_web_sm")
+def __getattr__(name: str):
+    # shared pipeline from the registry; nothing is loaded at import time
+    if name == "nlp":
+        return registry.get("spacy")
+    raise AttributeError(name)
 
 def extract_spacy_keywords(text, limit=10):
     """
     Extracts simple keywords based on nouns and proper-nouns
     """
-    doc = nlp(text)
+    doc = registry.get("spacy")(text)
     keywords = {token.text.lower() for token in doc if token.pos_ in ["NOUN", "PROPN"]}
     return list(keywords)[:limit]
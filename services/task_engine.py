@@ -0,0 +1,155 @@
+# services/task_engine.py
+import asyncio
+import os
+import time
+import warnings
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from models.a2a import TaskResult
+from utils.a2a_response import make_failed_task
+
+# asyncio workers running non-blocking (configuration.blocking=false) tasks
+TASK_WORKERS = int(os.getenv("TASK_WORKERS", "4"))
+# tasks allowed to wait for a worker; beyond this, submissions are rejected
+TASK_MAX_QUEUE = int(os.getenv("TASK_MAX_QUEUE", "256"))
+# a task that runs longer than this is recorded as failed
+TASK_TIMEOUT = float(os.getenv("TASK_TIMEOUT", "120"))
+# how long tasks/get can see a task after its last update, and how many tasks are kept at most
+TASK_TTL = float(os.getenv("TASK_TTL", "3600"))
+TASK_MAX_STORED = int(os.getenv("TASK_MAX_STORED", "10000"))
+
+
+class TaskQueueFull(RuntimeError):
+    pass
+
+
+class TaskEngine:
+    """
+    Background execution for A2A tasks: `submit` records a `working` task and queues its pipeline,
+    a fixed set of workers drain the bounded queue, and each task's latest state stays readable
+    through `get` until it has been idle for `ttl` seconds (oldest evicted first beyond `max_tasks`).
+    """
+
+    def __init__(
+        self,
+        workers: int = TASK_WORKERS,
+        max_queue: int = TASK_MAX_QUEUE,
+        timeout: float = TASK_TIMEOUT,
+        ttl: float = TASK_TTL,
+        max_tasks: int = TASK_MAX_STORED,
+    ):
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_tasks = max_tasks
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        # task id -> (task, expires_at), in update order so expired entries are at the front
+        self._tasks: "OrderedDict[str, Tuple[TaskResult, float]]" = OrderedDict()
+        self._running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.expired = 0
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [asyncio.create_task(self._worker(), name=f"task-worker-{i}") for i in range(self.workers)]
+
+    async def shutdown(self) -> None:
+        workers, self._workers = self._workers, []
+        for w in workers:
+            w.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        self._queue = None
+
+    def submit(
+        self,
+        task: TaskResult,
+        run: Callable[[], Awaitable[TaskResult]],
+        on_done: Optional[Callable[[TaskResult], Any]] = None,
+    ) -> TaskResult:
+        """
+        Queue `run` for background execution and return `task` (its `working` state) at once.
+        `on_done` is called with the final task (completed or failed), e.g. to send a push notification.
+        """
+        self.start()
+        try:
+            self._queue.put_nowait((task, run, on_done))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise TaskQueueFull(f"Task queue full ({self.max_queue} waiting)")
+        self.submitted += 1
+        self.record(task)
+        return task
+
+    async def _worker(self) -> None:
+        while True:
+            task, run, on_done = await self._queue.get()
+            self._running += 1
+            try:
+                result = await asyncio.wait_for(run(), timeout=self.timeout)
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                result = make_failed_task(task.id, task.contextId, f"timed out after {self.timeout:g}s")
+                self.failed += 1
+            except Exception as e:
+                result = make_failed_task(task.id, task.contextId, str(e))
+                self.failed += 1
+            finally:
+                self._running -= 1
+                self._queue.task_done()
+            self.record(result)
+            if on_done is not None:
+                try:
+                    on_done(result)
+                except Exception as e:
+                    warnings.warn(f"Task {task.id} completion callback failed: {e}")
+
+    def _expire(self, now: float) -> None:
+        while self._tasks:
+            task_id, (_, expires_at) = next(iter(self._tasks.items()))
+            if expires_at > now:
+                break
+            del self._tasks[task_id]
+            self.expired += 1
+
+    def record(self, task: TaskResult) -> None:
+        """Store the latest state of `task` (blocking calls record their result too, so any task can be polled)."""
+        now = time.monotonic()
+        self._expire(now)
+        self._tasks[task.id] = (task, now + self.ttl)
+        self._tasks.move_to_end(task.id)
+        while len(self._tasks) > self.max_tasks:
+            self._tasks.popitem(last=False)
+            self.expired += 1
+
+    def get(self, task_id: str) -> Optional[TaskResult]:
+        self._expire(time.monotonic())
+        entry = self._tasks.get(task_id)
+        return entry[0] if entry is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._workers),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            "stored": len(self._tasks),
+            "max_queue": self.max_queue,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "expired": self.expired,
+        }
+
+
+task_engine = TaskEngine()
@@ -0,0 +1,41 @@
+import numpy as np
+
+from services.embedding_cache import DiskEmbeddingStore, text_key
+
+
+def _keys(*texts):
+    return [text_key(t, "test-model") for t in texts]
+
+
+def test_partial_index_line_is_skipped_on_reopen(tmp_path):
+    store = DiskEmbeddingStore(str(tmp_path), "test-model", 4)
+    first = _keys("a", "b")
+    store.put_many(first, np.arange(8, dtype=np.float32).reshape(2, 4))
+    # a writer crashed halfway through its index line
+    with open(store.index_path, "ab") as f:
+        f.write(_keys("c")[0][:10].encode("ascii"))
+
+    reopened = DiskEmbeddingStore(str(tmp_path), "test-model", 4)
+    assert len(reopened) == 2
+
+    # the next append must not be joined onto the torn line
+    later = _keys("d")
+    reopened.put_many(later, np.full((1, 4), 9, dtype=np.float32))
+    store = DiskEmbeddingStore(str(tmp_path), "test-model", 4)
+    found = store.get_many(first + later)
+    assert set(found) == set(first + later)
+    np.testing.assert_array_equal(found[first[1]], [4, 5, 6, 7])
+    np.testing.assert_array_equal(found[later[0]], [9, 9, 9, 9])
+
+
+def test_joined_index_line_is_skipped(tmp_path):
+    store = DiskEmbeddingStore(str(tmp_path), "test-model", 4)
+    key = _keys("a")
+    store.put_many(key, np.ones((1, 4), dtype=np.float32))
+    # a torn line followed directly by another writer's entry (before the torn line was ended)
+    with open(store.index_path, "ab") as f:
+        f.write(f"{_keys('x')[0]}\t{_keys('y')[0]}\t0\n".encode("ascii"))
+
+    reopened = DiskEmbeddingStore(str(tmp_path), "test-model", 4)
+    assert set(reopened.get_many(key)) == set(key)
+    assert len(reopened) == 1
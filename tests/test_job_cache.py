@@ -0,0 +1,51 @@
+import asyncio
+
+from services.job_cache import JobSearchCache
+from services.jsearch_client import JobList
+
+
+def test_partial_refresh_does_not_block_later_refreshes():
+    async def scenario():
+        cache = JobSearchCache(ttl=0.0, stale_ttl=60.0)
+        key = ("python", "", 10, 2)
+        cache.set(key, [{"job_id": "old"}])
+        calls = []
+
+        async def partial():
+            calls.append("partial")
+            return JobList([{"job_id": "half"}], partial=True, pages_fetched=1, pages_requested=2)
+
+        async def complete():
+            calls.append("complete")
+            return JobList([{"job_id": "new"}], pages_fetched=2, pages_requested=2)
+
+        # stale hit: served at once, refreshed in the background with a partial result
+        assert cache.lookup(key, partial) == [{"job_id": "old"}]
+        await asyncio.sleep(0)
+        await asyncio.gather(*cache._refresh_tasks)
+        # the partial value is not stored, and the next stale hit refreshes again
+        assert cache.lookup(key, complete) == [{"job_id": "old"}]
+        await asyncio.sleep(0)
+        await asyncio.gather(*cache._refresh_tasks)
+        assert calls == ["partial", "complete"]
+        assert cache.get(key) == [{"job_id": "new"}]
+
+    asyncio.run(scenario())
+
+
+def test_failed_refresh_allows_retry():
+    async def scenario():
+        cache = JobSearchCache(ttl=0.0, stale_ttl=60.0)
+        key = ("go", "", 10, 1)
+        cache.set(key, [{"job_id": "old"}])
+
+        async def failing():
+            raise RuntimeError("upstream down")
+
+        cache.lookup(key, failing)
+        await asyncio.sleep(0)
+        await asyncio.gather(*cache._refresh_tasks)
+        assert cache.refresh_errors == 1
+        assert not cache._entries[key].refreshing
+
+    asyncio.run(scenario())
@@ -11,6 +11,9 @@ class A2AErrorCode(Enum):
     METHOD_NOT_FOUND = -32601
     INVALID_PARAMS = -32602
     INTERNAL_ERROR = -32603
+    TASK_NOT_FOUND = -32001
+    UPSTREAM_UNAVAILABLE = -32003
+    RATE_LIMIT_EXCEEDED = -32029
 
 def create_error_response(request_id: str, code: A2AErrorCode, message: str, data: Optional[Dict]=None) -> Dict[str, Any]:
     return {
@@ -37,16 +40,28 @@ def make_agent_message(text_str: str, task_id: str) -> A2AMessage:
         taskId=task_id
     )
 
-def make_artifact(name: str, part_kind: str, payload: Any) -> Artifact:
+def make_artifact(name: str, part_kind: str, payload: Any, artifact_id: Optional[str] = None, metadata: Optional[Dict[str, Any]] = None) -> Artifact:
     # For structured payloads, put into `data` for kind=data, or text for text-kind (structured)
+    # Artifacts are not modified after this: their JSON is encoded once and cached (utils/json_response)
     if part_kind == "data":
         mp = MessagePart(kind="data", data=payload)
     elif part_kind == "text":
         mp = MessagePart(kind="text", text={"message": payload})
     else:
         mp = MessagePart(kind=part_kind, data=payload)
-    return Artifact(name=name, parts=[mp])
+    # chunks of one streamed artifact share an artifact_id
+    if artifact_id is not None:
+        return Artifact(artifactId=artifact_id, name=name, parts=[mp], metadata=metadata)
+    return Artifact(name=name, parts=[mp], metadata=metadata)
 
 def make_task_result(task_id: str, context_id: str, state: str, agent_message: A2AMessage, artifacts: List[Artifact], history: List[A2AMessage]) -> TaskResult:
     status = TaskStatus(state=state, timestamp=datetime.utcnow().isoformat() + "Z", message=agent_message)
     return TaskResult(id=task_id, contextId=context_id, status=status, artifacts=artifacts, history=history)
+
+def make_working_task(task_id: str, context_id: str, user_message: A2AMessage) -> TaskResult:
+    # returned at once for configuration.blocking=false; the final state is fetched with tasks/get
+    return TaskResult(id=task_id, contextId=context_id, status=TaskStatus(state="working"), history=[user_message])
+
+def make_failed_task(task_id: str, context_id: str, error: str) -> TaskResult:
+    agent_message = make_agent_message(f"Task failed: {error}", task_id)
+    return make_task_result(task_id, context_id, "failed", agent_message, [], [agent_message])
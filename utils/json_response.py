@@ -0,0 +1,56 @@
+# utils/json_response.py
+import json
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder produces the same bytes, just slower
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Compact UTF-8 JSON, byte-compatible with FastAPI's JSONResponse.render, except that floats printed
+    in exponent form drop the padding ("1e-7", not "1e-07"); the value is the same.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def encode_model(model: BaseModel) -> bytes:
+    """
+    JSON for a pydantic model, in field order (same bytes as model_dump() through FastAPI).
+    Models declaring a `_json` private attribute (Artifact, A2AMessage) are encoded once and the bytes
+    are reused as a fragment by every envelope that embeds them; such models must not be mutated afterwards.
+    Envelope models (JSONRPCResponse, TaskResult, TaskStatus) are assembled from their fields' fragments.
+    """
+    cls = type(model)
+    if "_json" in cls.__private_attributes__:
+        raw: Optional[bytes] = model._json
+        if raw is None:
+            raw = model._json = model.__pydantic_serializer__.to_json(model)
+        return raw
+    return b"{" + b",".join(dumps(name) + b":" + _encode_value(getattr(model, name)) for name in cls.model_fields) + b"}"
+
+
+def _encode_value(value: Any) -> bytes:
+    if isinstance(value, BaseModel):
+        return encode_model(value)
+    if isinstance(value, list) and value and isinstance(value[0], BaseModel):
+        return b"[" + b",".join(encode_model(v) for v in value) + b"]"
+    return dumps(value)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson; pydantic models and pre-encoded bytes skip the dict round trip."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            return encode_model(content)
+        return dumps(content)
@@ -0,0 +1,221 @@
+# utils/metrics.py
+import functools
+import math
+import os
+import re
+import warnings
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# add a Server-Timing header (per-stage durations of this request) to every HTTP response
+SERVER_TIMING = os.getenv("SERVER_TIMING", "1").lower() in ("1", "true", "yes")
+METRICS_PREFIX = "jobseeker"
+# stats() sources run on the event loop at every scrape: one slower than this is reported (once)
+STATS_SLOW_MS = float(os.getenv("STATS_SLOW_MS", "5"))
+
+# upper bounds in seconds: sub-millisecond cache hits up to multi-second upstream / model calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+# (stage, seconds) recorded while serving the current request; None outside a request
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+
+def metric_name(*parts: str) -> str:
+    return _NAME.sub("_", "_".join(p for p in parts if p)).lower()
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Prometheus-style cumulative histogram with one label. Observations are a bisect and three
+    increments on the event loop (no lock: every caller is a coroutine on the one loop thread).
+    """
+
+    def __init__(self, name: str, help_text: str, label: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label = label
+        self.buckets = tuple(sorted(buckets))
+        # label value -> [per-bucket counts (last one is +Inf), sum, count]
+        self._series: Dict[str, List[Any]] = {}
+
+    def observe(self, label_value: str, value: float) -> None:
+        series = self._series.get(label_value)
+        if series is None:
+            series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_value, (counts, total, count) in sorted(self._series.items()):
+            label = f'{self.label}="{_label(label_value)}"'
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                lines.append(f'{self.name}_bucket{{{label},le="{_number(bound)}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {_number(total)}")
+            lines.append(f"{self.name}_count{{{label}}} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Histograms plus gauges read at scrape time. Gauge sources are the components' stats() dicts
+    (the same ones /health returns); every numeric leaf becomes one gauge, e.g.
+    job_cache.stats()["hits"] -> jobseeker_job_cache_hits. Monotonic counts are exported as gauges too:
+    the stats dicts do not say which values only go up.
+    Sources are called on the event loop, so they must only read in-memory state: no queries, no
+    file or network I/O, no locks a worker thread may hold. A source slower than STATS_SLOW_MS is warned about.
+    """
+
+    def __init__(self, prefix: str = METRICS_PREFIX):
+        self.prefix = prefix
+        self._histograms: Dict[str, Histogram] = {}
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+        self._slow_sources: set = set()
+
+    def histogram(self, name: str, help_text: str, label: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        full = metric_name(self.prefix, name)
+        if full not in self._histograms:
+            self._histograms[full] = Histogram(full, help_text, label, buckets)
+        return self._histograms[full]
+
+    def register_stats(self, name: str, source: Callable[[], Dict[str, Any]]) -> None:
+        """`source` must be non-blocking and in-memory (see the class docstring)."""
+        self._sources[name] = source
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Every registered stats dict by name (what /health returns); a failing source reports its error."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for name, source in self._sources.items():
+            started = perf_counter()
+            try:
+                out[name] = source()
+            except Exception as e:
+                # one broken stats() must not take the whole scrape down
+                out[name] = {"error": str(e)}
+            elapsed_ms = (perf_counter() - started) * 1000.0
+            if elapsed_ms > STATS_SLOW_MS and name not in self._slow_sources:
+                self._slow_sources.add(name)
+                warnings.warn(f"stats() of {name!r} took {elapsed_ms:.1f} ms on the event loop; stats sources must not block")
+        return out
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for histogram in self._histograms.values():
+            lines.extend(histogram.render())
+        for name, stats in self.collect().items():
+            for key, value in _numeric_leaves(stats):
+                full = metric_name(self.prefix, name, key)
+                lines.append(f"# TYPE {full} gauge")
+                lines.append(f"{full} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _numeric_leaves(stats: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, float]]:
+    for key, value in stats.items():
+        key = f"{prefix}_{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            yield from _numeric_leaves(value, key)
+        elif isinstance(value, bool):
+            yield key, int(value)
+        elif isinstance(value, (int, float)) and not (isinstance(value, float) and math.isnan(value)):
+            yield key, value
+
+
+metrics = MetricsRegistry()
+stage_seconds = metrics.histogram("stage_duration_seconds", "Time spent in each request pipeline stage.", "stage")
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    stage_seconds.observe(stage, seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Time a block into the stage histogram and the current request's Server-Timing header."""
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, perf_counter() - started)
+
+
+def timed_async(stage: str):
+    """Decorator form of `timed` for coroutine functions; failures are timed too."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            started = perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                record_stage(stage, perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def server_timing_header(timings: List[Tuple[str, float]], total: float) -> str:
+    # stages hit more than once (pages, batch items) are summed, in first-seen order
+    merged: Dict[str, List[float]] = {}
+    for stage, seconds in timings:
+        entry = merged.setdefault(stage, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    parts = [
+        f"{metric_name(stage)};dur={seconds * 1000.0:.2f}" + (f';desc="x{n}"' if n > 1 else "")
+        for stage, (seconds, n) in merged.items()
+    ]
+    parts.append(f"total;dur={total * 1000.0:.2f}")
+    return ", ".join(parts)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware: collects the stages timed while a request is handled and sends them as a
+    Server-Timing header. Streaming responses only carry the stages finished before their first byte.
+    """
+
+    def __init__(self, app, enabled: bool = SERVER_TIMING):
+        self.app = app
+        self.enabled = enabled
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+        timings: List[Tuple[str, float]] = []
+        token = _request_timings.set(timings)
+        started = perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                header = server_timing_header(timings, perf_counter() - started)
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"server-timing", header.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)